@@ -26,6 +26,8 @@ class RAGProvider(enum.Enum):
     VIKINGDB_KNOWLEDGE_BASE = "vikingdb_knowledge_base"
     MILVUS = "milvus"
     LIGHTRAG = "lightrag"
+    EMBEDDED = "embedded"
+    FEDERATED = "federated"
 
 
 SELECTED_RAG_PROVIDER = os.getenv("RAG_PROVIDER")
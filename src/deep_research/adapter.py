@@ -5,18 +5,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json5
 import logging
+import os
 import re
+import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional, Sequence, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypedDict
 from uuid import uuid4
 from pydantic import ConfigDict
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
-from langchain_core.runnables import Runnable, RunnableConfig, RunnableSerializable
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda, RunnableSerializable
 
 from src.deep_research.agent import MultiTurnReactAgent
+from src.deep_research.checkpoint import TaskCheckpointStore, make_task_id
+
+# 异步路径专用线程池：同步的 agent._run 不占用事件循环的默认线程池
+_agent_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DEEPRESEARCH_MAX_CONCURRENCY", "8")),
+    thread_name_prefix="deepresearch-agent",
+)
+# 异步超时在 DEEPRESEARCH_TIMEOUT 之外额外等待的秒数
+_TIMEOUT_GRACE_SECONDS = 30
 
 
 class TaskResult(TypedDict, total=False):
@@ -28,6 +42,7 @@ class TaskResult(TypedDict, total=False):
     status: str
     termination: str
     attempts: int
+    resumed_rounds: int
     elapsed: float
     tool_calls: List[Dict[str, Any]]
     raw_messages: List[Dict[str, Any]]
@@ -53,9 +68,14 @@ class DeepResearchAdapter(RunnableSerializable):
     agent: MultiTurnReactAgent
     model: str
     planning_port: int
+    parallel: bool = False
+    # 并行模式下同时执行的任务数上限
+    max_workers: int = 4
     max_rounds: Optional[int] = None
     timeout_seconds: Optional[int] = None
     max_retries: int = 1
+    # 每轮检查点存储；设置后重试与重新运行同一任务时从最后完成的轮次继续
+    checkpoint_store: Optional[TaskCheckpointStore] = None
     logger: Optional[logging.Logger] = None
 
     def invoke(self, state: ResearchState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
@@ -64,7 +84,143 @@ class DeepResearchAdapter(RunnableSerializable):
         if task_index >= len(plan):
             return {"executor_ready": False}
 
-        task = plan[task_index]
+        messages, task_result = self._run_task(
+            task_index, plan[task_index], self.planning_port, self._run_id(config)
+        )
+        return {
+            "messages": messages,
+            "task_results": [task_result],
+            "current_task_index": task_index + 1,
+            "executor_ready": False,
+            "active_task_index": None,
+        }
+
+    async def ainvoke(
+        self, state: ResearchState, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """异步执行当前任务，不阻塞事件循环；取消会传递给正在运行的 agent"""
+        plan: Sequence[str] = state.get("plan", []) or []
+        task_index = state.get("current_task_index", 0)
+        if task_index >= len(plan):
+            return {"executor_ready": False}
+
+        messages, task_result = await self._arun_task(
+            task_index, plan[task_index], self.planning_port, self._run_id(config)
+        )
+        return {
+            "messages": messages,
+            "task_results": [task_result],
+            "current_task_index": task_index + 1,
+            "executor_ready": False,
+            "active_task_index": None,
+        }
+
+    def invoke_parallel(self, state: ResearchState, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+        """并发执行计划中剩余的全部任务。
+
+        最多同时执行 ``max_workers`` 个任务；结果与消息按计划顺序返回，
+        整体耗时约等于最慢任务的耗时。
+        """
+        plan: Sequence[str] = state.get("plan", []) or []
+        start_index = state.get("current_task_index", 0)
+        indices = list(range(start_index, len(plan)))
+        if not indices:
+            return {"executor_ready": False}
+
+        workers = min(max(self.max_workers, 1), len(indices))
+        run_id = self._run_id(config)
+
+        def run(task_index: int):
+            return self._run_task(task_index, plan[task_index], self.planning_port, run_id)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deepresearch") as executor:
+            outcomes = list(executor.map(run, indices))
+
+        return self._collect_parallel(state, plan, indices, outcomes)
+
+    def _collect_parallel(
+        self,
+        state: ResearchState,
+        plan: Sequence[str],
+        indices: List[int],
+        outcomes: Sequence[Tuple[List[BaseMessage], TaskResult]],
+    ) -> Dict[str, Any]:
+        # 状态未声明 reducer，这里保留已有消息与结果后再追加
+        messages: List[BaseMessage] = list(state.get("messages", []) or [])
+        task_results: List[TaskResult] = list(state.get("task_results", []) or [])
+        for task_index, (task_messages, task_result) in zip(indices, outcomes):
+            messages.append(self._task_instruction(task_index, plan[task_index]))
+            messages.extend(task_messages)
+            task_results.append(task_result)
+        return {
+            "messages": messages,
+            "task_results": task_results,
+            "current_task_index": len(plan),
+            "executor_ready": False,
+            "active_task_index": None,
+        }
+
+    async def ainvoke_parallel(
+        self, state: ResearchState, config: Optional[RunnableConfig] = None
+    ) -> Dict[str, Any]:
+        """``invoke_parallel`` 的异步版本"""
+        plan: Sequence[str] = state.get("plan", []) or []
+        start_index = state.get("current_task_index", 0)
+        indices = list(range(start_index, len(plan)))
+        if not indices:
+            return {"executor_ready": False}
+
+        limit = asyncio.Semaphore(max(self.max_workers, 1))
+        run_id = self._run_id(config)
+
+        async def run(task_index: int):
+            async with limit:
+                return await self._arun_task(task_index, plan[task_index], self.planning_port, run_id)
+
+        # 任一任务被取消（如客户端断开）时 gather 会取消其余任务
+        outcomes = await asyncio.gather(*(run(i) for i in indices))
+        return self._collect_parallel(state, plan, indices, outcomes)
+
+    @staticmethod
+    def _task_instruction(index: int, task: str) -> HumanMessage:
+        return HumanMessage(
+            content=f"请执行第{index + 1}步任务：{task}",
+            additional_kwargs={"task_index": index, "role": "planner_instructions"},
+        )
+
+    @staticmethod
+    def _run_id(config: Optional[RunnableConfig]) -> str:
+        """当前运行的标识（LangGraph thread_id），用于区分不同会话的同名任务
+
+        没有 thread_id 时为本次调用生成一次性标识，检查点只在本次调用的重试间共享，
+        不会被其他计划中同名任务恢复。
+        """
+        configurable = (config or {}).get("configurable") or {}
+        return str(configurable.get("thread_id") or uuid4().hex)
+
+    def _agent_call(
+        self, task_index: int, task: str, planning_port: int, run_id: str = "", **kwargs: Any
+    ) -> functools.partial:
+        if self.checkpoint_store is not None:
+            kwargs["checkpoint_store"] = self.checkpoint_store
+            kwargs["task_id"] = make_task_id(run_id, task_index, task)
+        input_payload = {
+            "item": {"question": task, "answer": ""},
+            "planning_port": planning_port,
+        }
+        return functools.partial(
+            self.agent._run,
+            input_payload,
+            self.model,
+            max_rounds=self.max_rounds,
+            max_runtime_seconds=self.timeout_seconds,
+            **kwargs,
+        )
+
+    def _run_task(
+        self, task_index: int, task: str, planning_port: int, run_id: str = ""
+    ) -> Tuple[List[BaseMessage], TaskResult]:
+        """执行单个任务（含重试），返回消息与任务结果"""
         attempt = 0
         errors: List[str] = []
         start_ts = time.time()
@@ -72,50 +228,105 @@ class DeepResearchAdapter(RunnableSerializable):
         while attempt < max(self.max_retries or 1, 1):
             attempt += 1
             try:
-                input_payload = {
-                    "item": {"question": task, "answer": ""},
-                    "planning_port": self.planning_port,
-                }
-                result = self.agent._run(
-                    input_payload,
-                    self.model,
-                    max_rounds=self.max_rounds,
-                    max_runtime_seconds=self.timeout_seconds,
-                )
+                result = self._agent_call(task_index, task, planning_port, run_id)()
             except Exception as exc:  # noqa: BLE001
                 errors.append(str(exc))
                 if self.logger:
                     self.logger.error("DeepResearch 执行异常: %s", exc, exc_info=True)
                 continue
+            if self._is_agent_error(result):
+                errors.append(result.get("prediction", ""))
+                continue
+            return self._task_success(task_index, task, result, attempt, start_ts)
 
-            messages_raw: List[Dict[str, Any]] = result.get("messages", [])
-            parsed_messages = self._convert_messages(messages_raw)
-            final_answer = result.get("prediction", "")
-            termination = result.get("termination", "unknown")
-            elapsed = time.time() - start_ts
-            tool_calls = self._collect_tool_calls(parsed_messages)
+        return self._task_failure(task_index, task, errors, attempt, start_ts)
 
-            task_result: TaskResult = {
-                "task_index": task_index,
-                "task": task,
-                "answer": final_answer,
-                "status": "success",
-                "termination": termination,
-                "attempts": attempt,
-                "elapsed": elapsed,
-                "tool_calls": tool_calls,
-                "raw_messages": messages_raw,
-            }
+    async def _arun_task(
+        self, task_index: int, task: str, planning_port: int, run_id: str = ""
+    ) -> Tuple[List[BaseMessage], TaskResult]:
+        """``_run_task`` 的异步版本。
 
-            return {
-                "messages": parsed_messages,
-                "task_results": [task_result],
-                "current_task_index": task_index + 1,
-                "executor_ready": False,
-                "active_task_index": None,
-            }
+        agent 在专用线程池中运行；超时或协程被取消时设置 cancel_event，
+        agent 在下一轮开始前停止，取消（CancelledError）继续向上传递。
+        启用检查点时超时也会重试，从最后完成的轮次继续。
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        errors: List[str] = []
+        start_ts = time.time()
+        # 留出余量，让 agent 先按 max_runtime_seconds 自行结束
+        deadline = self.timeout_seconds + _TIMEOUT_GRACE_SECONDS if self.timeout_seconds else None
+        termination = "exception"
 
-        failure_elapsed = time.time() - start_ts
+        while attempt < max(self.max_retries or 1, 1):
+            attempt += 1
+            cancel_event = threading.Event()
+            call = self._agent_call(task_index, task, planning_port, run_id, cancel_event=cancel_event)
+            future = loop.run_in_executor(_agent_executor, call)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), deadline)
+            except asyncio.TimeoutError:
+                cancel_event.set()
+                termination = "timeout"
+                errors.append(f"执行超时（{self.timeout_seconds}s）")
+                if self.logger:
+                    self.logger.error("DeepResearch 任务超时: %s", task)
+                if self.checkpoint_store is None:
+                    break
+                # 等待被中止的一次尝试停下，避免它与重试同时写入同一检查点
+                await asyncio.wait({future}, timeout=_TIMEOUT_GRACE_SECONDS)
+                continue
+            except asyncio.CancelledError:
+                cancel_event.set()
+                raise
+            except Exception as exc:  # noqa: BLE001
+                errors.append(str(exc))
+                if self.logger:
+                    self.logger.error("DeepResearch 执行异常: %s", exc, exc_info=True)
+                continue
+            if self._is_agent_error(result):
+                errors.append(result.get("prediction", ""))
+                continue
+            return self._task_success(task_index, task, result, attempt, start_ts)
+
+        return self._task_failure(task_index, task, errors, attempt, start_ts, termination)
+
+    def _is_agent_error(self, result: Dict[str, Any]) -> bool:
+        """agent 内部异常以 termination=error 返回；启用检查点时按失败重试，从最后完成的轮次继续"""
+        if self.checkpoint_store is None or result.get("termination") != "error":
+            return False
+        if self.logger:
+            self.logger.warning("DeepResearch 执行失败，将从检查点重试: %s", result.get("prediction"))
+        return True
+
+    def _task_success(
+        self, task_index: int, task: str, result: Dict[str, Any], attempt: int, start_ts: float
+    ) -> Tuple[List[BaseMessage], TaskResult]:
+        messages_raw: List[Dict[str, Any]] = result.get("messages", [])
+        parsed_messages = self._convert_messages(messages_raw)
+        task_result: TaskResult = {
+            "task_index": task_index,
+            "task": task,
+            "answer": result.get("prediction", ""),
+            "status": "success",
+            "termination": result.get("termination", "unknown"),
+            "attempts": attempt,
+            "resumed_rounds": result.get("resumed_rounds", 0),
+            "elapsed": time.time() - start_ts,
+            "tool_calls": self._collect_tool_calls(parsed_messages),
+            "raw_messages": messages_raw,
+        }
+        return parsed_messages, task_result
+
+    def _task_failure(
+        self,
+        task_index: int,
+        task: str,
+        errors: List[str],
+        attempt: int,
+        start_ts: float,
+        termination: str = "exception",
+    ) -> Tuple[List[BaseMessage], TaskResult]:
         failure_message = AIMessage(
             content=f"执行任务失败：{task}\n错误信息：{errors[-1] if errors else '未知异常'}",
             additional_kwargs={
@@ -128,18 +339,12 @@ class DeepResearchAdapter(RunnableSerializable):
             "task_index": task_index,
             "task": task,
             "status": "failed",
-            "termination": "exception",
+            "termination": termination,
             "attempts": attempt,
-            "elapsed": failure_elapsed,
+            "elapsed": time.time() - start_ts,
             "errors": errors,
         }
-        return {
-            "messages": [failure_message],
-            "task_results": [failure_result],
-            "current_task_index": task_index + 1,
-            "executor_ready": False,
-            "active_task_index": None,
-        }
+        return [failure_message], failure_result
 
     def _convert_messages(self, messages: Iterable[Dict[str, Any]]) -> List[BaseMessage]:
         converted: List[BaseMessage] = []
@@ -323,13 +528,8 @@ class DeepResearchAdapter(RunnableSerializable):
             index = state.get("current_task_index", 0)
             if index >= len(plan):
                 return {"executor_ready": False, "active_task_index": None}
-            task = plan[index]
-            message = HumanMessage(
-                content=f"请执行第{index + 1}步任务：{task}",
-                additional_kwargs={"task_index": index, "role": "planner_instructions"},
-            )
             return {
-                "messages": [message],
+                "messages": [self._task_instruction(index, plan[index])],
                 "executor_ready": True,
                 "active_task_index": index,
             }
@@ -368,9 +568,22 @@ class DeepResearchAdapter(RunnableSerializable):
 
         graph = StateGraph(ResearchState)
         graph.add_node("planner", planner_node_factory(planner))
+        graph.add_node("synthesizer", synthesizer_node_factory(synthesizer))
+
+        if self.parallel:
+            # 并行模式：一次性分发全部任务，按计划顺序汇总后进入合成
+            graph.add_node(
+                "deepresearch",
+                RunnableLambda(self.invoke_parallel, afunc=self.ainvoke_parallel),
+            )
+            graph.add_edge(START, "planner")
+            graph.add_edge("planner", "deepresearch")
+            graph.add_edge("deepresearch", "synthesizer")
+            graph.add_edge("synthesizer", END)
+            return graph.compile()
+
         graph.add_node("select_task", select_task_node)
         graph.add_node("deepresearch", self)
-        graph.add_node("synthesizer", synthesizer_node_factory(synthesizer))
 
         graph.add_edge(START, "planner")
         graph.add_edge("planner", "select_task")
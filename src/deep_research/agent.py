@@ -6,14 +6,16 @@
 import json
 import json5
 import os
-from typing import Dict, List, Optional, Union
+import threading
+from typing import Dict, Iterator, List, Optional, Union
 
 from qwen_agent.agents.fncall_agent import FnCallAgent
 from qwen_agent.llm import BaseChatModel
 from qwen_agent.llm.schema import Message
 from qwen_agent.tools import BaseTool
 
-from src.deep_research.tools import TOOL_CLASS, TOOL_MAP
+from src.deep_research.checkpoint import TaskCheckpointStore
+from src.deep_research.tools import TOOL_MAP
 
 
 class MultiTurnReactAgent(FnCallAgent):
@@ -37,10 +39,19 @@ class MultiTurnReactAgent(FnCallAgent):
 
         self.llm_generate_cfg = llm.get("generate_cfg", {})
         self.llm_local_path = llm["model"]
-        self.function_list = function_list or [tool.name for tool in TOOL_CLASS]
+        self.function_list = function_list or list(TOOL_MAP)
         self.tool_map = TOOL_MAP
 
-    def _run(self, input_data: Dict, model: str, max_rounds: Optional[int] = None, max_runtime_seconds: Optional[int] = None) -> Dict:
+    def _run(
+        self,
+        input_data: Dict,
+        model: str,
+        max_rounds: Optional[int] = None,
+        max_runtime_seconds: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        checkpoint_store: Optional[TaskCheckpointStore] = None,
+        task_id: Optional[str] = None,
+    ) -> Dict:
         """运行代理执行深度调研任务
 
         Args:
@@ -48,23 +59,59 @@ class MultiTurnReactAgent(FnCallAgent):
             model: 模型路径
             max_rounds: 最大轮次
             max_runtime_seconds: 最大运行时间
+            cancel_event: 取消信号，设置后在下一次响应前停止
+            checkpoint_store: 检查点存储，每完成一轮保存一次消息历史
+            task_id: 检查点对应的任务 ID，存在检查点时从最后完成的轮次继续
 
         Returns:
             执行结果字典
         """
-        # 构建消息
+        # 构建消息，存在检查点时接上已完成轮次的历史
         messages = self._build_messages(input_data)
-
-        # 设置运行配置
+        checkpointing = checkpoint_store is not None and bool(task_id)
+        resumed: List[Message] = []
+        resumed_rounds = 0
+        if checkpointing:
+            checkpoint = checkpoint_store.load(task_id)
+            if checkpoint:
+                resumed = [Message(**m) for m in checkpoint["messages"]]
+                resumed_rounds = checkpoint["rounds"]
+        messages.extend(resumed)
+        saved_rounds = resumed_rounds
+
+        # 设置运行配置，恢复的轮次计入轮次预算（至少保留一轮用于作答）
         run_cfg = {
-            "max_round": max_rounds or 8,
+            "max_round": max((max_rounds or 8) - resumed_rounds, 1),
             "max_runtime_seconds": max_runtime_seconds or 2700,
         }
 
         # 执行代理
         try:
             result = self.run(messages, **run_cfg)
-            return self._format_result(result)
+            if isinstance(result, Iterator):
+                # run 逐轮产出响应，在轮次之间检查取消信号
+                responses = None
+                for responses in result:
+                    if checkpointing:
+                        saved_rounds = self._save_checkpoint(
+                            checkpoint_store, task_id, resumed, responses, saved_rounds
+                        )
+                    if cancel_event is not None and cancel_event.is_set():
+                        return {
+                            "prediction": "",
+                            "termination": "cancelled",
+                            "messages": [self._message_to_dict(m) for m in resumed + list(responses or [])],
+                            "success": False,
+                            "resumed_rounds": resumed_rounds,
+                        }
+                result = responses or []
+            if resumed and isinstance(result, list):
+                result = resumed + result
+            formatted = self._format_result(result)
+            formatted["resumed_rounds"] = resumed_rounds
+            if checkpointing:
+                checkpoint_store.delete(task_id)
+            return formatted
         except Exception as e:
             return {
                 "prediction": f"执行失败: {str(e)}",
@@ -73,6 +120,36 @@ class MultiTurnReactAgent(FnCallAgent):
                 "success": False
             }
 
+    def _save_checkpoint(
+        self,
+        store: TaskCheckpointStore,
+        task_id: str,
+        resumed: List[Message],
+        responses: Optional[List],
+        saved_rounds: int,
+    ) -> int:
+        """在出现新的已完成轮次时保存检查点
+
+        一轮以工具结果（function 消息）结束；流式输出中尚未完成的助手消息不保存。
+
+        Returns:
+            已保存的轮次数
+        """
+        completed = list(responses or [])
+        while completed and self._message_to_dict(completed[-1]).get("role") != "function":
+            completed.pop()
+        rounds = sum(1 for m in resumed + completed if self._message_to_dict(m).get("role") == "function")
+        if rounds <= saved_rounds:
+            return saved_rounds
+        store.save(task_id, [self._checkpoint_message(m) for m in resumed + completed], rounds)
+        return rounds
+
+    def _checkpoint_message(self, message) -> Dict:
+        """序列化消息，保留函数调用等字段以便恢复"""
+        if hasattr(message, "model_dump"):
+            return message.model_dump()
+        return self._message_to_dict(message)
+
     def _build_messages(self, input_data: Dict) -> List[Message]:
         """构建输入消息列表
 
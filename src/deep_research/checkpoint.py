@@ -0,0 +1,99 @@
+"""DeepResearch 任务检查点
+
+单个 DeepResearch 任务最长可运行 45 分钟，崩溃、重新部署或超时后，
+已完成的轮次不应全部丢失。``TaskCheckpointStore`` 将每个已完成轮次后的
+消息历史（包含工具调用结果）按任务 ID 写入本地 sqlite，重试或重新运行
+同一任务时从最后一个完成的轮次继续。任务成功结束后检查点即被删除。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def make_task_id(*parts: Any) -> str:
+    """由运行标识、任务序号与任务内容生成稳定的任务 ID"""
+    raw = "\x1f".join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class TaskCheckpointStore:
+    """基于 sqlite 的任务检查点存储，可在线程与进程间共享
+
+    Args:
+        path: sqlite 文件路径
+        ttl_seconds: 检查点保留时间，超时的检查点不再用于恢复
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_checkpoints ("
+                "task_id TEXT PRIMARY KEY, rounds INTEGER NOT NULL, "
+                "messages TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+        self.prune()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # 每次操作使用独立连接，避免跨线程共享连接
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """读取任务检查点，不存在或已过期时返回 None"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT rounds, messages, updated_at FROM task_checkpoints WHERE task_id = ?",
+                (task_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        rounds, messages, updated_at = row
+        if self.ttl_seconds and time.time() - updated_at > self.ttl_seconds:
+            self.delete(task_id)
+            return None
+        return {
+            "rounds": rounds,
+            "messages": json.loads(messages),
+            "updated_at": updated_at,
+        }
+
+    def save(self, task_id: str, messages: List[Dict[str, Any]], rounds: int) -> None:
+        """保存任务在第 ``rounds`` 轮结束后的消息历史"""
+        payload = json.dumps(messages, ensure_ascii=False)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_checkpoints (task_id, rounds, messages, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (task_id, rounds, payload, time.time()),
+            )
+
+    def delete(self, task_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM task_checkpoints WHERE task_id = ?", (task_id,))
+
+    def prune(self) -> int:
+        """删除过期检查点，返回删除数量"""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM task_checkpoints WHERE updated_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+        return cursor.rowcount
@@ -19,9 +19,15 @@ class DeepResearchConfig:
         self.enabled = os.getenv("DEEP_RESEARCHER_ENABLE", "false").lower() == "true"
         self.model = os.getenv("DEEPRESEARCH_MODEL", "alibaba/tongyi-deepresearch-30b-a3b")
         self.planning_port = int(os.getenv("DEEPRESEARCH_PORT", "6001"))
+        self.parallel = os.getenv("DEEPRESEARCH_PARALLEL", "false").lower() == "true"
+        # 并行模式下同时执行的任务数上限
+        self.max_workers = int(os.getenv("DEEPRESEARCH_MAX_WORKERS", "4"))
         self.max_rounds = int(os.getenv("DEEPRESEARCH_MAX_ROUNDS", "8"))
         self.timeout_seconds = int(os.getenv("DEEPRESEARCH_TIMEOUT", "2700"))
         self.max_retries = int(os.getenv("DEEPRESEARCH_RETRIES", "2"))
+        # 每轮检查点的 sqlite 路径，为空时不保存检查点
+        self.checkpoint_path = os.getenv("DEEPRESEARCH_CHECKPOINT_PATH", "")
+        self.checkpoint_ttl = int(os.getenv("DEEPRESEARCH_CHECKPOINT_TTL", "86400"))
 
         # OpenRouter 配置
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
@@ -174,15 +174,24 @@ def create_deep_research_node(
     # 创建代理
     agent = create_multi_turn_react_agent(config)
 
+    checkpoint_store = None
+    if config.checkpoint_path:
+        from src.deep_research.checkpoint import TaskCheckpointStore
+
+        checkpoint_store = TaskCheckpointStore(config.checkpoint_path, config.checkpoint_ttl)
+
     # 创建适配器
     adapter = DeepResearchAdapter(
         agent=agent,
         model=config.model,
         planning_port=config.planning_port,
+        parallel=config.parallel,
+        max_workers=config.max_workers,
         logger=logger or logging.getLogger(__name__),
         max_rounds=config.max_rounds,
         timeout_seconds=config.timeout_seconds,
         max_retries=config.max_retries,
+        checkpoint_store=checkpoint_store,
     )
 
     return DeepResearchNode(planner=planner, synthesizer=synthesizer, adapter=adapter)
@@ -1,25 +1,60 @@
 """深度调研工具适配
 
 将 Deer Flow 现有工具适配为 DeepResearch 可以使用的格式。
+
+工具在首次使用时才构建：导入本模块不会加载搜索配置或创建搜索客户端，
+未启用深度调研的部署不承担这部分开销。学术搜索与网络搜索共享同一个
+搜索后端。
 """
 
+import abc
 import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional, Union
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Sequence, Union
+
+_search_backend: Any = None
+_search_backend_lock = threading.Lock()
+
+
+def get_search_backend() -> Any:
+    """返回共享的搜索后端，首次调用时创建"""
+    global _search_backend
+    if _search_backend is None:
+        with _search_backend_lock:
+            if _search_backend is None:
+                from src.tools.search import get_web_search_tool
+
+                _search_backend = get_web_search_tool(max_search_results=10)
+    return _search_backend
+
+
+class DeepResearchTool(abc.ABC):
+    """工具适配器基类，提供异步调用"""
 
-from src.tools.search import get_web_search_tool
-from src.tools.crawl import crawl_tool
-from src.tools.python_repl import python_repl_tool
+    name: str = ""
 
+    @abc.abstractmethod
+    def call(self, params: Any, **kwargs) -> str:
+        """同步执行工具，返回文本结果"""
 
-class ScholarTool:
+    async def acall(self, params: Any, **kwargs) -> str:
+        """异步调用，在线程中执行同步的 call，不阻塞事件循环"""
+        return await asyncio.to_thread(self.call, params, **kwargs)
+
+
+class ScholarTool(DeepResearchTool):
     """学术搜索工具适配器"""
 
     def __init__(self):
         self.name = "google_scholar"
-        self.search_tool = get_web_search_tool(max_search_results=10)
         self.logger = logging.getLogger(__name__)
 
+    @functools.cached_property
+    def search_tool(self) -> Any:
+        return get_search_backend()
+
     def call(self, params: Dict[str, Any], **kwargs) -> str:
         """执行学术搜索"""
         query = params.get("query", "")
@@ -37,14 +72,17 @@ class ScholarTool:
             return f"搜索失败: {str(e)}"
 
 
-class SearchTool:
+class SearchTool(DeepResearchTool):
     """网络搜索工具适配器"""
 
     def __init__(self):
         self.name = "search"
-        self.search_tool = get_web_search_tool(max_search_results=10)
         self.logger = logging.getLogger(__name__)
 
+    @functools.cached_property
+    def search_tool(self) -> Any:
+        return get_search_backend()
+
     def call(self, params: Dict[str, Any], **kwargs) -> str:
         """执行网络搜索"""
         query = params.get("query", "")
@@ -60,14 +98,19 @@ class SearchTool:
             return f"搜索失败: {str(e)}"
 
 
-class VisitTool:
+class VisitTool(DeepResearchTool):
     """网页访问工具适配器"""
 
     def __init__(self):
         self.name = "visit"
-        self.crawl_tool = crawl_tool
         self.logger = logging.getLogger(__name__)
 
+    @functools.cached_property
+    def crawl_tool(self) -> Any:
+        from src.tools.crawl import crawl_tool
+
+        return crawl_tool
+
     def call(self, params: Dict[str, Any], **kwargs) -> str:
         """访问网页"""
         url = params.get("url", "")
@@ -83,14 +126,19 @@ class VisitTool:
             return f"访问失败: {str(e)}"
 
 
-class PythonInterpreterTool:
+class PythonInterpreterTool(DeepResearchTool):
     """Python代码执行工具适配器"""
 
     def __init__(self):
         self.name = "PythonInterpreter"
-        self.python_tool = python_repl_tool
         self.logger = logging.getLogger(__name__)
 
+    @functools.cached_property
+    def python_tool(self) -> Any:
+        from src.tools.python_repl import python_repl_tool
+
+        return python_repl_tool
+
     def call(self, params: Union[str, Dict[str, Any]], **kwargs) -> str:
         """执行Python代码"""
         if isinstance(params, str):
@@ -110,12 +158,60 @@ class PythonInterpreterTool:
             return f"代码执行失败: {str(e)}"
 
 
-# 创建工具实例
-TOOL_CLASS = [
-    ScholarTool(),
-    VisitTool(),
-    SearchTool(),
-    PythonInterpreterTool(),
-]
+class ToolRegistry(Mapping[str, DeepResearchTool]):
+    """按名称惰性构建工具的注册表，工具在首次访问时创建并缓存"""
+
+    def __init__(self, factories: Dict[str, Callable[[], DeepResearchTool]]):
+        self._factories = dict(factories)
+        self._tools: Dict[str, DeepResearchTool] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> DeepResearchTool:
+        tool = self._tools.get(name)
+        if tool is None:
+            factory = self._factories[name]
+            with self._lock:
+                tool = self._tools.get(name)
+                if tool is None:
+                    tool = self._tools[name] = factory()
+        return tool
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def call(self, name: str, params: Any, **kwargs) -> str:
+        return self[name].call(params, **kwargs)
+
+    async def acall(self, name: str, params: Any, **kwargs) -> str:
+        return await self[name].acall(params, **kwargs)
+
+
+class _ToolList(Sequence[DeepResearchTool]):
+    """按注册顺序访问工具实例，同样在访问时才构建"""
+
+    def __init__(self, registry: ToolRegistry):
+        self._registry = registry
+
+    def __getitem__(self, index):
+        names: List[str] = list(self._registry)
+        if isinstance(index, slice):
+            return [self._registry[name] for name in names[index]]
+        return self._registry[names[index]]
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+
+TOOL_MAP = ToolRegistry(
+    {
+        "google_scholar": ScholarTool,
+        "visit": VisitTool,
+        "search": SearchTool,
+        "PythonInterpreter": PythonInterpreterTool,
+    }
+)
 
-TOOL_MAP = {tool.name: tool for tool in TOOL_CLASS}
\ No newline at end of file
+TOOL_CLASS = _ToolList(TOOL_MAP)
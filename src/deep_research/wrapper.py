@@ -3,8 +3,10 @@
 实现可插拔的深度调研功能，支持在标准流程和深度调研流程之间切换。
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, Optional, TypeVar, Union
 
 from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
@@ -14,6 +16,22 @@ from src.graph.nodes import researcher_node
 from src.deep_research.node import DeepResearchNode, DeepResearchNodeOutputs
 from src.deep_research.config import DeepResearchConfig
 
+T = TypeVar("T")
+
+
+def _run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """在同步上下文中运行协程。
+
+    没有运行中的事件循环时直接 asyncio.run；已在事件循环中（如被异步图同步调用）
+    时在独立线程的新事件循环中运行，避免 run_until_complete 重入当前循环。
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class DeepResearchNodeWrapper:
     """深度调研节点包装器，实现可插拔逻辑"""
@@ -77,21 +95,11 @@ class DeepResearchNodeWrapper:
         Returns:
             执行结果Command
         """
-        import asyncio
-
         if not self.is_enabled or not self.deep_research_node:
             # 回退到标准researcher节点，需要处理异步调用
             self.logger.info("使用标准研究流程")
             try:
-                # 获取或创建事件循环
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                # 运行异步researcher_node
-                return loop.run_until_complete(researcher_node(state, config))
+                return _run_coroutine_sync(researcher_node(state, config))
             except Exception as e:
                 self.logger.error(f"标准研究流程执行失败: {e}", exc_info=True)
                 # 返回错误结果
@@ -124,15 +132,7 @@ class DeepResearchNodeWrapper:
             # 回退到标准流程
             self.logger.info("回退到标准研究流程")
             try:
-                # 获取或创建事件循环
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                # 运行异步researcher_node
-                return loop.run_until_complete(researcher_node(state, config))
+                return _run_coroutine_sync(researcher_node(state, config))
             except Exception as fallback_error:
                 self.logger.error(f"回退流程也失败了: {fallback_error}", exc_info=True)
                 # 返回错误结果
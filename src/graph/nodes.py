@@ -26,6 +26,7 @@ from src.tools import (
 )
 from src.tools.search import LoggedTavilySearch
 from src.rag import build_retriever
+from src.rag.background import background_priors, compress_priors
 from src.utils.json_utils import repair_json_output
 
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
@@ -74,74 +75,25 @@ def background_investigation_node(state: State, config: RunnableConfig):
         try:
             retriever = build_retriever()
             resources = (state.get("resources") or configurable.resources) or []
-            # 如果上游未提供资源，尝试从 LightRAG 服务发现资源
-            if (not resources) and hasattr(retriever, "list_resources"):
-                try:
-                    discovered = retriever.list_resources()
-                    if isinstance(discovered, list) and discovered:
-                        # 取前 1 个资源以降低上下文/请求成本
-                        resources = discovered[:1]
-                        logger.info("Discovered LightRAG resources for background.", extra={"count": len(discovered)})
-                except Exception as e:
-                    logger.warning(f"Failed to discover LightRAG resources: {e}")
-            if hasattr(retriever, "query_background_knowledge") and resources:
-                result = retriever.query_background_knowledge(query, resources)
-                # 结构化压缩：控制长度与条目上限
-                bg = (result.get("background") or "").strip()
-                entities = result.get("entities") or []
-                rels = result.get("relationships") or []
-                meta = result.get("metadata") or {}
-
-                # 提取最多 10 个实体名以示例
-                def _ename(e):
-                    return e.get("entity") or e.get("name") or str(e.get("id", ""))
-                entity_names = [n for n in (_ename(e) for e in entities) if n][:10]
-
-                summary_parts = [
-                    "以下为未验证先验，仅用于规划与假设构建，后续需逐条验证。",
-                ]
-                if bg:
-                    summary_parts.append("\n【背景摘要】\n" + bg)
-                if entity_names:
-                    summary_parts.append("\n【实体示例】\n- " + "\n- ".join(entity_names))
-                stats = {
-                    "total_entities": len(entities),
-                    "total_relationships": len(rels),
-                    "total_chunks": meta.get("total_chunks"),
-                    "mode": meta.get("mode"),
-                }
-                try:
-                    summary_parts.append("\n【统计】\n" + json.dumps(stats, ensure_ascii=False))
-                except Exception:
-                    pass
-                text_out = "\n\n".join(summary_parts)
+            # 背景检索结果按 (query, resources) 缓存；未提供资源时从资源目录发现
+            result = {}
+            if hasattr(retriever, "query_background_knowledge"):
+                result = background_priors.query(retriever, query, resources)
+            if result:
                 # 如果仅使用 background_search（或显式放宽），放开先验的 token 限制
                 relax_limits = (
                     os.getenv("RAG_DISABLE_LOCAL_SEARCH", "false").lower() in ("1", "true", "yes")
                     or os.getenv("BACKGROUND_PRIORS_RELAX_LIMITS", "false").lower() in ("1", "true", "yes")
                 )
-                if not relax_limits:
-                    # 严格长度限制（字符+近似token双重约束）
-                    char_limit = int(os.getenv("BACKGROUND_PRIORS_MAX_CHARS", "1200"))
-                    token_limit = int(os.getenv("BACKGROUND_PRIORS_MAX_TOKENS", "0"))
-
-                    def _approx_tokens(s: str) -> int:
-                        # 粗略估算：英语约 4 字符/Token，中文约 2 字符/Token，这里取 3 作为混合近似
-                        try:
-                            return (len(s) + 2) // 3
-                        except Exception:
-                            return len(s) // 3
-
-                    if len(text_out) > char_limit:
-                        text_out = text_out[:char_limit] + "\n...[truncated]"
-                    if token_limit and _approx_tokens(text_out) > token_limit:
-                        # 进一步按 token 预算裁剪
-                        ratio = token_limit / max(_approx_tokens(text_out), 1)
-                        new_len = int(len(text_out) * ratio)
-                        text_out = text_out[:new_len] + "\n...[truncated]"
+                # 结构化压缩：按 token 预算依次保留背景摘要、实体与关系
+                token_limit = 0 if relax_limits else int(os.getenv("BACKGROUND_PRIORS_MAX_TOKENS", "400"))
+                text_out = compress_priors(result, max_tokens=token_limit)
+                char_limit = int(os.getenv("BACKGROUND_PRIORS_MAX_CHARS", "0"))
+                if not relax_limits and char_limit and len(text_out) > char_limit:
+                    text_out = text_out[:char_limit] + "\n...[truncated]"
                 return {"background_investigation_results": text_out}
             else:
-                logger.info("LightRAG background disabled or no resources; fallback to web search.")
+                logger.info("LightRAG background returned no priors; fallback to web search.")
         except Exception as e:
             logger.warning(f"LightRAG background failed, fallback to web search: {e}")
     else:
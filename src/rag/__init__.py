@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .builder import build_retriever
+from .builder import RetrieverRegistry, build_retriever, retriever_registry
 from .ragflow import RAGFlowProvider
 from .retriever import Chunk, Document, Resource, Retriever
 from .vikingdb_knowledge_base import VikingDBKnowledgeBaseProvider
@@ -14,4 +14,6 @@ __all__ = [
     VikingDBKnowledgeBaseProvider,
     Chunk,
     build_retriever,
+    RetrieverRegistry,
+    retriever_registry,
 ]
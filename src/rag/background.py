@@ -0,0 +1,250 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Background priors from LightRAG for the background investigation step.
+
+LightRAG global-mode ``background_search`` takes seconds, and research topics
+repeat throughout the day. ``BackgroundPriorsService`` therefore caches the
+structured result per (case-folded query, resource set) for ``ttl`` seconds
+and discovers resources through the shared ``resource_catalog``, so neither
+the search nor the resource listing is repeated for a recent topic.
+Ingestion invalidates the cache.
+
+``compress_priors`` turns a result into the text handed to the planner:
+background sentences, entities and relationships are packed by priority into
+a token budget measured with the tokenizer, rather than cutting the text at
+an estimated length.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+from src.config.loader import get_int_env
+from src.rag.catalog import resource_catalog
+from src.rag.chunker import TokenCounter, get_token_counter, split_sentences
+from src.rag.embedding_cache import normalize_query
+from src.rag.result_cache import resource_key
+from src.rag.retriever import Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+PRIORS_HEADER = "以下为未验证先验，仅用于规划与假设构建，后续需逐条验证。"
+TRUNCATED_MARK = "...[truncated]"
+
+# Share of the budget the background summary may use before entities and
+# relationships are packed; unused tokens carry over.
+_BACKGROUND_SHARE = 0.6
+
+
+class BackgroundPriorsService:
+    """TTL + LRU cache in front of ``query_background_knowledge``.
+
+    Args:
+        ttl: Seconds a background result stays valid.
+        max_entries: Maximum number of cached results.
+        max_resources: Discovered resources used when none are selected.
+        clock: Time source, monotonic seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1800.0,
+        max_entries: int = 128,
+        max_resources: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 0)
+        self.max_resources = max(max_resources, 1)
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation; results fetched before it are not stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_resources(
+        self, retriever: Retriever, resources: Optional[Sequence[Resource]]
+    ) -> List[Resource]:
+        """Return ``resources``, or the first discovered ones if none are given."""
+        if resources:
+            return list(resources)
+        try:
+            discovered = resource_catalog.search(retriever)
+        except Exception as e:
+            logger.warning("Failed to discover LightRAG resources: %s", e)
+            return []
+        if discovered:
+            logger.info(
+                "Discovered LightRAG resources for background.",
+                extra={"count": len(discovered)},
+            )
+        # Only a few resources keep the request cheap.
+        return discovered[: self.max_resources]
+
+    def query(
+        self,
+        retriever: Retriever,
+        query: str,
+        resources: Optional[Sequence[Resource]] = None,
+    ) -> dict:
+        """Return the background result of ``query``, cached per resource set."""
+        resources = self.resolve_resources(retriever, resources)
+        if not resources:
+            return {}
+        key = (normalize_query(query).casefold(), resource_key(resources))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        result = retriever.query_background_knowledge(query, resources)
+        if result and self.max_entries:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (self._clock() + self.ttl, result)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self) -> None:
+        """Drop every cached result and ignore queries still in flight."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+def _entity_line(entity: dict) -> str:
+    name = entity.get("entity") or entity.get("name") or str(entity.get("id", ""))
+    description = (entity.get("description") or "").strip()
+    if not name:
+        return ""
+    return f"- {name}: {description}" if description else f"- {name}"
+
+
+def _relationship_line(rel: dict) -> str:
+    source = rel.get("src_id") or rel.get("source") or ""
+    target = rel.get("tgt_id") or rel.get("target") or ""
+    description = (rel.get("description") or rel.get("keywords") or "").strip()
+    if not (source and target):
+        return ""
+    line = f"- {source} -> {target}"
+    return f"{line}: {description}" if description else line
+
+
+def _rank(items: list) -> list:
+    """Order entities/relationships by score when LightRAG returns one."""
+    if any(isinstance(i, dict) and "score" in i for i in items):
+        return sorted(items, key=lambda i: -(i.get("score") or 0.0))
+    return items
+
+
+def _pack_lines(lines: List[str], budget: int, count_tokens: TokenCounter) -> tuple:
+    """Keep lines in order while they fit ``budget`` tokens."""
+    kept, used = [], 0
+    for line in lines:
+        tokens = count_tokens(line + "\n")
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    return kept, used
+
+
+def compress_priors(
+    result: dict,
+    max_tokens: int = 0,
+    max_entities: int = 10,
+    max_relationships: int = 10,
+    count_tokens: Optional[TokenCounter] = None,
+) -> str:
+    """Summarize a background result for the planner.
+
+    Args:
+        result: ``query_background_knowledge`` result.
+        max_tokens: Token budget of the summary; 0 keeps everything.
+        max_entities: Maximum number of entities listed.
+        max_relationships: Maximum number of relationships listed.
+        count_tokens: Token counter; defaults to ``get_token_counter()``.
+    """
+    background = (result.get("background") or "").strip()
+    entities = [e for e in result.get("entities") or [] if isinstance(e, dict)]
+    rels = [r for r in result.get("relationships") or [] if isinstance(r, dict)]
+    meta = result.get("metadata") or {}
+    stats = {
+        "total_entities": len(entities),
+        "total_relationships": len(rels),
+        "total_chunks": meta.get("total_chunks"),
+        "mode": meta.get("mode"),
+    }
+    stats_section = "【统计】\n" + json.dumps(stats, ensure_ascii=False)
+    entity_lines = [line for line in map(_entity_line, _rank(entities)) if line][
+        :max_entities
+    ]
+    rel_lines = [line for line in map(_relationship_line, _rank(rels)) if line][
+        :max_relationships
+    ]
+
+    if max_tokens <= 0:
+        sections = [PRIORS_HEADER]
+        if background:
+            sections.append("【背景摘要】\n" + background)
+        if entity_lines:
+            sections.append("【实体示例】\n" + "\n".join(entity_lines))
+        if rel_lines:
+            sections.append("【关系示例】\n" + "\n".join(rel_lines))
+        sections.append(stats_section)
+        return "\n\n".join(sections)
+
+    count_tokens = count_tokens or get_token_counter()
+    remaining = max_tokens - count_tokens(PRIORS_HEADER + "\n\n" + stats_section)
+    sections = [PRIORS_HEADER]
+
+    if background and remaining > 0:
+        sentences = [s.strip() for s in split_sentences(background)]
+        kept, used = _pack_lines(
+            sentences, int(remaining * _BACKGROUND_SHARE), count_tokens
+        )
+        if kept:
+            if len(kept) < len(sentences):
+                kept.append(TRUNCATED_MARK)
+            sections.append("【背景摘要】\n" + "\n".join(kept))
+            remaining -= used + count_tokens("【背景摘要】\n" + TRUNCATED_MARK)
+
+    for title, lines in (("【实体示例】", entity_lines), ("【关系示例】", rel_lines)):
+        if not lines or remaining <= 0:
+            continue
+        kept, used = _pack_lines(lines, remaining - count_tokens(title), count_tokens)
+        if kept:
+            sections.append(title + "\n" + "\n".join(kept))
+            remaining -= used + count_tokens(title)
+
+    sections.append(stats_section)
+    return "\n\n".join(sections)
+
+
+background_priors = BackgroundPriorsService(
+    ttl=get_int_env("RAG_BACKGROUND_CACHE_TTL", 1800),
+    max_entries=get_int_env("RAG_BACKGROUND_CACHE_MAX_ENTRIES", 128),
+)
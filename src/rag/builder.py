@@ -1,23 +1,220 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import logging
+import os
+import threading
+import time
+
+from src.config.loader import get_int_env, get_str_env
 from src.config.tools import SELECTED_RAG_PROVIDER, RAGProvider
 from src.rag.ragflow import RAGFlowProvider
+from src.rag.result_cache import with_result_cache
 from src.rag.retriever import Retriever
 from src.rag.vikingdb_knowledge_base import VikingDBKnowledgeBaseProvider
 from src.rag.milvus import MilvusProvider
 from src.rag.lightrag import LightRAGProvider
+from src.rag.embedded import EmbeddedProvider
+from src.rag.federated import FederatedRetriever
 
+logger = logging.getLogger(__name__)
 
-def build_retriever() -> Retriever | None:
-    if SELECTED_RAG_PROVIDER == RAGProvider.RAGFLOW.value:
+# Environment variable prefix that configures each provider. A change in any
+# of these variables yields a new registry entry instead of a stale instance.
+_PROVIDER_ENV_PREFIXES = {
+    RAGProvider.RAGFLOW.value: "RAGFLOW_",
+    RAGProvider.VIKINGDB_KNOWLEDGE_BASE.value: "VIKINGDB_KNOWLEDGE_BASE_",
+    RAGProvider.MILVUS.value: "MILVUS_",
+    RAGProvider.LIGHTRAG.value: "LIGHTRAG_",
+    RAGProvider.EMBEDDED.value: "EMBEDDED_",
+}
+# A federated retriever depends on the configuration of all its members.
+_PROVIDER_ENV_PREFIXES[RAGProvider.FEDERATED.value] = (
+    "RAG_FEDERATED_",
+    *_PROVIDER_ENV_PREFIXES.values(),
+)
+
+
+def _create_retriever(provider: str | None) -> Retriever | None:
+    if provider == RAGProvider.RAGFLOW.value:
         return RAGFlowProvider()
-    elif SELECTED_RAG_PROVIDER == RAGProvider.VIKINGDB_KNOWLEDGE_BASE.value:
+    elif provider == RAGProvider.VIKINGDB_KNOWLEDGE_BASE.value:
         return VikingDBKnowledgeBaseProvider()
-    elif SELECTED_RAG_PROVIDER == RAGProvider.MILVUS.value:
+    elif provider == RAGProvider.MILVUS.value:
         return MilvusProvider()
-    elif SELECTED_RAG_PROVIDER == RAGProvider.LIGHTRAG.value:
+    elif provider == RAGProvider.LIGHTRAG.value:
         return LightRAGProvider()
-    elif SELECTED_RAG_PROVIDER:
-        raise ValueError(f"Unsupported RAG provider: {SELECTED_RAG_PROVIDER}")
+    elif provider == RAGProvider.EMBEDDED.value:
+        return EmbeddedProvider()
+    elif provider == RAGProvider.FEDERATED.value:
+        return _create_federated_retriever()
+    elif provider:
+        raise ValueError(f"Unsupported RAG provider: {provider}")
     return None
+
+
+def _create_federated_retriever() -> FederatedRetriever:
+    names = [
+        name.strip()
+        for name in get_str_env("RAG_FEDERATED_PROVIDERS").split(",")
+        if name.strip()
+    ]
+    if not names:
+        raise ValueError("RAG_FEDERATED_PROVIDERS is required for federated RAG")
+    if RAGProvider.FEDERATED.value in names:
+        raise ValueError("Federated RAG providers cannot be nested")
+    try:
+        timeout = float(get_str_env("RAG_FEDERATED_TIMEOUT", "10"))
+    except ValueError:
+        timeout = 10.0
+    return FederatedRetriever(
+        {name: _create_retriever(name) for name in dict.fromkeys(names)},
+        timeout=timeout,
+    )
+
+
+class RetrieverRegistry:
+    """
+    Process-wide registry of long-lived retriever instances.
+
+    One retriever is created per provider configuration and shared across
+    requests, so embedding clients and database connections are set up once.
+    The registry owns the lifecycle: ``startup`` connects eagerly, ``shutdown``
+    closes every instance, and ``get`` re-checks provider health at most every
+    ``health_check_interval`` seconds. An unhealthy provider is replaced by a
+    freshly connected instance; the old one is closed ``retire_grace_period``
+    seconds later, so requests still holding it can finish, or on
+    ``shutdown``.
+    """
+
+    def __init__(
+        self, health_check_interval: float = 30.0, retire_grace_period: float = 60.0
+    ):
+        self.health_check_interval = health_check_interval
+        self.retire_grace_period = retire_grace_period
+        self._lock = threading.RLock()
+        self._retrievers: dict[tuple, Retriever] = {}
+        self._last_checked: dict[tuple, float] = {}
+        # One reconnect at a time per provider configuration.
+        self._reconnect_locks: dict[tuple, threading.Lock] = {}
+        # Replaced instances and when they may be closed.
+        self._retired: list[tuple[float, Retriever]] = []
+
+    def _config_key(self, provider: str) -> tuple:
+        prefix = _PROVIDER_ENV_PREFIXES.get(provider)
+        env = (
+            tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith(prefix)))
+            if prefix
+            else ()
+        )
+        return (provider, env)
+
+    def get(self, provider: str | None = None) -> Retriever | None:
+        """Return the shared retriever for ``provider`` (default: configured one)."""
+        provider = provider if provider is not None else SELECTED_RAG_PROVIDER
+        if not provider:
+            return None
+        key = self._config_key(provider)
+        if self._retired:
+            self._close_retired()
+        retriever = self._retrievers.get(key)
+        if retriever is None:
+            with self._lock:
+                retriever = self._retrievers.get(key)
+                if retriever is None:
+                    retriever = with_result_cache(_create_retriever(provider))
+                    self._retrievers[key] = retriever
+                    self._last_checked[key] = time.monotonic()
+                    logger.info("Created shared RAG retriever: %s", provider)
+                    return retriever
+        return self._check_health(key, retriever)
+
+    def _check_health(self, key: tuple, retriever: Retriever) -> Retriever:
+        if (
+            time.monotonic() - self._last_checked.get(key, 0.0)
+            < self.health_check_interval
+        ):
+            return retriever
+        with self._lock:
+            reconnect_lock = self._reconnect_locks.setdefault(key, threading.Lock())
+        # Another request is already checking this provider: use what we have.
+        if not reconnect_lock.acquire(blocking=False):
+            return retriever
+        try:
+            current = self._retrievers.get(key)
+            if current is not retriever:
+                # Already replaced (or the registry was shut down).
+                return current or retriever
+            now = time.monotonic()
+            if now - self._last_checked.get(key, 0.0) < self.health_check_interval:
+                return retriever
+            self._last_checked[key] = now
+            if retriever.health_check():
+                return retriever
+            logger.warning("RAG retriever %s is unhealthy, reconnecting", key[0])
+            try:
+                fresh = with_result_cache(_create_retriever(key[0]))
+                fresh.connect()
+            except Exception as e:
+                logger.warning("Failed to reconnect RAG retriever %s: %s", key[0], e)
+                return retriever
+            with self._lock:
+                # Shut down in the meantime: do not resurrect the entry.
+                if self._retrievers.get(key) is not retriever:
+                    fresh.close()
+                    return retriever
+                self._retrievers[key] = fresh
+                self._retired.append(
+                    (time.monotonic() + self.retire_grace_period, retriever)
+                )
+            return fresh
+        finally:
+            reconnect_lock.release()
+
+    def _close_retired(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [r for deadline, r in self._retired if force or deadline <= now]
+            self._retired = [
+                (deadline, r)
+                for deadline, r in self._retired
+                if not force and deadline > now
+            ]
+        for retriever in due:
+            try:
+                retriever.close()
+            except Exception as e:
+                logger.warning("Failed to close replaced RAG retriever: %s", e)
+
+    def startup(self) -> None:
+        """Create and connect the configured retriever ahead of the first request."""
+        try:
+            retriever = self.get()
+            if retriever:
+                retriever.connect()
+        except Exception as e:
+            logger.warning("Failed to start RAG retriever: %s", e)
+
+    def shutdown(self) -> None:
+        """Close and forget every retriever (idempotent)."""
+        with self._lock:
+            retrievers = list(self._retrievers.values())
+            self._retrievers.clear()
+            self._last_checked.clear()
+            self._reconnect_locks.clear()
+        for retriever in retrievers:
+            try:
+                retriever.close()
+            except Exception as e:
+                logger.warning("Failed to close RAG retriever: %s", e)
+        self._close_retired(force=True)
+
+
+retriever_registry = RetrieverRegistry(
+    health_check_interval=get_int_env("RAG_HEALTH_CHECK_INTERVAL", 30)
+)
+
+
+def build_retriever() -> Retriever | None:
+    """Return the shared retriever for the configured provider."""
+    return retriever_registry.get()
@@ -0,0 +1,215 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-memory catalog of RAG resources for interactive lookups.
+
+``ResourceCatalog`` loads the full resource list of a retriever once and
+answers filtered lookups from memory, so the resource picker does not hit
+the provider on every keystroke. A catalog older than ``refresh_interval``
+is still served while a background refresh replaces it, and ingestion marks
+every catalog stale.
+
+Lookups match the query against resource titles, URIs and descriptions:
+title prefixes rank first, then word prefixes, then substrings, then fuzzy
+(character trigram) matches, which tolerate typos.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.config.loader import get_int_env
+from src.rag.retriever import Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Share of the query's trigrams a resource must contain to match fuzzily.
+_FUZZY_MIN_OVERLAP = 0.5
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _Index:
+    """Resources of one retriever with sorted prefix keys and a trigram index."""
+
+    def __init__(self, resources: List[Resource]):
+        self.resources = resources
+        titles = [(r.title or "").lower() for r in resources]
+        self.texts = [
+            f"{title}\n{r.uri.lower()}\n{(r.description or '').lower()}"
+            for title, r in zip(titles, resources)
+        ]
+        words = [_WORD_RE.findall(title) for title in titles]
+        # Sorted (key, position) pairs: prefix matches are a bisected range.
+        self.title_keys = sorted((title, i) for i, title in enumerate(titles))
+        self.word_keys = sorted(
+            {(word, i) for i, title_words in enumerate(words) for word in title_words}
+        )
+        self.trigrams: Dict[str, List[int]] = {}
+        for i, title_words in enumerate(words):
+            for gram in set().union(*map(_trigrams, title_words)):
+                self.trigrams.setdefault(gram, []).append(i)
+
+    @staticmethod
+    def _prefixed(keys: List[Tuple[str, int]], prefix: str) -> List[int]:
+        matches = []
+        for key, i in keys[bisect.bisect_left(keys, (prefix, -1)) :]:
+            if not key.startswith(prefix):
+                break
+            matches.append(i)
+        return sorted(set(matches))
+
+    def search(self, query: str) -> List[Resource]:
+        query = query.strip().lower()
+        if not query:
+            return list(self.resources)
+        matched: List[int] = []
+        seen: Set[int] = set()
+        for tier in (
+            self._prefixed(self.title_keys, query),
+            self._prefixed(self.word_keys, query),
+            [i for i, text in enumerate(self.texts) if query in text],
+        ):
+            matched.extend(i for i in tier if i not in seen)
+            seen.update(tier)
+
+        # Fuzzy matching needs a few characters to be meaningful.
+        grams = set().union(*map(_trigrams, _WORD_RE.findall(query)))
+        if grams and len(query) >= 3:
+            overlap = Counter(
+                i
+                for gram in grams
+                for i in self.trigrams.get(gram, ())
+                if i not in seen
+            )
+            fuzzy = [
+                i
+                for i, shared in overlap.items()
+                if shared / len(grams) >= _FUZZY_MIN_OVERLAP
+            ]
+            matched += sorted(fuzzy, key=lambda i: (-overlap[i], i))
+        return [self.resources[i] for i in matched]
+
+
+class _Entry:
+    def __init__(self, index: _Index):
+        self.index = index
+        self.loaded_at = float("-inf")
+        self.refreshing = False
+
+
+class ResourceCatalog:
+    """Cached, locally filtered ``list_resources`` for shared retrievers.
+
+    Args:
+        refresh_interval: Seconds after which a catalog is refreshed in the
+            background on its next lookup.
+        max_providers: Number of retrievers whose catalogs are kept.
+        clock: Time source, monotonic seconds.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 300.0,
+        max_providers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval = refresh_interval
+        self.max_providers = max_providers
+        self._clock = clock
+        self._entries: "OrderedDict[Retriever, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation so a refresh that started before it is
+        # loaded as already stale.
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="rag-catalog"
+        )
+
+    def _load(self, retriever: Retriever) -> _Entry:
+        generation = self._generation
+        resources = [
+            r if isinstance(r, Resource) else Resource.model_validate(r)
+            for r in retriever.list_resources(None) or []
+        ]
+        entry = _Entry(_Index(resources))
+        with self._lock:
+            if generation == self._generation:
+                entry.loaded_at = self._clock()
+            else:
+                entry.loaded_at = float("-inf")
+            self._entries[retriever] = entry
+            self._entries.move_to_end(retriever)
+            while len(self._entries) > self.max_providers:
+                self._entries.popitem(last=False)
+        logger.debug("Loaded %d RAG resources into the catalog", len(resources))
+        return entry
+
+    def _refresh(self, retriever: Retriever, entry: _Entry) -> None:
+        try:
+            self._load(retriever)
+        except Exception as e:
+            logger.warning("Failed to refresh RAG resource catalog: %s", e)
+            entry.loaded_at = self._clock()  # retry after another interval
+        finally:
+            entry.refreshing = False
+
+    def search(self, retriever: Retriever, query: str | None = None) -> List[Resource]:
+        """Return the resources of ``retriever`` matching ``query``.
+
+        The first lookup for a retriever loads its catalog synchronously;
+        later lookups never wait for the provider.
+        """
+        with self._lock:
+            entry = self._entries.get(retriever)
+            stale = entry is not None and (
+                self._clock() - entry.loaded_at >= self.refresh_interval
+            )
+            if stale and not entry.refreshing:
+                entry.refreshing = True
+                self._executor.submit(self._refresh, retriever, entry)
+        if entry is None:
+            entry = self._load(retriever)
+        return entry.index.search(query or "")
+
+    def warm(self, retriever: Optional[Retriever]) -> None:
+        """Load the catalog of ``retriever`` in the background."""
+        if retriever is None:
+            return
+        with self._lock:
+            if retriever in self._entries:
+                return
+        self._executor.submit(self._warm, retriever)
+
+    def _warm(self, retriever: Retriever) -> None:
+        try:
+            self._load(retriever)
+        except Exception as e:
+            logger.warning("Failed to load RAG resource catalog: %s", e)
+
+    def invalidate(self) -> None:
+        """Mark every catalog stale; the next lookup triggers a refresh."""
+        with self._lock:
+            self._generation += 1
+            for entry in self._entries.values():
+                entry.loaded_at = float("-inf")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+resource_catalog = ResourceCatalog(
+    refresh_interval=get_int_env("RAG_RESOURCE_CATALOG_REFRESH_INTERVAL", 300)
+)
@@ -0,0 +1,696 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Embedded, in-process vector store RAG provider.
+
+Embeddings live in a memory-mapped ``.npy`` matrix (float16 or float32) and
+chunk metadata in a SQLite sidecar, both under ``EMBEDDED_STORE_PATH``. Opening
+a store only maps the file, so startup is near-instant, and search is a
+vectorized matrix product in the serving process with no network hop.
+
+Search is exact (brute force) by default. With ``EMBEDDED_INDEX=ivf`` an
+inverted-file index (spherical k-means centroids) is trained once the store
+holds ``EMBEDDED_IVF_MIN_ROWS`` chunks and only the ``EMBEDDED_IVF_NPROBE``
+closest lists are scanned. Resource filters are turned into row masks that
+are cached until the store changes.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+from src.rag.chunker import MarkdownChunker
+from src.rag.embedding_cache import EmbeddingCache
+from src.rag.hybrid import BM25Index, hybrid_search
+from src.rag.milvus import DashscopeEmbeddings, IngestionProgress
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.npy"
+_CENTROIDS_FILE = "centroids.npy"
+_METADATA_FILE = "metadata.db"
+# Rows scored per matrix product; bounds the float32 working set of a scan.
+_SCAN_BLOCK = 65536
+# Cached resource-filter masks.
+_MASK_CACHE_SIZE = 64
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddedVectorStore:
+    """Append-only memory-mapped vector matrix with a SQLite metadata table.
+
+    Vectors are L2-normalized on insert so inner product equals cosine
+    similarity. Deleted chunks leave a tombstoned row behind until
+    ``compact`` rewrites the matrix.
+
+    Args:
+        path: Directory holding the store files (created if missing).
+        dim: Embedding dimensionality; must match an existing store.
+        dtype: ``float32`` or ``float16``; float16 halves memory and disk at
+            the cost of an up-conversion per scanned block.
+    """
+
+    def __init__(self, path: str | Path, dim: int, dtype: str = "float32"):
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.path / _METADATA_FILE), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, url TEXT, "
+            "title TEXT, content TEXT, metadata TEXT, list INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS chunks_url ON chunks (url)")
+        self._db.commit()
+        self._open()
+
+    # --- loading ---------------------------------------------------------
+
+    def _open(self) -> None:
+        vectors_path = self.path / _VECTORS_FILE
+        if vectors_path.exists():
+            self._matrix = np.load(vectors_path, mmap_mode="r+")
+            if self._matrix.shape[1] != self.dim or self._matrix.dtype != self.dtype:
+                raise ValueError(
+                    f"Embedded store {self.path} holds {self._matrix.dtype} vectors "
+                    f"of dim {self._matrix.shape[1]}, expected {self.dtype} of dim {self.dim}"
+                )
+        else:
+            self._matrix = self._allocate(vectors_path, 1024)
+        centroids_path = self.path / _CENTROIDS_FILE
+        self.centroids: Optional[np.ndarray] = (
+            np.load(centroids_path) if centroids_path.exists() else None
+        )
+
+        rows = self._db.execute("SELECT row, id, url, list FROM chunks").fetchall()
+        # Rows past the last committed metadata row are from an interrupted
+        # insert and are overwritten by the next one.
+        self.count = max((r[0] for r in rows), default=-1) + 1
+        self._valid = np.zeros(self._matrix.shape[0], dtype=bool)
+        self._lists = np.full(self._matrix.shape[0], -1, dtype=np.int32)
+        self._ids: Dict[str, int] = {}
+        self._url_rows: Dict[str, List[int]] = {}
+        for row, chunk_id, url, list_id in rows:
+            self._valid[row] = True
+            self._lists[row] = -1 if list_id is None else list_id
+            self._ids[chunk_id] = row
+            self._url_rows.setdefault(url or "", []).append(row)
+        self._masks: "OrderedDict[frozenset, np.ndarray]" = OrderedDict()
+
+    def _allocate(self, path: Path, capacity: int) -> np.ndarray:
+        matrix = np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype, shape=(capacity, self.dim)
+        )
+        matrix.flush()
+        return matrix
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the mapped matrix (doubling) so ``rows`` more rows fit."""
+        needed = self.count + rows
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        final_path = self.path / _VECTORS_FILE
+        tmp_path = self.path / f"{_VECTORS_FILE}.tmp"
+        grown = self._allocate(tmp_path, capacity)
+        grown[: self.count] = self._matrix[: self.count]
+        grown.flush()
+        del grown
+        del self._matrix
+        os.replace(tmp_path, final_path)
+        self._matrix = np.load(final_path, mmap_mode="r+")
+        self._valid = np.concatenate(
+            [self._valid, np.zeros(capacity - len(self._valid), dtype=bool)]
+        )
+        self._lists = np.concatenate(
+            [self._lists, np.full(capacity - len(self._lists), -1, dtype=np.int32)]
+        )
+
+    def _changed(self) -> None:
+        self._masks.clear()
+
+    # --- writes ----------------------------------------------------------
+
+    def add(self, chunks: List[Dict[str, Any]], vectors: np.ndarray) -> int:
+        """Store ``chunks`` (``id``/``content``/``title``/``url``/``metadata``).
+
+        Chunks whose id already exists are replaced. Returns the number of
+        chunks written.
+        """
+        if not chunks:
+            return 0
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(chunks), self.dim):
+            raise ValueError(
+                f"Expected {len(chunks)} vectors of dim {self.dim}, got {vectors.shape}"
+            )
+        with self._lock:
+            replaced = [c["id"] for c in chunks if c["id"] in self._ids]
+            if replaced:
+                self.delete(replaced)
+            self._reserve(len(chunks))
+            start = self.count
+            rows = range(start, start + len(chunks))
+            self._matrix[start : start + len(chunks)] = vectors.astype(self.dtype)
+            self._matrix.flush()
+            lists = (
+                self._assign(vectors)
+                if self.centroids is not None
+                else np.full(len(chunks), -1, dtype=np.int32)
+            )
+            # Vectors are flushed before their metadata commits, so a crash
+            # never leaves metadata pointing at an unwritten row.
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO chunks (row, id, url, title, content, metadata, list) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            row,
+                            c["id"],
+                            c.get("url") or "",
+                            c.get("title") or "",
+                            c.get("content") or "",
+                            json.dumps(c.get("metadata") or {}, ensure_ascii=False),
+                            None if list_id < 0 else int(list_id),
+                        )
+                        for row, c, list_id in zip(rows, chunks, lists)
+                    ],
+                )
+            for row, c, list_id in zip(rows, chunks, lists):
+                self._valid[row] = True
+                self._lists[row] = list_id
+                self._ids[c["id"]] = row
+                self._url_rows.setdefault(c.get("url") or "", []).append(row)
+            self.count += len(chunks)
+            self._changed()
+        return len(chunks)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Delete chunks by id; returns the number of chunks removed."""
+        with self._lock:
+            rows = [self._ids.pop(cid) for cid in set(ids) if cid in self._ids]
+            if not rows:
+                return 0
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM chunks WHERE row = ?", [(row,) for row in rows]
+                )
+            removed = set(rows)
+            self._valid[rows] = False
+            for url in list(self._url_rows):
+                kept = [r for r in self._url_rows[url] if r not in removed]
+                if kept:
+                    self._url_rows[url] = kept
+                else:
+                    del self._url_rows[url]
+            self._changed()
+            return len(rows)
+
+    def compact(self) -> None:
+        """Rewrite the matrix without tombstoned rows."""
+        with self._lock:
+            live = np.flatnonzero(self._valid[: self.count])
+            if len(live) == self.count:
+                return
+            vectors = np.asarray(self._matrix[live])
+            with self._db:
+                self._db.execute("UPDATE chunks SET row = -row - 1")
+                self._db.executemany(
+                    "UPDATE chunks SET row = ? WHERE row = ?",
+                    [(new, -int(old) - 1) for new, old in enumerate(live)],
+                )
+            self._matrix[: len(live)] = vectors
+            self._matrix.flush()
+            self._open()
+
+    # --- IVF index -------------------------------------------------------
+
+    def train_ivf(self, nlist: int, iterations: int = 10, seed: int = 0) -> None:
+        """Train ``nlist`` spherical k-means centroids and assign every row."""
+        with self._lock:
+            live = np.flatnonzero(self._valid[: self.count])
+            nlist = min(nlist, len(live))
+            if nlist < 1:
+                return
+            rng = np.random.default_rng(seed)
+            sample = np.sort(
+                rng.choice(live, size=min(len(live), nlist * 256), replace=False)
+            )
+            points = np.asarray(self._matrix[sample], dtype=np.float32)
+            centroids = points[rng.choice(len(points), size=nlist, replace=False)]
+            for _ in range(iterations):
+                labels = (points @ centroids.T).argmax(axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, points)
+                empty = np.bincount(labels, minlength=nlist) == 0
+                # Re-seed empty lists with random points.
+                sums[empty] = points[rng.choice(len(points), size=int(empty.sum()))]
+                centroids = _normalize(sums)
+            self.centroids = centroids
+            np.save(self.path / _CENTROIDS_FILE, centroids)
+            lists = np.full(self.count, -1, dtype=np.int32)
+            for start in range(0, self.count, _SCAN_BLOCK):
+                end = min(start + _SCAN_BLOCK, self.count)
+                block = np.asarray(self._matrix[start:end], dtype=np.float32)
+                lists[start:end] = self._assign(block)
+            lists[~self._valid[: self.count]] = -1
+            self._lists[: self.count] = lists
+            with self._db:
+                self._db.executemany(
+                    "UPDATE chunks SET list = ? WHERE row = ?",
+                    [(int(lists[row]), int(row)) for row in live],
+                )
+            self._changed()
+            logger.info("Trained IVF index with %d lists on %d rows", nlist, len(live))
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return (vectors @ self.centroids.T).argmax(axis=1).astype(np.int32)
+
+    # --- search ----------------------------------------------------------
+
+    def mask(self, uris: Iterable[str]) -> np.ndarray:
+        """Row mask of chunks whose url or id is one of ``uris`` (cached)."""
+        key = frozenset(uris)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+            mask = np.zeros(self.count, dtype=bool)
+            for uri in key:
+                mask[self._url_rows.get(uri, [])] = True
+                if uri in self._ids:
+                    mask[self._ids[uri]] = True
+            self._masks[key] = mask
+            while len(self._masks) > _MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+            return mask
+
+    def search(
+        self,
+        query: List[float],
+        k: int,
+        uris: Optional[Iterable[str]] = None,
+        nprobe: int = 0,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return the ``k`` most similar chunks as ``(chunk, similarity)``.
+
+        Args:
+            query: Query embedding.
+            k: Number of chunks to return.
+            uris: Restrict the search to these document urls / chunk ids.
+            nprobe: IVF lists to scan; 0 (or no trained index) scans every row.
+        """
+        q = _normalize(query)
+        with self._lock:
+            count = self.count
+            matrix = self._matrix
+            allowed = self._valid[:count].copy()
+            if uris is not None:
+                allowed &= self.mask(uris)
+            if nprobe > 0 and self.centroids is not None:
+                probe = np.argsort(-(self.centroids @ q))[:nprobe]
+                lists = self._lists[:count]
+                # Rows without a list (none after training) are always scanned.
+                allowed &= np.isin(lists, probe) | (lists < 0)
+
+        rows = np.flatnonzero(allowed)
+        if not len(rows) or k <= 0:
+            return []
+        if len(rows) < count // 4:
+            # Selective filter: gather the candidate rows.
+            candidates, scores = rows, self._scores(matrix, q, rows)
+        else:
+            # Scan contiguous blocks and keep the best k of each.
+            candidates_parts, scores_parts = [], []
+            for start in range(0, count, _SCAN_BLOCK):
+                end = min(start + _SCAN_BLOCK, count)
+                block_scores = np.asarray(matrix[start:end], dtype=np.float32) @ q
+                keep = np.flatnonzero(allowed[start:end])
+                if len(keep) > k:
+                    keep = keep[np.argpartition(-block_scores[keep], k - 1)[:k]]
+                candidates_parts.append(keep + start)
+                scores_parts.append(block_scores[keep])
+            candidates = np.concatenate(candidates_parts)
+            scores = np.concatenate(scores_parts)
+        top = np.argsort(-scores)[:k]
+        return self._fetch(matrix, candidates[top], scores[top])
+
+    @staticmethod
+    def _scores(matrix: np.ndarray, q: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SCAN_BLOCK):
+            part = rows[start : start + _SCAN_BLOCK]
+            scores[start : start + len(part)] = (
+                np.asarray(matrix[part], dtype=np.float32) @ q
+            )
+        return scores
+
+    def _fetch(
+        self, matrix: np.ndarray, rows: np.ndarray, scores: np.ndarray
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        vectors = np.asarray(matrix[rows], dtype=np.float32)
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            records = self._db.execute(
+                "SELECT row, id, url, title, content, metadata FROM chunks "
+                f"WHERE row IN ({placeholders})",
+                [int(r) for r in rows],
+            ).fetchall()
+        by_row = {
+            r[0]: {
+                "id": r[1],
+                "url": r[2],
+                "title": r[3],
+                "content": r[4],
+                "metadata": json.loads(r[5] or "{}"),
+            }
+            for r in records
+        }
+        return [
+            ({**by_row[int(row)], "embedding": vector.tolist()}, float(score))
+            for row, score, vector in zip(rows, scores, vectors)
+            if int(row) in by_row
+        ]
+
+    # --- metadata --------------------------------------------------------
+
+    def documents(self) -> List[Tuple[str, str]]:
+        """Return ``(url, title)`` of every stored document."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT url, MIN(title) FROM chunks GROUP BY url ORDER BY url"
+            ).fetchall()
+
+    def chunk_ids_by_url(self, url_prefix: str) -> Dict[str, Set[str]]:
+        with self._lock:
+            ids = {row: cid for cid, row in self._ids.items()}
+            return {
+                url: {ids[row] for row in rows}
+                for url, rows in self._url_rows.items()
+                if url.startswith(url_prefix)
+            }
+
+    def iter_chunks(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored chunk's ``id``/``url``/``title``/``content``."""
+        with self._lock:
+            records = self._db.execute(
+                "SELECT id, url, title, content FROM chunks ORDER BY row"
+            ).fetchall()
+        for cid, url, title, content in records:
+            yield {"id": cid, "url": url, "title": title, "content": content}
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix.flush()
+            self._db.close()
+
+
+class EmbeddedProvider(Retriever):
+    """RAG provider searching an in-process ``EmbeddedVectorStore``.
+
+    Environment variables:
+        EMBEDDED_STORE_PATH: Store directory (default: ./data/embedded_store).
+        EMBEDDED_DTYPE: float32 | float16 vector storage (default: float32).
+        EMBEDDED_INDEX: flat | ivf (default: flat).
+        EMBEDDED_IVF_NLIST: IVF lists, 0 for ~4*sqrt(chunks) (default: 0).
+        EMBEDDED_IVF_NPROBE: IVF lists scanned per query (default: 8).
+        EMBEDDED_IVF_MIN_ROWS: Chunks needed before IVF is trained (default: 20000).
+        EMBEDDED_TOP_K: Chunks returned per query (default: 10).
+        EMBEDDED_EMBEDDING_PROVIDER: openai | dashscope (default: openai).
+        EMBEDDED_EMBEDDING_MODEL / _API_KEY / _BASE_URL / _DIM: Embedding model.
+        EMBEDDED_CHUNK_TOKENS / EMBEDDED_CHUNK_OVERLAP_TOKENS: Chunking budget.
+        EMBEDDED_HYBRID_SEARCH: Fuse BM25 keyword and vector search (default: false).
+        EMBEDDED_RRF_K / EMBEDDED_HYBRID_CANDIDATES: Fusion constant (default: 60)
+            and results fetched per retriever (default: 2 * top_k).
+    """
+
+    uri_scheme = "embedded"
+
+    def __init__(self) -> None:
+        self.store_path = get_str_env("EMBEDDED_STORE_PATH", "./data/embedded_store")
+        self.collection_name = Path(self.store_path).name or "documents"
+        self.dtype = get_str_env("EMBEDDED_DTYPE", "float32")
+        self.index = get_str_env("EMBEDDED_INDEX", "flat").lower()
+        if self.index not in ("flat", "ivf"):
+            raise ValueError(
+                f"Unsupported embedded index: {self.index}. Supported: flat,ivf"
+            )
+        self.ivf_nlist = get_int_env("EMBEDDED_IVF_NLIST", 0)
+        self.ivf_nprobe = max(get_int_env("EMBEDDED_IVF_NPROBE", 8), 1)
+        self.ivf_min_rows = get_int_env("EMBEDDED_IVF_MIN_ROWS", 20000)
+        self.top_k = max(get_int_env("EMBEDDED_TOP_K", 10), 1)
+        self.embedding_batch_size = max(
+            get_int_env("EMBEDDED_EMBEDDING_BATCH_SIZE", 64), 1
+        )
+
+        self.embedding_provider = get_str_env("EMBEDDED_EMBEDDING_PROVIDER", "openai")
+        self.embedding_model_name = get_str_env("EMBEDDED_EMBEDDING_MODEL")
+        self.embedding_dim = get_int_env("EMBEDDED_EMBEDDING_DIM", 1536)
+        self.embedding_cache = EmbeddingCache(
+            model=self.embedding_model_name,
+            dimensions=self.embedding_dim,
+            max_entries=get_int_env("EMBEDDED_EMBEDDING_CACHE_SIZE", 1024),
+        )
+        self.chunker = MarkdownChunker(
+            chunk_tokens=get_int_env("EMBEDDED_CHUNK_TOKENS", 512),
+            overlap_tokens=get_int_env("EMBEDDED_CHUNK_OVERLAP_TOKENS", 64),
+            max_chars=get_int_env("EMBEDDED_CHUNK_SIZE", 4000),
+        )
+        self._init_embedding_model()
+        self.store: Optional[EmbeddedVectorStore] = None
+        self._connect_lock = threading.Lock()
+
+        self.hybrid_candidates = get_int_env("EMBEDDED_HYBRID_CANDIDATES", 0)
+        self.rrf_k = get_int_env("EMBEDDED_RRF_K", 60)
+        self.keyword_index: Optional[BM25Index] = (
+            BM25Index(Path(self.store_path) / "bm25.db")
+            if get_bool_env("EMBEDDED_HYBRID_SEARCH", False)
+            else None
+        )
+
+    def _init_embedding_model(self) -> None:
+        kwargs = {
+            "api_key": get_str_env("EMBEDDED_EMBEDDING_API_KEY"),
+            "model": self.embedding_model_name,
+            "base_url": get_str_env("EMBEDDED_EMBEDDING_BASE_URL"),
+            "encoding_format": "float",
+            "dimensions": self.embedding_dim,
+        }
+        if self.embedding_provider.lower() == "openai":
+            self.embedding_model = OpenAIEmbeddings(**kwargs)
+        elif self.embedding_provider.lower() == "dashscope":
+            self.embedding_model = DashscopeEmbeddings(**kwargs)
+        else:
+            raise ValueError(
+                f"Unsupported embedding provider: {self.embedding_provider}. "
+                "Supported providers: openai,dashscope"
+            )
+
+    def connect(self) -> None:
+        """Map the store files; cheap, no data is read up front."""
+        with self._connect_lock:
+            if self.store is None:
+                self.store = EmbeddedVectorStore(
+                    self.store_path, self.embedding_dim, self.dtype
+                )
+
+    def close(self) -> None:
+        with self._connect_lock:
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+
+    def health_check(self) -> bool:
+        return self.store is not None
+
+    def _embed_query(self, text: str) -> List[float]:
+        text = text.strip()
+        vector = self.embedding_cache.get(text)
+        if vector is None:
+            vector = self.embedding_model.embed_query(text)
+            self.embedding_cache.put(text, vector)
+        return vector
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        self.connect()
+        resources = []
+        for url, title in self.store.documents():
+            if query and query.lower() not in (title or url).lower():
+                continue
+            resources.append(
+                Resource(
+                    uri=url,
+                    title=title or url,
+                    description="Embedded vector store document",
+                )
+            )
+        return resources
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        self.connect()
+        if not query or not query.strip():
+            return []
+        if self.keyword_index is not None:
+            hits = self._hybrid_search(query, resources, self.top_k)
+        else:
+            hits = self._vector_search(query, resources, self.top_k)
+        documents: Dict[str, Document] = {}
+        for hit in hits:
+            doc_id = hit["url"] or hit["id"]
+            if doc_id not in documents:
+                documents[doc_id] = Document(
+                    id=doc_id, url=hit["url"], title=hit["title"], chunks=[]
+                )
+            documents[doc_id].chunks.append(
+                Chunk(
+                    content=hit["content"],
+                    similarity=hit["score"],
+                    embedding=hit.get("embedding"),
+                )
+            )
+        return list(documents.values())
+
+    def _vector_search(
+        self, query: str, resources: Optional[List[Resource]], limit: int
+    ) -> List[Dict[str, Any]]:
+        self.connect()
+        try:
+            vector = self._embed_query(query)
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate embedding: {str(e)}")
+        nprobe = self.ivf_nprobe if self.index == "ivf" else 0
+        uris = [r.uri for r in resources] if resources else None
+        return [
+            {**chunk, "score": score}
+            for chunk, score in self.store.search(vector, limit, uris, nprobe)
+        ]
+
+    def _hybrid_search(
+        self, query: str, resources: Optional[List[Resource]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Fuse vector and BM25 rankings; ``score`` is the RRF score."""
+        uris = [r.uri for r in resources] if resources else None
+        return hybrid_search(
+            lambda n: self._vector_search(query, resources, n),
+            lambda n: self.keyword_index.search(query, n, uris),
+            k=limit,
+            candidates=self.hybrid_candidates or 2 * limit,
+            rrf_k=self.rrf_k,
+        )
+
+    def rebuild_keyword_index(self) -> int:
+        """Re-index every stored chunk into the BM25 index; returns the count."""
+        if self.keyword_index is None:
+            raise ValueError("EMBEDDED_HYBRID_SEARCH is disabled")
+        self.connect()
+        self.keyword_index.clear()
+        chunks = self.store.iter_chunks()
+        count = 0
+        while True:
+            batch = list(islice(chunks, 1000))
+            if not batch:
+                return count
+            self.keyword_index.add(batch)
+            count += len(batch)
+
+    # --- ingestion surface (see ``src.rag.ingestion.DocumentIngestor``) ---
+
+    def _split_content(self, content: str) -> List[str]:
+        return self.chunker.split_text(content)
+
+    def get_chunk_ids_by_url(self, url_prefix: str) -> Dict[str, Set[str]]:
+        self.connect()
+        return self.store.chunk_ids_by_url(url_prefix)
+
+    def delete_chunks(self, ids: List[str]) -> None:
+        self.connect()
+        self.store.delete(ids)
+        if self.keyword_index is not None:
+            self.keyword_index.delete(ids)
+
+    def insert_chunks(
+        self,
+        chunks: Iterable[Dict[str, Any]],
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+    ) -> IngestionProgress:
+        """Embed and store chunks in batches of ``embedding_batch_size``."""
+        self.connect()
+        progress = IngestionProgress()
+        iterator = (c for c in chunks if (c.get("content") or "").strip())
+        while True:
+            batch = list(islice(iterator, self.embedding_batch_size))
+            if not batch:
+                break
+            try:
+                vectors = self.embedding_model.embed_documents(
+                    [c["content"].strip() for c in batch]
+                )
+                progress.chunks_embedded += len(batch)
+                progress.batches += 1
+                progress.chunks_inserted += self.store.add(batch, np.asarray(vectors))
+                if self.keyword_index is not None:
+                    self.keyword_index.add(batch)
+            except Exception as e:
+                logger.warning("Failed to store %d chunks: %s", len(batch), e)
+                progress.record_failure(batch)
+            if on_progress:
+                on_progress(progress)
+        self._maybe_train_ivf()
+        return progress
+
+    def _maybe_train_ivf(self) -> None:
+        """Train the IVF index once the store is large enough.
+
+        Later inserts are assigned to the nearest existing list; call
+        ``store.train_ivf`` again to rebalance after heavy growth.
+        """
+        if self.index != "ivf" or self.store.centroids is not None:
+            return
+        if self.store.size < self.ivf_min_rows:
+            return
+        nlist = self.ivf_nlist or int(4 * np.sqrt(self.store.size))
+        self.store.train_ivf(nlist)
@@ -0,0 +1,158 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize text for cache lookups (Unicode NFKC, collapsed whitespace)."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class EmbeddingCache:
+    """Two-tier cache of query embeddings.
+
+    Entries are keyed by ``(model, dimensions, normalized text)``. The first
+    tier is an in-memory LRU of ``max_entries`` vectors; the optional second
+    tier is a SQLite file storing vectors as compact float32 blobs so they
+    survive restarts and can be shared between processes.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        max_entries: int = 1024,
+        disk_path: Optional[str] = None,
+    ):
+        self.model = model or ""
+        self.dimensions = dimensions
+        self.max_entries = max(max_entries, 0)
+        self.disk_path = disk_path or None
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_path:
+            self._open_disk()
+
+    def _open_disk(self) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(self.disk_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Embedding disk cache disabled (%s): %s", self.disk_path, e)
+            self._db = None
+
+    def key(self, text: str) -> str:
+        raw = f"{self.model}\x00{self.dimensions}\x00{normalize_query(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for ``text`` or None."""
+        key = self.key(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector: List[float]) -> None:
+        """Store ``vector`` as the embedding of ``text``."""
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, list(vector))
+            if self._db is not None:
+                try:
+                    blob = np.asarray(vector, dtype=np.float32).tobytes()
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        (key, blob),
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Failed to persist query embedding: %s", e)
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if self.max_entries == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._memory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedEmbeddings:
+    """Embeddings wrapper that serves ``embed_query`` from an ``EmbeddingCache``.
+
+    ``embed_documents`` is passed through unchanged: document embeddings are
+    computed once at ingestion and would only evict useful query entries.
+    """
+
+    def __init__(self, embeddings: Any, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            if vector:
+                self.cache.put(text, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
@@ -0,0 +1,211 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Federated retrieval over several RAG providers.
+
+``FederatedRetriever`` fans ``query_relevant_documents`` and
+``list_resources`` out to every member provider concurrently, so a search
+costs the latency of the slowest provider rather than the sum of all of
+them. A provider that fails or exceeds ``timeout`` is skipped and the
+others' results are returned.
+
+Resource URIs are prefixed with the provider name (``ragflow+rag://...``)
+so selected resources can be routed back to the provider that owns them.
+Chunk similarities are min-max normalized per provider before the results
+are merged, since raw scores of different backends are not comparable.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from src.rag.retriever import Document, Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Separates the provider name from the member provider's own URI.
+URI_SEPARATOR = "+"
+
+# Shared by all federated retrievers; timed-out calls keep a worker until
+# they return, so the pool is larger than the number of providers.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="rag-federated")
+
+
+def prefix_uri(provider: str, uri: str) -> str:
+    return f"{provider}{URI_SEPARATOR}{uri}"
+
+
+def split_uri(uri: str) -> Tuple[Optional[str], str]:
+    """Return ``(provider, uri)``; provider is None for unprefixed URIs."""
+    provider, separator, rest = uri.partition(URI_SEPARATOR)
+    if not separator or "://" in provider:
+        return None, uri
+    return provider, rest
+
+
+def _normalize_scores(documents: List[Document]) -> None:
+    """Min-max normalize chunk similarities in place to ``[0, 1]``."""
+    scores = [c.similarity or 0.0 for d in documents for c in d.chunks]
+    if not scores:
+        return
+    low, high = min(scores), max(scores)
+    for doc in documents:
+        for chunk in doc.chunks:
+            if high > low:
+                chunk.similarity = ((chunk.similarity or 0.0) - low) / (high - low)
+            else:
+                chunk.similarity = 1.0
+
+
+def _best_score(document: Document) -> float:
+    return max((c.similarity for c in document.chunks), default=0.0)
+
+
+class FederatedRetriever(Retriever):
+    """Query several retrievers concurrently and merge their results.
+
+    Args:
+        providers: Member retrievers by provider name.
+        timeout: Seconds to wait for the members of one call.
+    """
+
+    def __init__(self, providers: Dict[str, Retriever], timeout: float = 10.0):
+        if not providers:
+            raise ValueError("Federated retrieval needs at least one provider")
+        for name in providers:
+            if URI_SEPARATOR in name:
+                raise ValueError(f"Invalid federated provider name: {name}")
+        self.providers = providers
+        self.timeout = timeout
+
+    def _gather(self, calls: Dict[str, Callable[[], T]]) -> Dict[str, T]:
+        """Run ``calls`` concurrently; return the results that arrived in time."""
+        futures = {name: _executor.submit(call) for name, call in calls.items()}
+        wait(futures.values(), timeout=self.timeout)
+        results: Dict[str, T] = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.warning(
+                    "RAG provider %s timed out after %ss, using partial results",
+                    name,
+                    self.timeout,
+                )
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning("RAG provider %s failed: %s", name, e)
+        return results
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        catalogs = self._gather(
+            {
+                name: (lambda p=provider: p.list_resources(query))
+                for name, provider in self.providers.items()
+            }
+        )
+        resources = []
+        for name in self.providers:
+            for resource in catalogs.get(name, []):
+                resources.append(
+                    resource.model_copy(update={"uri": prefix_uri(name, resource.uri)})
+                )
+        return resources
+
+    def _route(self, resources: list[Resource]) -> Dict[str, List[Resource]]:
+        """Map each provider to query onto its unprefixed selected resources.
+
+        Without a selection every provider searches everything it holds.
+        """
+        if not resources:
+            return {name: [] for name in self.providers}
+        selected: Dict[str, List[Resource]] = {}
+        for resource in resources:
+            name, uri = split_uri(resource.uri)
+            if name not in self.providers:
+                logger.warning("Resource %s has no federated provider", resource.uri)
+                continue
+            selected.setdefault(name, []).append(
+                resource.model_copy(update={"uri": uri})
+            )
+        return selected
+
+    @staticmethod
+    def _merge(results: Dict[str, List[Document]]) -> List[Document]:
+        documents = []
+        for name, docs in results.items():
+            _normalize_scores(docs)
+            for doc in docs:
+                doc.id = prefix_uri(name, doc.id)
+            documents.extend(docs)
+        # Stable sort keeps each provider's own order among equal scores.
+        return sorted(documents, key=_best_score, reverse=True)
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        results = self._gather(
+            {
+                name: (
+                    lambda p=self.providers[name], r=scoped: p.query_relevant_documents(
+                        query, r
+                    )
+                )
+                for name, scoped in self._route(resources).items()
+            }
+        )
+        return self._merge(results)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        targets = self._route(resources)
+        outcomes = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.providers[name].aquery_relevant_documents(query, scoped),
+                    self.timeout,
+                )
+                for name, scoped in targets.items()
+            ),
+            return_exceptions=True,
+        )
+        results = {}
+        for name, outcome in zip(targets, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning(
+                    "RAG provider %s timed out after %ss, using partial results",
+                    name,
+                    self.timeout,
+                )
+            elif isinstance(outcome, BaseException):
+                logger.warning("RAG provider %s failed: %s", name, outcome)
+            else:
+                results[name] = outcome
+        return self._merge(results)
+
+    def connect(self) -> None:
+        for name, provider in self.providers.items():
+            try:
+                provider.connect()
+            except Exception as e:
+                logger.warning("Failed to connect RAG provider %s: %s", name, e)
+
+    def close(self) -> None:
+        for name, provider in self.providers.items():
+            try:
+                provider.close()
+            except Exception as e:
+                logger.warning("Failed to close RAG provider %s: %s", name, e)
+
+    def health_check(self) -> bool:
+        """Healthy while at least one member provider can serve requests."""
+        healthy = self._gather(
+            {name: p.health_check for name, p in self.providers.items()}
+        )
+        return any(healthy.values())
@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Pooled HTTP clients shared by the remote RAG providers.
+
+The synchronous path uses one process-wide ``requests.Session``; the async
+path uses one ``httpx.AsyncClient`` per event loop (an async client cannot be
+shared across loops). Both keep connections alive between calls, so a search
+does not pay a TCP/TLS handshake every time.
+
+``request`` and ``arequest`` retry connection errors, timeouts and 429/5xx
+responses with capped exponential backoff and full jitter, so concurrent
+researchers do not retry in lockstep against a struggling backend.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import Any, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.loader import get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# Event loop -> its httpx.AsyncClient.
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _pool_size() -> int:
+    return max(get_int_env("RAG_HTTP_POOL_SIZE", 20), 1)
+
+
+def _max_retries() -> int:
+    return max(get_int_env("RAG_HTTP_MAX_RETRIES", 2), 0)
+
+
+def _backoff_base() -> float:
+    try:
+        return float(get_str_env("RAG_HTTP_BACKOFF", "0.5"))
+    except ValueError:
+        return 0.5
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 8.0) -> float:
+    """Full-jitter delay before retry number ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=_pool_size(), pool_maxsize=_pool_size()
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        size = _pool_size()
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            timeout=30.0,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Send a request on the pooled session, retrying transient failures.
+
+    Keyword arguments are passed to ``requests.Session.request``. The last
+    response is returned even if its status is retryable; the last
+    connection error is raised.
+    """
+    retries, base = _max_retries(), _backoff_base()
+    for attempt in range(retries + 1):
+        try:
+            response = get_session().request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                return response
+            reason = f"status {response.status_code}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                raise
+            reason = str(e)
+        delay = backoff_delay(attempt, base)
+        logger.warning(
+            "%s %s failed (%s), retrying in %.2fs", method, url, reason, delay
+        )
+        time.sleep(delay)
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Async ``request`` on the loop's pooled ``httpx.AsyncClient``."""
+    retries, base = _max_retries(), _backoff_base()
+    for attempt in range(retries + 1):
+        try:
+            response = await get_async_client().request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                return response
+            reason = f"status {response.status_code}"
+        except httpx.TransportError as e:
+            if attempt == retries:
+                raise
+            reason = str(e) or type(e).__name__
+        delay = backoff_delay(attempt, base)
+        logger.warning(
+            "%s %s failed (%s), retrying in %.2fs", method, url, reason, delay
+        )
+        await asyncio.sleep(delay)
+
+
+async def aclose_clients() -> None:
+    """Close the pooled clients (on application shutdown)."""
+    global _session
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Failed to close RAG HTTP client: %s", e)
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,317 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Hybrid keyword + vector retrieval.
+
+``BM25Index`` is a local inverted index (SQLite postings table) maintained
+alongside a vector store during ingestion. Its tokenizer keeps identifiers,
+acronyms and code tokens intact (``gpt-4o``, ``max_tokens``, ``v1.2``) and
+also indexes their parts; CJK text is indexed as character bigrams.
+
+``hybrid_search`` runs the keyword and vector searches concurrently and
+merges their rankings with reciprocal rank fusion (RRF), which needs no score
+calibration between the two retrievers.
+
+Usage:
+    python -m src.rag.hybrid rebuild
+    python -m src.rag.hybrid benchmark eval.jsonl --k 10
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SearchFn = Callable[[int], List[Dict[str, Any]]]
+
+_TOKEN_RE = re.compile(
+    r"[A-Za-z0-9_]+(?:[.\-/+#][A-Za-z0-9_+#]+)*|[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]+"
+)
+_PART_RE = re.compile(r"[A-Za-z0-9]+")
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+
+# Keyword searches run on this pool while the vector search uses the caller.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rag-hybrid")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms."""
+    terms: List[str] = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(token):
+            if len(token) == 1:
+                terms.append(token)
+            else:
+                terms.extend(token[i : i + 2] for i in range(len(token) - 1))
+            continue
+        terms.append(token)
+        parts = _PART_RE.findall(token)
+        if len(parts) > 1 or (parts and parts[0] != token):
+            terms.extend(parts)
+    return terms
+
+
+class BM25Index:
+    """Persistent BM25 inverted index over stored chunks.
+
+    Args:
+        path: SQLite file holding the postings.
+        k1: Term frequency saturation.
+        b: Document length normalization.
+    """
+
+    def __init__(self, path: str | Path, k1: float = 1.2, b: float = 0.75):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks (id TEXT PRIMARY KEY, url TEXT, "
+            "title TEXT, content TEXT, length INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS postings (term TEXT, id TEXT, tf INTEGER, "
+            "PRIMARY KEY (term, id)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS postings_id ON postings (id)")
+        self._db.commit()
+        self._stats: Optional[tuple] = None
+
+    def add(self, chunks: Iterable[Dict[str, Any]]) -> None:
+        """Index chunks (``id``/``content``/``title``/``url``), replacing old versions."""
+        chunks = list(chunks)
+        if not chunks:
+            return
+        with self._lock, self._db:
+            self._delete([c["id"] for c in chunks])
+            for chunk in chunks:
+                terms = Counter(
+                    tokenize(f"{chunk.get('title') or ''}\n{chunk['content']}")
+                )
+                self._db.execute(
+                    "INSERT INTO chunks (id, url, title, content, length) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        chunk["id"],
+                        chunk.get("url") or "",
+                        chunk.get("title") or "",
+                        chunk["content"],
+                        sum(terms.values()),
+                    ),
+                )
+                self._db.executemany(
+                    "INSERT INTO postings (term, id, tf) VALUES (?, ?, ?)",
+                    [(term, chunk["id"], tf) for term, tf in terms.items()],
+                )
+            self._stats = None
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock, self._db:
+            self._delete(ids)
+            self._stats = None
+
+    def _delete(self, ids: Sequence[str]) -> None:
+        params = [(cid,) for cid in ids]
+        self._db.executemany("DELETE FROM postings WHERE id = ?", params)
+        self._db.executemany("DELETE FROM chunks WHERE id = ?", params)
+
+    def clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM postings")
+            self._db.execute("DELETE FROM chunks")
+            self._stats = None
+
+    def search(
+        self, query: str, k: int, uris: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the top ``k`` chunks with a ``score`` key, best first.
+
+        Args:
+            query: Keyword query.
+            k: Number of chunks to return.
+            uris: Restrict results to chunks whose url or id is listed.
+        """
+        terms = set(tokenize(query))
+        if not terms or k <= 0:
+            return []
+        allowed = set(uris) if uris else None
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._db.execute(
+                    "SELECT COUNT(*), AVG(length) FROM chunks"
+                ).fetchone()
+            total, avg_length = self._stats
+            if not total:
+                return []
+            ids: List[str] = []
+            scores: List[float] = []
+            for term in terms:
+                rows = self._db.execute(
+                    "SELECT p.id, p.tf, c.length, c.url FROM postings p "
+                    "JOIN chunks c ON c.id = p.id WHERE p.term = ?",
+                    (term,),
+                ).fetchall()
+                if not rows:
+                    continue
+                idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+                tf = np.array([r[1] for r in rows], dtype=np.float64)
+                length = np.array([r[2] for r in rows], dtype=np.float64)
+                norm = self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+                term_scores = idf * tf * (self.k1 + 1) / (tf + norm)
+                for row, score in zip(rows, term_scores):
+                    if allowed is None or row[0] in allowed or row[3] in allowed:
+                        ids.append(row[0])
+                        scores.append(score)
+            if not ids:
+                return []
+            totals: Dict[str, float] = {}
+            for cid, score in zip(ids, scores):
+                totals[cid] = totals.get(cid, 0.0) + float(score)
+            best = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:k]
+            placeholders = ",".join("?" * len(best))
+            records = {
+                r[0]: r
+                for r in self._db.execute(
+                    "SELECT id, url, title, content FROM chunks "
+                    f"WHERE id IN ({placeholders})",
+                    [cid for cid, _ in best],
+                )
+            }
+        return [
+            {
+                "id": cid,
+                "url": records[cid][1],
+                "title": records[cid][2],
+                "content": records[cid][3],
+                "score": score,
+            }
+            for cid, score in best
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Dict[str, Any]]], k: int = 60
+) -> List[Dict[str, Any]]:
+    """Merge ranked chunk lists by RRF; ``score`` becomes the fused score."""
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking):
+            cid = chunk["id"]
+            fused.setdefault(cid, chunk)
+            scores[cid] = scores.get(cid, 0.0) + 1.0 / (k + rank + 1)
+    ordered = sorted(scores, key=scores.get, reverse=True)
+    return [{**fused[cid], "score": scores[cid]} for cid in ordered]
+
+
+def hybrid_search(
+    vector_search: SearchFn,
+    keyword_search: SearchFn,
+    k: int,
+    candidates: int,
+    rrf_k: int = 60,
+) -> List[Dict[str, Any]]:
+    """Run both searches concurrently for ``candidates`` results each and fuse.
+
+    A failing keyword search degrades to vector-only results.
+    """
+    keyword_future = _executor.submit(keyword_search, candidates)
+    vector_hits = vector_search(candidates)
+    try:
+        keyword_hits = keyword_future.result()
+    except Exception as e:
+        logger.warning("Keyword search failed, using vector results only: %s", e)
+        keyword_hits = []
+    return reciprocal_rank_fusion([vector_hits, keyword_hits], rrf_k)[:k]
+
+
+def _load_eval(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _benchmark(retriever: Any, eval_path: str, k: int) -> None:
+    """Compare vector, keyword and hybrid retrieval on labelled queries.
+
+    Each line of ``eval_path`` is ``{"query": ..., "relevant": [url or id, ...]}``.
+    """
+    cases = _load_eval(eval_path)
+    modes: Dict[str, Callable[[str], List[Dict[str, Any]]]] = {
+        "vector": lambda q: retriever._vector_search(q, None, k),
+        "keyword": lambda q: retriever.keyword_index.search(q, k),
+        "hybrid": lambda q: retriever._hybrid_search(q, None, k),
+    }
+    for case in cases:
+        modes["vector"](case["query"])  # warm the query embedding cache
+    print(f"{len(cases)} queries, k={k}")
+    for name, search in modes.items():
+        recalls, reciprocal_ranks, latencies = [], [], []
+        for case in cases:
+            relevant = set(case["relevant"])
+            started = time.perf_counter()
+            hits = search(case["query"])
+            latencies.append((time.perf_counter() - started) * 1000)
+            found = [i for i, h in enumerate(hits) if {h["id"], h["url"]} & relevant]
+            matched = {key for h in hits for key in (h["id"], h["url"])} & relevant
+            recalls.append(len(matched) / len(relevant) if relevant else 0.0)
+            reciprocal_ranks.append(1.0 / (found[0] + 1) if found else 0.0)
+        print(
+            f"{name:<8} recall@{k}={np.mean(recalls):.3f} "
+            f"MRR={np.mean(reciprocal_ranks):.3f} "
+            f"p50={np.percentile(latencies, 50):.1f}ms "
+            f"p99={np.percentile(latencies, 99):.1f}ms"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.rag.builder import build_retriever
+
+    parser = argparse.ArgumentParser(description="Hybrid retrieval tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Rebuild the keyword index from the store")
+    bench = commands.add_parser("benchmark", help="Relevance/latency benchmark")
+    bench.add_argument("eval", help="JSONL file of {query, relevant} cases")
+    bench.add_argument("--k", type=int, default=10)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    retriever = build_retriever()
+    if getattr(retriever, "keyword_index", None) is None:
+        raise SystemExit(
+            "The configured RAG provider has no keyword index; enable "
+            "MILVUS_HYBRID_SEARCH or EMBEDDED_HYBRID_SEARCH"
+        )
+    if args.command == "rebuild":
+        count = retriever.rebuild_keyword_index()
+        print(f"Indexed {count} chunks")
+    else:
+        _benchmark(retriever, args.eval, args.k)
+    retriever.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark Milvus ANN index configurations against exact search.
+
+A sample of vectors is taken from the configured collection (or generated
+synthetically), exact top-k neighbours are computed with numpy, and every
+candidate index/search parameter combination is measured for recall@k and
+p50/p99 query latency in a scratch collection. The fastest configuration that
+reaches the recall target is printed as ``MILVUS_*`` environment settings.
+
+Milvus Lite only builds FLAT and IVF_FLAT indexes; point ``--uri`` at a
+Milvus server to benchmark HNSW and IVF_SQ8 as well.
+
+Usage:
+    python -m src.rag.index_benchmark --sample 20000 --queries 200 --k 10
+    python -m src.rag.index_benchmark --synthetic --dim 768
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pymilvus import DataType, MilvusClient
+
+from src.rag.milvus import _LITE_INDEX_TYPES, MilvusRetriever
+
+logger = logging.getLogger(__name__)
+
+BENCH_COLLECTION = "index_benchmark"
+
+
+@dataclass
+class IndexConfig:
+    """One index build configuration and the search parameters to sweep."""
+
+    index_type: str
+    build_params: Dict[str, Any] = field(default_factory=dict)
+    search_grid: List[Dict[str, Any]] = field(default_factory=lambda: [{}])
+
+    def env(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the ``MILVUS_*`` settings reproducing this configuration."""
+        env: Dict[str, Any] = {"MILVUS_INDEX_TYPE": self.index_type}
+        if self.index_type == "HNSW":
+            env["MILVUS_HNSW_M"] = self.build_params["M"]
+            env["MILVUS_HNSW_EF_CONSTRUCTION"] = self.build_params["efConstruction"]
+            env["MILVUS_HNSW_EF"] = search_params["ef"]
+        elif self.index_type in ("IVF_FLAT", "IVF_SQ8"):
+            env["MILVUS_IVF_NLIST"] = self.build_params["nlist"]
+            env["MILVUS_IVF_NPROBE"] = search_params["nprobe"]
+        return env
+
+
+@dataclass
+class BenchmarkResult:
+    config: IndexConfig
+    search_params: Dict[str, Any]
+    recall: float
+    p50_ms: float
+    p99_ms: float
+    build_seconds: float
+
+    def __str__(self) -> str:
+        params = {**self.config.build_params, **self.search_params}
+        return (
+            f"{self.config.index_type:<9} {str(params):<42} "
+            f"recall@k={self.recall:.3f} p50={self.p50_ms:.2f}ms "
+            f"p99={self.p99_ms:.2f}ms build={self.build_seconds:.1f}s"
+        )
+
+
+def default_configs(num_vectors: int) -> List[IndexConfig]:
+    """Return a parameter grid scaled to the sample size."""
+    # Rule of thumb: nlist ~ 4 * sqrt(n), with a few clusters at minimum.
+    nlist = int(min(max(4 * np.sqrt(num_vectors), 8), 4096))
+    nprobes = sorted({p for p in (1, 4, 8, 16, 32, 64) if p <= nlist})
+    ivf_grid = [{"nprobe": p} for p in nprobes]
+    configs = [IndexConfig("FLAT")]
+    configs.append(IndexConfig("IVF_FLAT", {"nlist": nlist}, ivf_grid))
+    configs.append(IndexConfig("IVF_SQ8", {"nlist": nlist}, ivf_grid))
+    for m in (8, 16, 32):
+        configs.append(
+            IndexConfig(
+                "HNSW",
+                {"M": m, "efConstruction": 200},
+                [{"ef": ef} for ef in (16, 32, 64, 128, 256)],
+            )
+        )
+    return configs
+
+
+def exact_top_k(
+    base: np.ndarray, queries: np.ndarray, k: int, metric: str = "IP"
+) -> np.ndarray:
+    """Exact top-k row indices of ``base`` for every query (brute force)."""
+    k = min(k, len(base))
+    if metric == "L2":
+        # ||q - b||^2 up to the per-query constant ||q||^2.
+        scores = 2 * queries @ base.T - (base * base).sum(axis=1)
+    elif metric == "COSINE":
+        base = base / np.maximum(np.linalg.norm(base, axis=1, keepdims=True), 1e-12)
+        scores = queries @ base.T
+    else:
+        scores = queries @ base.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recall_at_k(results: Sequence[Sequence[int]], truth: np.ndarray) -> float:
+    """Mean fraction of the exact neighbours found by each query."""
+    if not len(truth):
+        return 0.0
+    hits = sum(
+        len(set(found) & set(expected)) for found, expected in zip(results, truth)
+    )
+    return hits / truth.size
+
+
+def synthetic_vectors(
+    num_vectors: int, dim: int, clusters: int = 64, seed: int = 0
+) -> np.ndarray:
+    """Clustered unit vectors resembling text embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=num_vectors)
+    vectors = centers[labels] + 0.5 * rng.normal(size=(num_vectors, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def sample_collection(retriever: MilvusRetriever, limit: int) -> np.ndarray:
+    """Read up to ``limit`` stored embeddings from the retriever's collection."""
+    retriever.connect()
+    rows = retriever._iter_rows(
+        f'{retriever.id_field} != ""', [retriever.vector_field], batch_size=1000
+    )
+    vectors = [row[retriever.vector_field] for _, row in zip(range(limit), rows)]
+    return np.asarray(vectors, dtype=np.float32)
+
+
+class IndexBenchmark:
+    """Measure index configurations in a scratch collection of ``client``."""
+
+    def __init__(
+        self,
+        client: MilvusClient,
+        metric: str = "IP",
+        k: int = 10,
+        lite: bool = True,
+        collection_name: str = BENCH_COLLECTION,
+    ):
+        self.client = client
+        self.metric = metric
+        self.k = k
+        self.lite = lite
+        self.collection_name = collection_name
+
+    def run(
+        self, base: np.ndarray, queries: np.ndarray, configs: Iterable[IndexConfig]
+    ) -> List[BenchmarkResult]:
+        truth = exact_top_k(base, queries, self.k, self.metric)
+        results: List[BenchmarkResult] = []
+        for config in configs:
+            if self.lite and config.index_type not in _LITE_INDEX_TYPES:
+                logger.info(
+                    "Skipping %s: not supported by Milvus Lite", config.index_type
+                )
+                continue
+            try:
+                build_seconds = self._build(base, config)
+                for search_params in config.search_grid:
+                    found, latencies = self._search(queries, search_params)
+                    results.append(
+                        BenchmarkResult(
+                            config=config,
+                            search_params=search_params,
+                            recall=recall_at_k(found, truth),
+                            p50_ms=float(np.percentile(latencies, 50)),
+                            p99_ms=float(np.percentile(latencies, 99)),
+                            build_seconds=build_seconds,
+                        )
+                    )
+                    logger.info("%s", results[-1])
+            except Exception as e:
+                logger.warning("Benchmark of %s failed: %s", config.index_type, e)
+            finally:
+                self._drop()
+        return results
+
+    def _build(self, base: np.ndarray, config: IndexConfig) -> float:
+        self._drop()
+        schema = MilvusClient.create_schema(auto_id=False)
+        schema.add_field("id", DataType.INT64, is_primary=True)
+        schema.add_field("vector", DataType.FLOAT_VECTOR, dim=base.shape[1])
+        self.client.create_collection(
+            collection_name=self.collection_name, schema=schema
+        )
+        for start in range(0, len(base), 5000):
+            batch = base[start : start + 5000]
+            self.client.insert(
+                collection_name=self.collection_name,
+                data=[
+                    {"id": start + i, "vector": vector.tolist()}
+                    for i, vector in enumerate(batch)
+                ],
+            )
+        started = time.perf_counter()
+        index_params = MilvusClient.prepare_index_params()
+        index_params.add_index(
+            field_name="vector",
+            index_type=config.index_type,
+            metric_type=self.metric,
+            params=config.build_params,
+        )
+        self.client.create_index(self.collection_name, index_params)
+        self.client.load_collection(self.collection_name)
+        return time.perf_counter() - started
+
+    def _search(
+        self, queries: np.ndarray, search_params: Dict[str, Any]
+    ) -> Tuple[List[List[int]], List[float]]:
+        found: List[List[int]] = []
+        latencies: List[float] = []
+        params = {"metric_type": self.metric, "params": search_params}
+        for query in queries:
+            started = time.perf_counter()
+            hits = self.client.search(
+                collection_name=self.collection_name,
+                data=[query.tolist()],
+                limit=self.k,
+                search_params=params,
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            found.append([hit["id"] for hit in hits[0]])
+        return found, latencies
+
+    def _drop(self) -> None:
+        if self.collection_name in self.client.list_collections():
+            self.client.drop_collection(self.collection_name)
+
+
+def recommend(
+    results: Sequence[BenchmarkResult], target_recall: float
+) -> Optional[BenchmarkResult]:
+    """Fastest (p99) configuration meeting ``target_recall``, else the most accurate."""
+    if not results:
+        return None
+    passing = [r for r in results if r.recall >= target_recall]
+    if passing:
+        return min(passing, key=lambda r: (r.p99_ms, r.p50_ms))
+    return max(results, key=lambda r: (r.recall, -r.p99_ms))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Milvus ANN index benchmark")
+    parser.add_argument("--sample", type=int, default=20000, help="Vectors to index")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out queries")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument(
+        "--synthetic", action="store_true", help="Use synthetic clustered vectors"
+    )
+    parser.add_argument("--dim", type=int, default=768, help="Synthetic dimension")
+    parser.add_argument(
+        "--uri",
+        default=None,
+        help="Milvus used for the scratch collection (default: temporary Milvus Lite file)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    total = args.sample + args.queries
+    metric = "IP"
+    if args.synthetic:
+        vectors = synthetic_vectors(total, args.dim)
+    else:
+        retriever = MilvusRetriever()
+        metric = retriever.metric_type
+        vectors = sample_collection(retriever, total)
+        retriever.close()
+        if len(vectors) <= args.queries:
+            raise SystemExit(
+                f"Collection has only {len(vectors)} vectors; ingest more or use --synthetic"
+            )
+    rng = np.random.default_rng(0)
+    rng.shuffle(vectors)
+    queries, base = vectors[: args.queries], vectors[args.queries :]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        uri = args.uri or os.path.join(scratch, "index_benchmark.db")
+        lite = uri.endswith(".db")
+        client = MilvusClient(uri=uri)
+        benchmark = IndexBenchmark(client, metric=metric, k=args.k, lite=lite)
+        results = benchmark.run(base, queries, default_configs(len(base)))
+        client.close()
+
+    print(f"\n{len(base)} vectors x {base.shape[1]} dims, {len(queries)} queries")
+    for result in results:
+        print(result)
+    best = recommend(results, args.target_recall)
+    if best is None:
+        raise SystemExit("No configuration could be benchmarked")
+    if best.recall < args.target_recall:
+        print(f"\nNo configuration reached recall@{args.k} >= {args.target_recall}")
+    print(f"\nRecommended ({best}):")
+    for key, value in best.config.env(best.search_params).items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
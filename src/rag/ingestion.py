@@ -0,0 +1,386 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Incremental document ingestion for the Milvus and embedded providers.
+
+Every chunk is stored under an id derived from its document url and a hash of
+its content, so re-ingesting a corpus only embeds chunks whose text changed.
+Chunks that no longer exist in a document, and documents removed from an
+ingested directory, are deleted. Jobs run in the background and can be polled
+through ``ingestion_jobs``.
+
+Usage:
+    python -m src.rag.ingestion ./docs --prune
+"""
+
+import argparse
+import hashlib
+import io
+import logging
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from markdownify import markdownify
+
+from src.config.loader import get_str_env
+from src.config.tools import SELECTED_RAG_PROVIDER, RAGProvider
+from src.rag.background import background_priors
+from src.rag.catalog import resource_catalog
+from src.rag.embedded import EmbeddedProvider
+from src.rag.milvus import IngestionProgress, MilvusRetriever
+from src.rag.result_cache import invalidate_result_caches
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".md", ".markdown", ".txt", ".html", ".htm", ".pdf"}
+
+# Metadata ``source`` value of ingested chunks (example files use "examples").
+INGEST_SOURCE = "ingest"
+
+# Providers exposing the chunk-level ingestion surface used below.
+INGESTIBLE_PROVIDERS = (MilvusRetriever, EmbeddedProvider)
+
+
+def _notify_ingested() -> None:
+    """Drop cached results and resource lists that may predate ingested changes."""
+    invalidate_result_caches()
+    resource_catalog.invalidate()
+    background_priors.invalidate()
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ValueError("PDF ingestion requires the 'pypdf' package")
+    reader = PdfReader(io.BytesIO(data))
+    return "\n\n".join((page.extract_text() or "") for page in reader.pages)
+
+
+def read_document(name: str, data: bytes) -> Tuple[str, str]:
+    """Return ``(title, text)`` for a supported file.
+
+    Raises:
+        ValueError: If the file type is not supported.
+    """
+    suffix = Path(name).suffix.lower()
+    stem_title = Path(name).stem.replace("_", " ").replace("-", " ").title()
+    if suffix in (".md", ".markdown"):
+        text = data.decode("utf-8", errors="ignore")
+        match = re.search(r"^#\s+(.+)$", text, re.MULTILINE)
+        return (match.group(1).strip() if match else stem_title), text
+    if suffix == ".txt":
+        return stem_title, data.decode("utf-8", errors="ignore")
+    if suffix in (".html", ".htm"):
+        html = data.decode("utf-8", errors="ignore")
+        match = re.search(r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)
+        html = re.sub(
+            r"<(script|style)[^>]*>.*?</\1>", "", html, flags=re.IGNORECASE | re.DOTALL
+        )
+        title = (match.group(1).strip() if match else "") or stem_title
+        return title, markdownify(html)
+    if suffix == ".pdf":
+        return stem_title, _extract_pdf_text(data)
+    raise ValueError(f"Unsupported file type: {name}")
+
+
+def chunk_id(url: str, content: str) -> str:
+    """Stable chunk id: document url hash + chunk content hash."""
+    url_hash = hashlib.md5(url.encode("utf-8")).hexdigest()[:12]
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:24]
+    return f"{url_hash}_{content_hash}"
+
+
+@dataclass
+class IngestionJob:
+    """State of a background ingestion job, safe to serialize for polling."""
+
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "pending"  # pending | running | completed | failed
+    documents_total: int = 0
+    documents_processed: int = 0
+    documents_failed: int = 0
+    documents_deleted: int = 0
+    chunks_added: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    chunks_failed: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class DocumentIngestor:
+    """Synchronize files into a Milvus collection or embedded store chunk by chunk.
+
+    Args:
+        retriever: Provider the chunks are stored in.
+        root: Directory that document urls are relative to; defaults to
+            ``RAG_INGEST_ROOT`` (or the working directory). Files outside it
+            are keyed by their full resolved path.
+    """
+
+    def __init__(
+        self,
+        retriever: MilvusRetriever | EmbeddedProvider,
+        root: str | Path | None = None,
+    ):
+        self.retriever = retriever
+        self.root = Path(
+            root if root is not None else get_str_env("RAG_INGEST_ROOT", ".")
+        ).resolve()
+
+    def _url(self, relative: str) -> str:
+        scheme = getattr(self.retriever, "uri_scheme", "milvus")
+        return f"{scheme}://{self.retriever.collection_name}/{relative}"
+
+    def _key(self, path: Path) -> str:
+        """Document key of a resolved path: unique per file, whatever the
+        directory it is ingested through."""
+        try:
+            relative = path.relative_to(self.root).as_posix()
+        except ValueError:
+            return path.as_posix().lstrip("/")
+        return "" if relative == "." else relative
+
+    def ingest_directory(
+        self, path: str | Path, prune: bool = True, job: Optional[IngestionJob] = None
+    ) -> IngestionJob:
+        """Ingest every supported file below ``path``.
+
+        Args:
+            path: Directory to ingest; documents are keyed by their path
+                relative to ``root``, so a file is stored once whichever of
+                its parent directories is ingested.
+            prune: Delete stored documents under this directory whose file
+                no longer exists.
+            job: Optional job object updated in place.
+        """
+        root = Path(path).resolve()
+        if not root.is_dir():
+            raise ValueError(f"Not a directory: {path}")
+        files = sorted(
+            p
+            for p in root.rglob("*")
+            if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS
+        )
+        key = self._key(root)
+        existing = self.retriever.get_chunk_ids_by_url(
+            self._url(f"{key}/" if key else "")
+        )
+        if not key:
+            # Ingesting the root itself: uploads and example files live
+            # beside its documents, and top-level example urls look like
+            # top-level files, so only documents in subdirectories are
+            # candidates for pruning.
+            existing = {
+                url: ids
+                for url, ids in existing.items()
+                if "/" in url[len(self._url("")) :]
+                and not url.startswith(self._url("uploads/"))
+            }
+
+        def sources() -> Iterator[Tuple[str, str, Callable[[], bytes]]]:
+            for p in files:
+                yield self._key(p), p.name, p.read_bytes
+
+        job = self._run(sources(), len(files), existing, job)
+        if prune:
+            seen = {self._url(self._key(p)) for p in files}
+            removed = [url for url in existing if url not in seen]
+            stale = [cid for url in removed for cid in existing[url]]
+            self.retriever.delete_chunks(stale)
+            _notify_ingested()
+            job.documents_deleted += len(removed)
+            job.chunks_deleted += len(stale)
+        return job
+
+    def ingest_files(
+        self, files: List[Tuple[str, bytes]], job: Optional[IngestionJob] = None
+    ) -> IngestionJob:
+        """Ingest uploaded ``(filename, content)`` pairs under ``uploads/``."""
+        existing = self.retriever.get_chunk_ids_by_url(self._url("uploads/"))
+
+        def sources() -> Iterator[Tuple[str, str, Callable[[], bytes]]]:
+            for name, data in files:
+                yield f"uploads/{Path(name).name}", name, lambda data=data: data
+
+        return self._run(sources(), len(files), existing, job)
+
+    def _run(
+        self,
+        sources: Iterable[Tuple[str, str, Callable[[], bytes]]],
+        total: int,
+        existing: Dict[str, Set[str]],
+        job: Optional[IngestionJob],
+    ) -> IngestionJob:
+        job = job or IngestionJob()
+        # A job may span several calls (e.g. multiple directories), so add up.
+        job.documents_total += total
+        added, failed = job.chunks_added, job.chunks_failed
+        stale: Dict[str, Set[str]] = {}
+
+        def new_chunks() -> Iterator[Dict[str, Any]]:
+            for relative, name, read in sources:
+                url = self._url(relative)
+                try:
+                    title, text = read_document(name, read())
+                    chunks = self.retriever._split_content(text)
+                except Exception as e:
+                    logger.warning("Error reading %s: %s", relative, e)
+                    job.documents_failed += 1
+                    continue
+                stored = existing.get(url, set())
+                wanted: Set[str] = set()
+                for content in chunks:
+                    if not content.strip():
+                        continue
+                    cid = chunk_id(url, content)
+                    if cid in wanted:
+                        continue
+                    wanted.add(cid)
+                    if cid in stored:
+                        job.chunks_unchanged += 1
+                        continue
+                    yield {
+                        "id": cid,
+                        "content": content,
+                        "title": title,
+                        "url": url,
+                        "metadata": {"source": INGEST_SOURCE, "file": relative},
+                    }
+                if stored - wanted:
+                    stale[url] = stored - wanted
+                job.documents_processed += 1
+
+        def on_progress(progress: IngestionProgress) -> None:
+            job.chunks_added = added + progress.chunks_inserted
+            job.chunks_failed = failed + progress.chunks_failed
+
+        progress = self.retriever.insert_chunks(new_chunks(), on_progress=on_progress)
+        on_progress(progress)
+        # Old chunk versions are removed only after their replacements landed;
+        # a document whose new chunks failed keeps its old version.
+        for url in stale.keys() & progress.failed_urls:
+            logger.warning("Keeping previous chunks of %s: replacements failed", url)
+        removed = [
+            cid
+            for url, ids in stale.items()
+            if url not in progress.failed_urls
+            for cid in ids
+        ]
+        self.retriever.delete_chunks(removed)
+        job.chunks_deleted += len(removed)
+        _notify_ingested()
+        logger.info(
+            "Ingestion %s: %d added, %d unchanged, %d deleted (%s)",
+            job.id,
+            job.chunks_added,
+            job.chunks_unchanged,
+            job.chunks_deleted,
+            progress,
+        )
+        return job
+
+
+class IngestionJobManager:
+    """Run ingestion jobs one at a time in the background and track their state."""
+
+    def __init__(self, max_history: int = 100):
+        self.max_history = max_history
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+        # One worker: concurrent jobs on one collection would race on deletes.
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="rag-ingest"
+        )
+
+    def submit(self, run: Callable[[IngestionJob], Any]) -> IngestionJob:
+        """Schedule ``run(job)`` and return the job immediately."""
+        job = IngestionJob()
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [
+                j.id for j in self._jobs.values() if j.status in ("completed", "failed")
+            ]
+            for job_id in finished[: max(len(self._jobs) - self.max_history, 0)]:
+                del self._jobs[job_id]
+        self._executor.submit(self._execute, job, run)
+        return job
+
+    def _execute(self, job: IngestionJob, run: Callable[[IngestionJob], Any]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            run(job)
+            job.status = "completed"
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.id)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+ingestion_jobs = IngestionJobManager()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Incrementally ingest documents into the Milvus collection "
+        "(or the embedded store when RAG_PROVIDER=embedded)"
+    )
+    parser.add_argument("paths", nargs="+", help="Directories or files to ingest")
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete documents removed from the ingested directories",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    retriever = (
+        EmbeddedProvider()
+        if SELECTED_RAG_PROVIDER == RAGProvider.EMBEDDED.value
+        else MilvusRetriever()
+    )
+    ingestor = DocumentIngestor(retriever)
+    directories = [p for p in map(Path, args.paths) if p.is_dir()]
+    files = [(p.name, p.read_bytes()) for p in map(Path, args.paths) if p.is_file()]
+
+    def run(job: IngestionJob) -> None:
+        for directory in directories:
+            ingestor.ingest_directory(directory, prune=args.prune, job=job)
+        if files:
+            ingestor.ingest_files(files, job=job)
+
+    job = ingestion_jobs.submit(run)
+    while job.finished_at is None:
+        time.sleep(1)
+        print(
+            f"[{job.status}] {job.documents_processed}/{job.documents_total} documents, "
+            f"{job.chunks_added} chunks added, {job.chunks_unchanged} unchanged"
+        )
+    print(job.to_dict())
+    retriever.close()
+    if job.status == "failed":
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
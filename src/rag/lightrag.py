@@ -7,8 +7,10 @@ import logging
 from typing import Optional
 from urllib.parse import urlparse
 
+import httpx
 import requests
 
+from src.rag.http_client import arequest, get_session, request
 from src.rag.retriever import Chunk, Document, Resource, Retriever
 
 logger = logging.getLogger(__name__)
@@ -79,14 +81,7 @@ class LightRAGProvider(Retriever):
             headers.setdefault("Authorization", f"Bearer {self.api_key}")
         return headers
 
-    def query_relevant_documents(
-        self, query: str, resources: list[Resource] = []
-    ) -> list[Document]:
-        """
-        本地检索（local_search=true）：返回 chunks，映射为 Document/Chunk 以兼容上层工具。
-        """
-        headers = self._auth_headers()
-
+    def _local_search_payload(self, query: str, resources: list[Resource]) -> Optional[dict]:
         payload = {
             "query": query,
             "max_results": self.local_search_max_results,
@@ -102,18 +97,54 @@ class LightRAGProvider(Retriever):
                 payload["resources"] = resource_uris
         else:
             logger.warning("LightRAG local_search called without resources; returning empty.")
+            return None
+        return payload
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        本地检索（local_search=true）：返回 chunks，映射为 Document/Chunk 以兼容上层工具。
+        """
+        payload = self._local_search_payload(query, resources)
+        if payload is None:
             return []
 
         try:
-            response = requests.post(
+            response = request(
+                "POST",
                 f"{self.api_url}api/v1/retrieve",
-                headers=headers,
+                headers=self._auth_headers(),
                 json=payload,
                 timeout=self.timeout,
             )
         except requests.RequestException as e:
             raise Exception(f"Failed to connect to LightRAG service: {str(e)}")
+        return self._parse_local_search(response)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        本地检索的异步版本，复用事件循环内的连接池。
+        """
+        payload = self._local_search_payload(query, resources)
+        if payload is None:
+            return []
+
+        try:
+            response = await arequest(
+                "POST",
+                f"{self.api_url}api/v1/retrieve",
+                headers=self._auth_headers(),
+                json=payload,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to connect to LightRAG service: {str(e)}")
+        return self._parse_local_search(response)
 
+    def _parse_local_search(self, response) -> list[Document]:
         if response.status_code != 200:
             raise Exception(f"LightRAG API error: {response.status_code} - {response.text}")
 
@@ -194,7 +225,8 @@ class LightRAGProvider(Retriever):
             params["query"] = query
 
         try:
-            response = requests.get(
+            response = request(
+                "GET",
                 f"{self.api_url}api/v1/resources",
                 headers=headers,
                 params=params,
@@ -217,15 +249,7 @@ class LightRAGProvider(Retriever):
 
         return resources
 
-    def query_background_knowledge(
-        self, query: str, resources: list[Resource] = []
-    ) -> dict:
-        """
-        背景检索（background_search=true）：返回结构化先验（background/entities/relationships/metadata）。
-        直接透传 result 字段，供上层节点压缩注入 Planner。
-        """
-        headers = self._auth_headers()
-
+    def _background_search_payload(self, query: str, resources: list[Resource]) -> Optional[dict]:
         payload = {
             "query": query,
             "max_results": self.background_search_max_results,
@@ -237,18 +261,55 @@ class LightRAGProvider(Retriever):
                 payload["resources"] = uris
         else:
             logger.warning("LightRAG background_search called without resources; returning empty.")
+            return None
+        return payload
+
+    def query_background_knowledge(
+        self, query: str, resources: list[Resource] = []
+    ) -> dict:
+        """
+        背景检索（background_search=true）：返回结构化先验（background/entities/relationships/metadata）。
+        直接透传 result 字段，供上层节点压缩注入 Planner。
+        """
+        payload = self._background_search_payload(query, resources)
+        if payload is None:
             return {}
 
         try:
-            response = requests.post(
+            response = request(
+                "POST",
                 f"{self.api_url}api/v1/retrieve",
-                headers=headers,
+                headers=self._auth_headers(),
                 json=payload,
                 timeout=self.timeout,
             )
         except requests.RequestException as e:
             raise Exception(f"Failed to connect to LightRAG service: {str(e)}")
+        return self._parse_background_search(response)
+
+    async def aquery_background_knowledge(
+        self, query: str, resources: list[Resource] = []
+    ) -> dict:
+        """
+        背景检索的异步版本。
+        """
+        payload = self._background_search_payload(query, resources)
+        if payload is None:
+            return {}
 
+        try:
+            response = await arequest(
+                "POST",
+                f"{self.api_url}api/v1/retrieve",
+                headers=self._auth_headers(),
+                json=payload,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to connect to LightRAG service: {str(e)}")
+        return self._parse_background_search(response)
+
+    def _parse_background_search(self, response) -> dict:
         if response.status_code != 200:
             raise Exception(f"LightRAG API error: {response.status_code} - {response.text}")
 
@@ -336,7 +397,8 @@ class LightRAGProvider(Retriever):
         """
         try:
             headers = self._auth_headers()
-            response = requests.get(
+            # 健康检查不重试，直接使用连接池会话
+            response = get_session().get(
                 f"{self.api_url}api/v1/health",
                 headers=headers,
                 timeout=self.timeout,
@@ -345,6 +407,9 @@ class LightRAGProvider(Retriever):
         except Exception:
             return False
 
+    def health_check(self) -> bool:
+        return self.check_health()
+
 
 def parse_lightrag_uri(uri: str) -> Optional[str]:
     """
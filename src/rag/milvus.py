@@ -3,18 +3,84 @@
 
 import hashlib
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
 
 from langchain_milvus.vectorstores import Milvus as LangchainMilvus
 from pymilvus import MilvusClient, CollectionSchema, FieldSchema, DataType
 from langchain_openai import OpenAIEmbeddings
 from openai import OpenAI
+from src.rag.chunker import MarkdownChunker
+from src.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.rag.hybrid import BM25Index, hybrid_search
 from src.rag.retriever import Chunk, Document, Resource, Retriever
 from src.config.loader import get_bool_env, get_str_env, get_int_env
 
 logger = logging.getLogger(__name__)
 
+# Vector index types selectable through MILVUS_INDEX_TYPE.
+_INDEX_TYPES = ("HNSW", "IVF_FLAT", "IVF_SQ8", "FLAT")
+# Milvus Lite (local mode) only builds these index types.
+_LITE_INDEX_TYPES = ("FLAT", "IVF_FLAT")
+
+# Metadata ``source`` values of documents surfaced by ``list_resources``.
+_LISTED_SOURCES_EXPR = "source in ['examples', 'ingest']"
+
+
+def _quote(value: str) -> str:
+    """Quote a string literal for a Milvus filter expression."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+@dataclass
+class IngestionProgress:
+    """Running counters for a bulk ingestion."""
+
+    chunks_embedded: int = 0
+    chunks_inserted: int = 0
+    chunks_failed: int = 0
+    batches: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    # URLs with at least one chunk that failed to embed or insert.
+    failed_urls: Set[str] = field(default_factory=set)
+
+    def record_failure(self, chunks: List[Dict[str, Any]]) -> None:
+        self.chunks_failed += len(chunks)
+        self.failed_urls.update(c["url"] for c in chunks if c.get("url"))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Inserted chunks per second."""
+        elapsed = self.elapsed
+        return self.chunks_inserted / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.chunks_inserted} chunks inserted, {self.chunks_failed} failed "
+            f"in {self.elapsed:.1f}s ({self.throughput:.1f} chunks/s)"
+        )
+
 
 class DashscopeEmbeddings:
     """OpenAI-compatible embeddings wrapper."""
@@ -63,6 +129,22 @@ class MilvusRetriever(Retriever):
         MILVUS_EMBEDDING_DIM: Override embedding dimensionality.
         MILVUS_AUTO_LOAD_EXAMPLES: Load example *.md files if true.
         MILVUS_EXAMPLES_DIR: Folder containing example markdown files.
+        MILVUS_INDEX_TYPE: HNSW | IVF_FLAT | IVF_SQ8 | FLAT (default: IVF_FLAT).
+        MILVUS_HNSW_M / MILVUS_HNSW_EF_CONSTRUCTION / MILVUS_HNSW_EF: HNSW parameters.
+        MILVUS_IVF_NLIST / MILVUS_IVF_NPROBE: IVF parameters (default: 1024 / 10).
+        MILVUS_HYBRID_SEARCH: Fuse BM25 keyword and vector search (default: false).
+        MILVUS_BM25_PATH: Keyword index file (default: ./data/bm25/<collection>.db).
+        MILVUS_RRF_K / MILVUS_HYBRID_CANDIDATES: Fusion constant (default: 60) and
+            results fetched per retriever (default: 2 * top_k).
+        MILVUS_EMBEDDING_CACHE_SIZE: Query embeddings kept in memory, 0 disables (default: 1024).
+        MILVUS_EMBEDDING_CACHE_PATH: Optional SQLite file for a persistent cache tier.
+        MILVUS_CHUNK_TOKENS: Token budget per chunk (default: 512).
+        MILVUS_CHUNK_OVERLAP_TOKENS: Tokens shared by consecutive chunks (default: 64).
+        MILVUS_CHUNK_SIZE: Hard character cap per chunk (default: 4000).
+        MILVUS_EMBEDDING_BATCH_SIZE: Texts per ``embed_documents`` call (default: 64).
+        MILVUS_EMBEDDING_CONCURRENCY: Embedding requests in flight (default: 4).
+        MILVUS_EMBEDDING_MAX_RETRIES: Retries per failed embedding batch (default: 3).
+        MILVUS_INSERT_BATCH_SIZE: Rows per insert call (default: 512).
     """
 
     def __init__(self) -> None:
@@ -76,6 +158,34 @@ class MilvusRetriever(Retriever):
         top_k_raw = get_str_env("MILVUS_TOP_K", "10")
         self.top_k: int = int(top_k_raw) if top_k_raw.isdigit() else 10
 
+        # --- Vector index configuration ---
+        self.index_type: str = get_str_env("MILVUS_INDEX_TYPE", "IVF_FLAT").upper()
+        if self.index_type not in _INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported Milvus index type: {self.index_type}. "
+                f"Supported types: {','.join(_INDEX_TYPES)}"
+            )
+        self.metric_type: str = get_str_env("MILVUS_METRIC_TYPE", "IP").upper()
+        self.hnsw_m: int = get_int_env("MILVUS_HNSW_M", 16)
+        self.hnsw_ef_construction: int = get_int_env("MILVUS_HNSW_EF_CONSTRUCTION", 200)
+        self.hnsw_ef: int = get_int_env("MILVUS_HNSW_EF", 64)
+        self.ivf_nlist: int = get_int_env("MILVUS_IVF_NLIST", 1024)
+        self.ivf_nprobe: int = get_int_env("MILVUS_IVF_NPROBE", 10)
+
+        # --- Hybrid (BM25 + vector) search configuration ---
+        self.hybrid_search: bool = get_bool_env("MILVUS_HYBRID_SEARCH", False)
+        self.rrf_k: int = get_int_env("MILVUS_RRF_K", 60)
+        self.hybrid_candidates: int = get_int_env("MILVUS_HYBRID_CANDIDATES", 0)
+        self.keyword_index: Optional[BM25Index] = (
+            BM25Index(
+                get_str_env(
+                    "MILVUS_BM25_PATH", f"./data/bm25/{self.collection_name}.db"
+                )
+            )
+            if self.hybrid_search
+            else None
+        )
+
         # --- Vector field names ---
         self.vector_field: str = get_str_env("MILVUS_VECTOR_FIELD", "embedding")
         self.id_field: str = get_str_env("MILVUS_ID_FIELD", "id")
@@ -94,14 +204,44 @@ class MilvusRetriever(Retriever):
         # --- Examples / auto-load configuration ---
         self.auto_load_examples: bool = get_bool_env("MILVUS_AUTO_LOAD_EXAMPLES", True)
         self.examples_dir: str = get_str_env("MILVUS_EXAMPLES_DIR", "examples")
-        # chunk size
+        # chunk size: token budget plus a hard character cap per chunk
         self.chunk_size: int = get_int_env("MILVUS_CHUNK_SIZE", 4000)
+        self.chunk_tokens: int = get_int_env("MILVUS_CHUNK_TOKENS", 512)
+        self.chunk_overlap_tokens: int = get_int_env("MILVUS_CHUNK_OVERLAP_TOKENS", 64)
+        self.chunker = MarkdownChunker(
+            chunk_tokens=self.chunk_tokens,
+            overlap_tokens=self.chunk_overlap_tokens,
+            max_chars=self.chunk_size,
+        )
+
+        # --- Bulk ingestion configuration ---
+        self.embedding_batch_size: int = max(
+            get_int_env("MILVUS_EMBEDDING_BATCH_SIZE", 64), 1
+        )
+        self.embedding_concurrency: int = max(
+            get_int_env("MILVUS_EMBEDDING_CONCURRENCY", 4), 1
+        )
+        self.embedding_max_retries: int = max(
+            get_int_env("MILVUS_EMBEDDING_MAX_RETRIES", 3), 0
+        )
+        self.insert_batch_size: int = max(
+            get_int_env("MILVUS_INSERT_BATCH_SIZE", 512), 1
+        )
+
+        # --- Query embedding cache (in-memory LRU + optional disk tier) ---
+        self.embedding_cache = EmbeddingCache(
+            model=self.embedding_model,
+            dimensions=self.embedding_dim,
+            max_entries=get_int_env("MILVUS_EMBEDDING_CACHE_SIZE", 1024),
+            disk_path=get_str_env("MILVUS_EMBEDDING_CACHE_PATH"),
+        )
 
         # --- Embedding model initialization ---
         self._init_embedding_model()
 
         # Client (MilvusClient or LangchainMilvus) created lazily
         self.client: Any = None
+        self._connect_lock = threading.Lock()
 
     def _init_embedding_model(self) -> None:
         """Initialize the embedding model based on configuration."""
@@ -169,6 +309,37 @@ class MilvusRetriever(Retriever):
         )
         return schema
 
+    def _index_params(self) -> Dict[str, Any]:
+        """Return ``index_type``/``metric_type``/``params`` for the vector index."""
+        index_type = self.index_type
+        if self._is_milvus_lite() and index_type not in _LITE_INDEX_TYPES:
+            logger.warning(
+                "Milvus Lite does not support %s indexes, using FLAT", index_type
+            )
+            index_type = "FLAT"
+        if index_type == "HNSW":
+            params = {"M": self.hnsw_m, "efConstruction": self.hnsw_ef_construction}
+        elif index_type in ("IVF_FLAT", "IVF_SQ8"):
+            params = {"nlist": self.ivf_nlist}
+        else:
+            params = {}
+        return {
+            "index_type": index_type,
+            "metric_type": self.metric_type,
+            "params": params,
+        }
+
+    def _search_params(self) -> Dict[str, Any]:
+        """Return search parameters matching the configured index."""
+        index_type = self._index_params()["index_type"]
+        if index_type == "HNSW":
+            params = {"ef": max(self.hnsw_ef, self.top_k)}
+        elif index_type in ("IVF_FLAT", "IVF_SQ8"):
+            params = {"nprobe": min(self.ivf_nprobe, self.ivf_nlist)}
+        else:
+            params = {}
+        return {"metric_type": self.metric_type, "params": params}
+
     def _ensure_collection_exists(self) -> None:
         """Ensure the configured collection exists (create if missing).
         For Milvus Lite we create the collection manually; for the remote
@@ -182,17 +353,19 @@ class MilvusRetriever(Retriever):
                 if self.collection_name not in collections:
                     # Create collection
                     schema = self._create_collection_schema()
+                    index = self._index_params()
+                    index_params = MilvusClient.prepare_index_params()
+                    index_params.add_index(field_name=self.vector_field, **index)
                     self.client.create_collection(
                         collection_name=self.collection_name,
                         schema=schema,
-                        index_params={
-                            "field_name": self.vector_field,
-                            "index_type": "IVF_FLAT",
-                            "metric_type": "IP",
-                            "params": {"nlist": 1024},
-                        },
+                        index_params=index_params,
+                    )
+                    logger.info(
+                        "Created Milvus collection: %s (%s index)",
+                        self.collection_name,
+                        index["index_type"],
                     )
-                    logger.info("Created Milvus collection: %s", self.collection_name)
 
             except Exception as e:
                 logger.warning("Could not ensure collection exists: %s", e)
@@ -226,40 +399,58 @@ class MilvusRetriever(Retriever):
                 return
             # Check if files are already loaded
             existing_docs = self._get_existing_document_ids()
-            loaded_count = 0
-            for md_file in md_files:
-                doc_id = self._generate_doc_id(md_file)
+            read_files: Dict[str, str] = {}  # url -> file name
 
-                # Skip if already loaded
-                if doc_id in existing_docs:
-                    continue
-                try:
-                    # Read and process the file
-                    content = md_file.read_text(encoding="utf-8")
-                    title = self._extract_title_from_markdown(content, md_file.name)
+            def iter_chunks() -> Iterator[Dict[str, Any]]:
+                # Files are read lazily so only the batches in flight are held
+                # in memory, not the whole corpus.
+                for md_file in md_files:
+                    doc_id = self._generate_doc_id(md_file)
 
-                    # Split content into chunks if it's too long
-                    chunks = self._split_content(content)
+                    # Skip if already loaded
+                    if doc_id in existing_docs:
+                        continue
+                    try:
+                        content = md_file.read_text(encoding="utf-8")
+                        title = self._extract_title_from_markdown(content, md_file.name)
+                        # Split content into chunks if it's too long
+                        chunks = self._split_content(content)
+                    except Exception as e:
+                        logger.warning("Error loading %s: %s", md_file.name, e)
+                        continue
 
-                    # Insert each chunk
                     for i, chunk in enumerate(chunks):
-                        chunk_id = f"{doc_id}_chunk_{i}" if len(chunks) > 1 else doc_id
-                        self._insert_document_chunk(
-                            doc_id=chunk_id,
-                            content=chunk,
-                            title=title,
-                            url=f"milvus://{self.collection_name}/{md_file.name}",
-                            metadata={"source": "examples", "file": md_file.name},
-                        )
-
-                    loaded_count += 1
-                    logger.debug("Loaded example markdown: %s", md_file.name)
-
-                except Exception as e:
-                    logger.warning("Error loading %s: %s", md_file.name, e)
-
+                        yield {
+                            "id": (
+                                f"{doc_id}_chunk_{i}" if len(chunks) > 1 else doc_id
+                            ),
+                            "content": chunk,
+                            "title": title,
+                            "url": f"milvus://{self.collection_name}/{md_file.name}",
+                            "metadata": {"source": "examples", "file": md_file.name},
+                        }
+                    read_files[f"milvus://{self.collection_name}/{md_file.name}"] = (
+                        md_file.name
+                    )
+                    logger.debug("Read example markdown: %s", md_file.name)
+
+            progress = self.insert_chunks(iter_chunks())
+            # A file counts as loaded only when every one of its chunks landed.
+            loaded_files = {
+                name
+                for url, name in read_files.items()
+                if url not in progress.failed_urls
+            }
+            failed_files = sorted(set(read_files.values()) - loaded_files)
+            if failed_files:
+                logger.warning(
+                    "Failed to load example files into Milvus: %s",
+                    ", ".join(failed_files),
+                )
             logger.info(
-                "Successfully loaded %d example files into Milvus", loaded_count
+                "Successfully loaded %d example files into Milvus: %s",
+                len(loaded_files),
+                progress,
             )
 
         except Exception as e:
@@ -286,26 +477,8 @@ class MilvusRetriever(Retriever):
         return filename.replace(".md", "").replace("_", " ").title()
 
     def _split_content(self, content: str) -> List[str]:
-        """Split long markdown text into paragraph-based chunks."""
-        if len(content) <= self.chunk_size:
-            return [content]
-
-        chunks = []
-        paragraphs = content.split("\n\n")
-        current_chunk = ""
-
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) <= self.chunk_size:
-                current_chunk += paragraph + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = paragraph + "\n\n"
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        return chunks
+        """Split markdown text into token-bounded, overlapping chunks."""
+        return self.chunker.split_text(content)
 
     def _get_existing_document_ids(self) -> Set[str]:
         """Return set of existing document identifiers in the collection."""
@@ -329,42 +502,194 @@ class MilvusRetriever(Retriever):
         except Exception:
             return set()
 
-    def _insert_document_chunk(
-        self, doc_id: str, content: str, title: str, url: str, metadata: Dict[str, Any]
-    ) -> None:
-        """Insert a single content chunk into Milvus."""
-        try:
-            # Generate embedding
-            embedding = self._get_embedding(content)
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch through ``embed_documents``, retrying with backoff."""
+        attempt = 0
+        while True:
+            try:
+                embeddings = self.embedding_model.embed_documents(texts)
+                if len(embeddings) != len(texts):
+                    raise ValueError(
+                        f"Expected {len(texts)} embeddings, got {len(embeddings)}"
+                    )
+                return embeddings
+            except Exception as e:
+                if attempt >= self.embedding_max_retries:
+                    raise RuntimeError(f"Failed to generate embeddings: {str(e)}")
+                delay = min(0.5 * 2**attempt, 8.0)
+                logger.warning(
+                    "Embedding batch failed (attempt %d/%d), retrying in %.1fs: %s",
+                    attempt + 1,
+                    self.embedding_max_retries + 1,
+                    delay,
+                    e,
+                )
+                time.sleep(delay)
+                attempt += 1
 
-            if self._is_milvus_lite():
-                # For Milvus Lite, use MilvusClient
-                data = [
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert already embedded rows with a single client call."""
+        if not rows:
+            return
+        if self._is_milvus_lite():
+            data = [
+                {
+                    self.id_field: row["id"],
+                    self.vector_field: row["embedding"],
+                    self.content_field: row["content"],
+                    self.title_field: row["title"],
+                    self.url_field: row["url"],
+                    **row["metadata"],
+                }
+                for row in rows
+            ]
+            self.client.insert(collection_name=self.collection_name, data=data)
+        else:
+            self.client.add_embeddings(
+                ids=[row["id"] for row in rows],
+                texts=[row["content"] for row in rows],
+                embeddings=[row["embedding"] for row in rows],
+                metadatas=[
                     {
-                        self.id_field: doc_id,
-                        self.vector_field: embedding,
-                        self.content_field: content,
-                        self.title_field: title,
-                        self.url_field: url,
-                        **metadata,  # Add metadata fields
+                        self.id_field: row["id"],
+                        self.title_field: row["title"],
+                        self.url_field: row["url"],
+                        **row["metadata"],
                     }
-                ]
-                self.client.insert(collection_name=self.collection_name, data=data)
-            else:
-                # For LangChain Milvus, use add_texts
-                self.client.add_texts(
-                    texts=[content],
-                    metadatas=[
-                        {
-                            self.id_field: doc_id,
-                            self.title_field: title,
-                            self.url_field: url,
-                            **metadata,
-                        }
-                    ],
-                )
-        except Exception as e:
-            raise RuntimeError(f"Failed to insert document chunk: {str(e)}")
+                    for row in rows
+                ],
+                batch_size=len(rows),
+            )
+        if self.keyword_index is not None:
+            self.keyword_index.add(rows)
+
+    def insert_chunks(
+        self,
+        chunks: Iterable[Dict[str, Any]],
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+    ) -> IngestionProgress:
+        """Embed and insert content chunks in bulk.
+
+        Chunks are consumed lazily and embedded in batches of
+        ``embedding_batch_size`` with at most ``embedding_concurrency``
+        requests in flight; embedded rows are inserted ``insert_batch_size``
+        at a time. A batch that still fails after retries is logged and
+        counted as failed without aborting the rest of the ingestion.
+
+        Args:
+            chunks: Iterable of dicts with ``id``, ``content``, ``title``,
+                ``url`` and ``metadata`` keys.
+            on_progress: Optional callback invoked after every insert.
+
+        Returns:
+            The final ``IngestionProgress``.
+        """
+        if not self.client:
+            self.connect()
+
+        progress = IngestionProgress()
+        pending_rows: List[Dict[str, Any]] = []
+
+        def flush() -> None:
+            batch = pending_rows[:]
+            pending_rows.clear()
+            try:
+                self._insert_rows(batch)
+                progress.chunks_inserted += len(batch)
+            except Exception as e:
+                logger.warning("Failed to insert %d chunks: %s", len(batch), e)
+                progress.record_failure(batch)
+            logger.info("Milvus ingestion progress: %s", progress)
+            if on_progress:
+                on_progress(progress)
+
+        def collect(batch: List[Dict[str, Any]], future: Future) -> None:
+            try:
+                embeddings = future.result()
+            except Exception as e:
+                logger.warning("Skipping %d chunks: %s", len(batch), e)
+                progress.record_failure(batch)
+                return
+            progress.chunks_embedded += len(batch)
+            progress.batches += 1
+            for chunk, embedding in zip(batch, embeddings):
+                pending_rows.append({**chunk, "embedding": embedding})
+            if len(pending_rows) >= self.insert_batch_size:
+                flush()
+
+        iterator = (
+            c
+            for c in chunks
+            if isinstance(c.get("content"), str) and c["content"].strip()
+        )
+        # Bounded window of in-flight batches keeps memory flat for large corpora.
+        in_flight: Deque[tuple] = deque()
+        with ThreadPoolExecutor(max_workers=self.embedding_concurrency) as executor:
+            while True:
+                batch = list(islice(iterator, self.embedding_batch_size))
+                if not batch:
+                    break
+                texts = [c["content"].strip() for c in batch]
+                in_flight.append((batch, executor.submit(self._embed_batch, texts)))
+                if len(in_flight) >= self.embedding_concurrency:
+                    collect(*in_flight.popleft())
+            while in_flight:
+                collect(*in_flight.popleft())
+        if pending_rows:
+            flush()
+        return progress
+
+    def _iter_rows(
+        self, expr: str, output_fields: List[str], batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream every row matching ``expr`` (not capped by the query limit)."""
+        if self._is_milvus_lite():
+            client = self.client
+        else:
+            # LangChain wrapper exposes the underlying MilvusClient
+            client = getattr(self.client, "client", None)
+            if client is None:
+                return
+        iterator = client.query_iterator(
+            collection_name=self.collection_name,
+            batch_size=batch_size,
+            filter=expr,
+            output_fields=output_fields,
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            iterator.close()
+
+    def get_chunk_ids_by_url(self, url_prefix: str) -> Dict[str, Set[str]]:
+        """Return stored chunk ids grouped by url for urls under ``url_prefix``."""
+        if not self.client:
+            self.connect()
+        # ``%`` and ``_`` are LIKE wildcards; re-check the prefix in Python.
+        expr = f"{self.url_field} like {_quote(url_prefix + '%')}"
+        grouped: Dict[str, Set[str]] = {}
+        for row in self._iter_rows(expr, [self.id_field, self.url_field]):
+            url = row.get(self.url_field, "")
+            if url.startswith(url_prefix) and row.get(self.id_field):
+                grouped.setdefault(url, set()).add(row[self.id_field])
+        return grouped
+
+    def delete_chunks(self, ids: List[str]) -> None:
+        """Delete chunks by primary key."""
+        if not ids:
+            return
+        if not self.client:
+            self.connect()
+        if self._is_milvus_lite():
+            self.client.delete(collection_name=self.collection_name, ids=ids)
+        else:
+            self.client.delete(ids=ids)
+        if self.keyword_index is not None:
+            self.keyword_index.delete(ids)
 
     def _connect(self) -> None:
         """Create the underlying Milvus client (idempotent)."""
@@ -387,15 +712,43 @@ class MilvusRetriever(Retriever):
 
                 # Create LangChain client (it will handle collection creation automatically)
                 self.client = LangchainMilvus(
-                    embedding_function=self.embedding_model,
+                    # Query embeddings computed by LangChain share our cache
+                    embedding_function=CachedEmbeddings(
+                        self.embedding_model, self.embedding_cache
+                    ),
                     collection_name=self.collection_name,
                     connection_args=connection_args,
+                    index_params=self._index_params(),
+                    search_params=self._search_params(),
                     # optional (if collection already exists with different schema, be careful)
                     drop_old=False,
                 )
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Milvus: {str(e)}")
 
+    def connect(self) -> None:
+        """Create the client once; safe to call from concurrent requests."""
+        with self._connect_lock:
+            if not self.client:
+                self._connect()
+
+    def health_check(self) -> bool:
+        """Return True if the client is connected and Milvus answers."""
+        if not self.client:
+            return False
+        try:
+            if self._is_milvus_lite():
+                self.client.list_collections()
+            else:
+                # LangChain wrapper exposes the underlying MilvusClient
+                inner = getattr(self.client, "client", None)
+                if inner is not None and hasattr(inner, "list_collections"):
+                    inner.list_collections()
+            return True
+        except Exception as e:
+            logger.warning("Milvus health check failed: %s", e)
+            return False
+
     def _is_milvus_lite(self) -> bool:
         """Return True if the URI points to a local Milvus Lite file.
         Milvus Lite uses local file paths (often ``*.db``) without an HTTP/HTTPS
@@ -415,13 +768,18 @@ class MilvusRetriever(Retriever):
 
             if not text.strip():
                 raise ValueError("Text cannot be empty or only whitespace")
+            text = text.strip()
+            cached = self.embedding_cache.get(text)
+            if cached is not None:
+                return cached
             # Unified embedding interface (OpenAIEmbeddings or DashscopeEmbeddings wrapper)
-            embeddings = self.embedding_model.embed_query(text=text.strip())
+            embeddings = self.embedding_model.embed_query(text=text)
 
             # Validate output
             if not isinstance(embeddings, list) or not embeddings:
                 raise ValueError(f"Invalid embedding format: {type(embeddings)}")
 
+            self.embedding_cache.put(text, embeddings)
             return embeddings
         except Exception as e:
             raise RuntimeError(f"Failed to generate embedding: {str(e)}")
@@ -430,77 +788,62 @@ class MilvusRetriever(Retriever):
         """List available resource summaries.
 
         Strategy:
-            1. If connected to Milvus Lite: query stored document metadata.
-            2. If LangChain client: perform a lightweight similarity search
-               using either the provided ``query`` or a zero vector to fetch
-               candidate docs (mocked in tests).
-            3. Append local markdown example titles (non-ingested) for user
-               discoverability.
+            1. Without a ``query`` (or on Milvus Lite): stream the metadata of
+               every stored document, not capped by the query limit.
+            2. With a ``query`` on a LangChain client: perform a lightweight
+               similarity search to fetch the closest candidate docs.
+            3. Fall back to local markdown example titles (non-ingested) when
+               Milvus cannot be queried.
 
         Args:
             query: Optional search text to bias resource ordering.
 
         Returns:
-            List of ``Resource`` objects.
+            List of ``Resource`` objects, one per document url.
         """
         resources: List[Resource] = []
 
         # Ensure connection established
         if not self.client:
             try:
-                self._connect()
+                self.connect()
             except Exception:
                 # Fall back to only local examples if connection fails
                 return self._list_local_markdown_resources()
 
         try:
-            if self._is_milvus_lite():
-                # Query limited metadata. Empty filter returns up to limit docs.
-                results = self.client.query(
-                    collection_name=self.collection_name,
-                    filter="source == 'examples'",
-                    output_fields=[self.id_field, self.title_field, self.url_field],
-                    limit=100,
+            if self._is_milvus_lite() or not query:
+                metas: Iterable[Dict[str, Any]] = self._iter_rows(
+                    _LISTED_SOURCES_EXPR,
+                    [self.id_field, self.title_field, self.url_field],
                 )
-                for r in results:
-                    resources.append(
-                        Resource(
-                            uri=r.get(self.url_field, "")
-                            or f"milvus://{r.get(self.id_field,'')}",
-                            title=r.get(self.title_field, "")
-                            or r.get(self.id_field, "Unnamed"),
-                            description="Stored Milvus document",
-                        )
-                    )
             else:
-                # Use similarity_search_by_vector for lightweight listing.
-                # If a query is provided embed it; else use a zero vector.
                 docs: Iterable[Any] = self.client.similarity_search(
-                    query, k=100, expr="source == 'examples'"  # Limit to 100 results
+                    query, k=100, expr=_LISTED_SOURCES_EXPR
                 )
-                for d in docs:
-                    meta = getattr(d, "metadata", {}) or {}
-                    # check if the resource is in the list of resources
-                    if resources and any(
-                        r.uri == meta.get(self.url_field, "")
-                        or r.uri == f"milvus://{meta.get(self.id_field,'')}"
-                        for r in resources
-                    ):
-                        continue
-                    resources.append(
-                        Resource(
-                            uri=meta.get(self.url_field, "")
-                            or f"milvus://{meta.get(self.id_field,'')}",
-                            title=meta.get(self.title_field, "")
-                            or meta.get(self.id_field, "Unnamed"),
-                            description="Stored Milvus document",
-                        )
+                metas = ((getattr(d, "metadata", {}) or {}) for d in docs)
+            # Documents are stored as several chunks sharing one url
+            seen: Set[str] = set()
+            for meta in metas:
+                uri = meta.get(self.url_field, "") or (
+                    f"milvus://{meta.get(self.id_field, '')}"
+                )
+                if uri in seen:
+                    continue
+                seen.add(uri)
+                resources.append(
+                    Resource(
+                        uri=uri,
+                        title=meta.get(self.title_field, "")
+                        or meta.get(self.id_field, "Unnamed"),
+                        description="Stored Milvus document",
                     )
-                logger.info(
-                    "Succeed listed %d resources from Milvus collection: %s",
-                    len(resources),
-                    self.collection_name,
                 )
+            logger.info(
+                "Succeed listed %d resources from Milvus collection: %s",
+                len(resources),
+                self.collection_name,
+            )
         except Exception:
             logger.warning(
                 "Failed to query Milvus for resources, falling back to local examples."
@@ -538,16 +881,143 @@ class MilvusRetriever(Retriever):
                 continue
         return resources
 
+    def _resource_filter_expr(self, resources: List[Resource]) -> str:
+        """Translate selected resources into a Milvus boolean expression.
+
+        A resource URI is either a stored document url
+        (``milvus://<collection>/<file>``) or ``milvus://<id>`` for documents
+        listed without a url.
+        """
+        if not resources:
+            return ""
+        urls: List[str] = []
+        ids: List[str] = []
+        for resource in resources:
+            uri = resource.uri
+            if uri not in urls:
+                urls.append(uri)
+            doc_id = uri[len("milvus://") :] if uri.startswith("milvus://") else uri
+            if doc_id and doc_id not in ids:
+                ids.append(doc_id)
+        url_list = ", ".join(_quote(u) for u in urls)
+        id_list = ", ".join(_quote(i) for i in ids)
+        return f"{self.url_field} in [{url_list}] or {self.id_field} in [{id_list}]"
+
+    def _vector_search(
+        self, query: str, resources: Optional[List[Resource]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Return the ``limit`` nearest chunks as dicts with a ``score`` key."""
+        # Restrict the ANN search itself to the selected resources so
+        # top_k is computed over relevant documents only.
+        expr = self._resource_filter_expr(resources or [])
+
+        # Get embeddings for the query
+        query_embedding = self._get_embedding(query)
+
+        hits: List[Dict[str, Any]] = []
+        # For Milvus Lite, use MilvusClient directly
+        if self._is_milvus_lite():
+            search_results = self.client.search(
+                collection_name=self.collection_name,
+                data=[query_embedding],
+                anns_field=self.vector_field,
+                search_params=self._search_params(),
+                limit=limit,
+                filter=expr,
+                output_fields=[
+                    self.id_field,
+                    self.content_field,
+                    self.title_field,
+                    self.url_field,
+                    self.vector_field,
+                ],
+            )
+            for result_list in search_results:
+                for result in result_list:
+                    entity = result.get("entity", {})
+                    hits.append(
+                        {
+                            "id": entity.get(self.id_field, ""),
+                            "content": entity.get(self.content_field, ""),
+                            "title": entity.get(self.title_field, ""),
+                            "url": entity.get(self.url_field, ""),
+                            "score": result.get("distance", 0.0),
+                            "embedding": entity.get(self.vector_field),
+                        }
+                    )
+        else:
+            # For LangChain Milvus, use similarity search
+            search_results = self.client.similarity_search_with_score(
+                query=query, k=limit, expr=expr or None
+            )
+            for doc, score in search_results:
+                metadata = doc.metadata or {}
+                hits.append(
+                    {
+                        "id": metadata.get(self.id_field, ""),
+                        "content": doc.page_content,
+                        "title": metadata.get(self.title_field, ""),
+                        "url": metadata.get(self.url_field, ""),
+                        "score": score,
+                    }
+                )
+        return hits
+
+    def _hybrid_search(
+        self, query: str, resources: Optional[List[Resource]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Fuse vector and BM25 rankings; ``score`` is the RRF score."""
+        uris = [r.uri for r in resources or []]
+        uris += [u[len("milvus://") :] for u in uris if u.startswith("milvus://")]
+        return hybrid_search(
+            lambda n: self._vector_search(query, resources, n),
+            lambda n: self.keyword_index.search(query, n, uris or None),
+            k=limit,
+            candidates=self.hybrid_candidates or 2 * limit,
+            rrf_k=self.rrf_k,
+        )
+
+    def rebuild_keyword_index(self) -> int:
+        """Re-index every stored chunk into the BM25 index; returns the count."""
+        if self.keyword_index is None:
+            raise ValueError("MILVUS_HYBRID_SEARCH is disabled")
+        if not self.client:
+            self.connect()
+        self.keyword_index.clear()
+        rows = self._iter_rows(
+            f'{self.id_field} != ""',
+            [self.id_field, self.content_field, self.title_field, self.url_field],
+        )
+        count = 0
+        while True:
+            batch = [
+                {
+                    "id": row[self.id_field],
+                    "content": row.get(self.content_field, ""),
+                    "title": row.get(self.title_field, ""),
+                    "url": row.get(self.url_field, ""),
+                }
+                for row in islice(rows, 1000)
+            ]
+            if not batch:
+                return count
+            self.keyword_index.add(batch)
+            count += len(batch)
+
     def query_relevant_documents(
         self, query: str, resources: Optional[List[Resource]] = None
     ) -> List[Document]:
-        """Perform vector similarity search returning rich ``Document`` objects.
+        """Perform vector (or hybrid) search returning rich ``Document`` objects.
+
+        With ``MILVUS_HYBRID_SEARCH`` enabled, BM25 keyword search runs
+        concurrently with the vector search and rankings are fused by RRF;
+        chunk similarities are then RRF scores.
 
         Args:
             query: Natural language query string.
             resources: Optional subset filter of ``Resource`` objects; if
-                provided, only documents whose id/url appear in the list will
-                be included.
+                provided, the search is restricted (via a Milvus filter
+                expression) to documents whose url or id matches one of them.
 
         Returns:
             List of aggregated ``Document`` objects; each contains one or more
@@ -559,99 +1029,30 @@ class MilvusRetriever(Retriever):
         resources = resources or []
         try:
             if not self.client:
-                self._connect()
-
-            # Get embeddings for the query
-            query_embedding = self._get_embedding(query)
-
-            # For Milvus Lite, use MilvusClient directly
-            if self._is_milvus_lite():
-                # Perform vector search
-                search_results = self.client.search(
-                    collection_name=self.collection_name,
-                    data=[query_embedding],
-                    anns_field=self.vector_field,
-                    param={"metric_type": "IP", "params": {"nprobe": 10}},
-                    limit=self.top_k,
-                    output_fields=[
-                        self.id_field,
-                        self.content_field,
-                        self.title_field,
-                        self.url_field,
-                    ],
-                )
-
-                documents = {}
-
-                for result_list in search_results:
-                    for result in result_list:
-                        entity = result.get("entity", {})
-                        doc_id = entity.get(self.id_field, "")
-                        content = entity.get(self.content_field, "")
-                        title = entity.get(self.title_field, "")
-                        url = entity.get(self.url_field, "")
-                        score = result.get("distance", 0.0)
-
-                        # Skip if resource filtering is requested and this doc is not in the list
-                        if resources:
-                            doc_in_resources = False
-                            for resource in resources:
-                                if (
-                                    url and url in resource.uri
-                                ) or doc_id in resource.uri:
-                                    doc_in_resources = True
-                                    break
-                            if not doc_in_resources:
-                                continue
-
-                        # Create or update document
-                        if doc_id not in documents:
-                            documents[doc_id] = Document(
-                                id=doc_id, url=url, title=title, chunks=[]
-                            )
-
-                        # Add chunk to document
-                        chunk = Chunk(content=content, similarity=score)
-                        documents[doc_id].chunks.append(chunk)
-
-                return list(documents.values())
+                self.connect()
 
+            if self.keyword_index is not None:
+                hits = self._hybrid_search(query, resources, self.top_k)
             else:
-                # For LangChain Milvus, use similarity search
-                search_results = self.client.similarity_search_with_score(
-                    query=query, k=self.top_k
+                hits = self._vector_search(query, resources, self.top_k)
+
+            documents = {}
+            for hit in hits:
+                doc_id = hit["id"]
+                # Create or update document
+                if doc_id not in documents:
+                    documents[doc_id] = Document(
+                        id=doc_id, url=hit["url"], title=hit["title"], chunks=[]
+                    )
+                # Add chunk to document
+                chunk = Chunk(
+                    content=hit["content"],
+                    similarity=hit["score"],
+                    embedding=hit.get("embedding"),
                 )
+                documents[doc_id].chunks.append(chunk)
 
-                documents = {}
-
-                for doc, score in search_results:
-                    metadata = doc.metadata or {}
-                    doc_id = metadata.get(self.id_field, "")
-                    title = metadata.get(self.title_field, "")
-                    url = metadata.get(self.url_field, "")
-                    content = doc.page_content
-
-                    # Skip if resource filtering is requested and this doc is not in the list
-                    if resources:
-                        doc_in_resources = False
-                        for resource in resources:
-                            if (url and url in resource.uri) or doc_id in resource.uri:
-                                doc_in_resources = True
-                                break
-                        if not doc_in_resources:
-                            continue
-
-                    # Create or update document
-                    if doc_id not in documents:
-                        documents[doc_id] = Document(
-                            id=doc_id, url=url, title=title, chunks=[]
-                        )
-
-                    # Add chunk to document
-                    chunk = Chunk(content=content, similarity=score)
-                    documents[doc_id].chunks.append(chunk)
-
-                return list(documents.values())
+            return list(documents.values())
 
         except Exception as e:
             raise RuntimeError(f"Failed to query documents from Milvus: {str(e)}")
@@ -659,7 +1060,7 @@ class MilvusRetriever(Retriever):
     def create_collection(self) -> None:
         """Public hook ensuring collection exists (explicit initialization)."""
         if not self.client:
-            self._connect()
+            self.connect()
         else:
             # If we're using Milvus Lite, ensure collection exists
             if self._is_milvus_lite():
@@ -672,7 +1073,7 @@ class MilvusRetriever(Retriever):
             force_reload: If True existing example documents are deleted first.
         """
         if not self.client:
-            self._connect()
+            self.connect()
 
         if force_reload:
             # Clear existing examples
@@ -696,9 +1097,7 @@ class MilvusRetriever(Retriever):
 
                 if results:
                     doc_ids = [result[self.id_field] for result in results]
-                    self.client.delete(
-                        collection_name=self.collection_name, ids=doc_ids
-                    )
+                    self.delete_chunks(doc_ids)
                     logger.info("Cleared %d existing example documents", len(doc_ids))
             else:
                 # For LangChain Milvus, we can't easily delete by metadata
@@ -713,7 +1112,7 @@ class MilvusRetriever(Retriever):
         """Return metadata for previously ingested example documents."""
         try:
             if not self.client:
-                self._connect()
+                self.connect()
 
             if self._is_milvus_lite():
                 results = self.client.query(
@@ -781,5 +1180,8 @@ def load_examples() -> None:
     auto_load_examples = get_bool_env("MILVUS_AUTO_LOAD_EXAMPLES", False)
     rag_provider = get_str_env("RAG_PROVIDER", "")
     if rag_provider == "milvus" and auto_load_examples:
-        provider = MilvusProvider()
+        # Imported lazily: the builder module imports this one.
+        from src.rag.builder import retriever_registry
+
+        provider = retriever_registry.get(rag_provider)
         provider.load_examples()
@@ -0,0 +1,182 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Diversity-aware packing of retrieved chunks into a token budget.
+
+Chunks are first ordered by Maximal Marginal Relevance (MMR): each pick
+maximizes ``lambda * relevance - (1 - lambda) * redundancy`` where redundancy
+is the highest cosine similarity to an already picked chunk. Chunk embeddings
+are used when the provider returns them, hashed term vectors otherwise.
+
+The MMR gains then drive a greedy knapsack: chunks are added in order of gain
+per token until the budget is spent, and a chunk that does not fit is cut
+back to its leading whole sentences instead of mid-sentence.
+"""
+
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.rag.chunker import get_token_counter, split_sentences
+from src.rag.hybrid import tokenize
+from src.rag.retriever import Document
+
+# Dimensionality of the hashed term vectors used without embeddings.
+_HASH_DIM = 4096
+# Chunks at least this similar to a picked one are treated as duplicates.
+_DUPLICATE_SIMILARITY = 0.95
+
+
+@dataclass
+class PackedChunk:
+    document: Document
+    content: str
+    relevance: float
+    tokens: int
+
+
+def hashed_term_vectors(texts: Sequence[str]) -> np.ndarray:
+    """Bag-of-terms vectors hashed into a fixed number of dimensions."""
+    vectors = np.zeros((len(texts), _HASH_DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for term in tokenize(text):
+            vectors[i, zlib.crc32(term.encode("utf-8")) % _HASH_DIM] += 1.0
+    return vectors
+
+
+def _unit_vectors(
+    texts: Sequence[str], embeddings: Sequence[Optional[Sequence[float]]]
+) -> np.ndarray:
+    dims = {len(e) if e is not None else 0 for e in embeddings}
+    if len(dims) == 1 and 0 not in dims:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+    else:
+        # Mixed or missing embeddings (e.g. keyword-only hits): compare text.
+        vectors = hashed_term_vectors(texts)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def mmr_order(
+    relevance: np.ndarray, vectors: np.ndarray, lambda_mult: float = 0.7
+) -> List[tuple]:
+    """Return ``(index, gain, redundancy)`` for every item in MMR order.
+
+    Args:
+        relevance: Relevance scores normalized to ``[0, 1]``.
+        vectors: Unit-norm item vectors.
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+    """
+    n = len(relevance)
+    similarity = vectors @ vectors.T
+    redundancy = np.zeros(n, dtype=np.float32)
+    picked = np.zeros(n, dtype=bool)
+    order = []
+    for _ in range(n):
+        gains = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        gains[picked] = -np.inf
+        best = int(np.argmax(gains))
+        order.append((best, float(gains[best]), float(redundancy[best])))
+        picked[best] = True
+        redundancy = np.maximum(redundancy, similarity[best])
+    return order
+
+
+def _fit_sentences(text: str, budget: int, count_tokens: Callable[[str], int]) -> tuple:
+    """Longest prefix of whole sentences within ``budget`` tokens."""
+    kept: List[str] = []
+    used = 0
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence)
+        if used + tokens > budget:
+            break
+        kept.append(sentence.strip())
+        used += tokens
+    return " ".join(kept), used
+
+
+def pack_documents(
+    documents: Sequence[Document],
+    max_tokens: int,
+    max_docs: int = 3,
+    max_chunks_per_doc: int = 5,
+    lambda_mult: float = 0.7,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> List[Dict[str, str]]:
+    """Select and trim chunks to ``max_tokens``; returns ``Document.to_dict`` rows.
+
+    Args:
+        documents: Retrieved documents in provider rank order.
+        max_tokens: Total token budget across all returned content.
+        max_docs: Maximum number of documents in the output.
+        max_chunks_per_doc: Candidate chunks considered per document.
+        lambda_mult: MMR relevance/diversity trade-off.
+        count_tokens: Token counter; defaults to ``get_token_counter()``.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    candidates = []
+    for rank, doc in enumerate(documents):
+        chunks = sorted(
+            (c for c in doc.chunks if getattr(c, "content", None)),
+            key=lambda c: getattr(c, "similarity", 0.0) or 0.0,
+            reverse=True,
+        )
+        candidates.extend((rank, doc, c) for c in chunks[:max_chunks_per_doc])
+    if not candidates:
+        return []
+
+    scores = np.array(
+        [getattr(c, "similarity", 0.0) or 0.0 for _, _, c in candidates],
+        dtype=np.float32,
+    )
+    spread = scores.max() - scores.min()
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+    vectors = _unit_vectors(
+        [c.content for _, _, c in candidates],
+        [getattr(c, "embedding", None) for _, _, c in candidates],
+    )
+
+    items = []
+    for index, gain, redundancy in mmr_order(relevance, vectors, lambda_mult):
+        if redundancy >= _DUPLICATE_SIMILARITY:
+            continue
+        rank, doc, chunk = candidates[index]
+        tokens = max(count_tokens(chunk.content), 1)
+        # Small floor keeps zero-gain chunks as filler after the useful ones.
+        items.append((max(gain, 1e-6) / tokens, rank, doc, chunk, tokens, index))
+
+    packed: Dict[int, List[PackedChunk]] = {}
+    remaining = max_tokens
+    for _, rank, doc, chunk, tokens, index in sorted(
+        items, key=lambda item: item[0], reverse=True
+    ):
+        if remaining <= 0:
+            break
+        if rank not in packed and len(packed) >= max_docs:
+            continue
+        content = chunk.content
+        if tokens > remaining:
+            content, tokens = _fit_sentences(content, remaining, count_tokens)
+            if not content:
+                continue
+        remaining -= tokens
+        packed.setdefault(rank, []).append(
+            PackedChunk(doc, content, float(relevance[index]), tokens)
+        )
+
+    results = []
+    for rank in sorted(packed):
+        chunks = sorted(packed[rank], key=lambda p: p.relevance, reverse=True)
+        doc = chunks[0].document
+        results.append(
+            {
+                "id": doc.id,
+                **({"url": doc.url} if doc.url else {}),
+                **({"title": doc.title} if doc.title else {}),
+                "content": "\n\n".join(p.content for p in chunks),
+            }
+        )
+    return results
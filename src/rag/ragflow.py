@@ -5,8 +5,7 @@ import os
 from typing import List, Optional
 from urllib.parse import urlparse
 
-import requests
-
+from src.rag.http_client import arequest, request
 from src.rag.retriever import Chunk, Document, Resource, Retriever
 
 
@@ -18,7 +17,9 @@ class RAGFlowProvider(Retriever):
     api_url: str
     api_key: str
     page_size: int = 10
+    dataset_page_size: int = 100
     cross_languages: Optional[List[str]] = None
+    timeout: int = 30
 
     def __init__(self):
         api_url = os.getenv("RAGFLOW_API_URL")
@@ -40,14 +41,17 @@ class RAGFlowProvider(Retriever):
         if cross_languages:
             self.cross_languages = cross_languages.split(",")
 
-    def query_relevant_documents(
-        self, query: str, resources: list[Resource] = []
-    ) -> list[Document]:
-        headers = {
+        timeout = os.getenv("RAGFLOW_TIMEOUT")
+        if timeout:
+            self.timeout = int(timeout)
+
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
+    def _retrieval_payload(self, query: str, resources: list[Resource]) -> dict:
         dataset_ids: list[str] = []
         document_ids: list[str] = []
 
@@ -66,11 +70,33 @@ class RAGFlowProvider(Retriever):
 
         if self.cross_languages:
             payload["cross_languages"] = self.cross_languages
+        return payload
 
-        response = requests.post(
-            f"{self.api_url}/api/v1/retrieval", headers=headers, json=payload
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        response = request(
+            "POST",
+            f"{self.api_url}/api/v1/retrieval",
+            headers=self._headers(),
+            json=self._retrieval_payload(query, resources),
+            timeout=self.timeout,
+        )
+        return self._parse_documents(response)
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        response = await arequest(
+            "POST",
+            f"{self.api_url}/api/v1/retrieval",
+            headers=self._headers(),
+            json=self._retrieval_payload(query, resources),
+            timeout=self.timeout,
         )
+        return self._parse_documents(response)
 
+    def _parse_documents(self, response) -> list[Document]:
         if response.status_code != 200:
             raise Exception(f"Failed to query documents: {response.text}")
 
@@ -99,34 +125,37 @@ class RAGFlowProvider(Retriever):
         return list(docs.values())
 
     def list_resources(self, query: str | None = None) -> list[Resource]:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        params = {}
+        params = {"page_size": self.dataset_page_size}
         if query:
             params["name"] = query
 
-        response = requests.get(
-            f"{self.api_url}/api/v1/datasets", headers=headers, params=params
-        )
-
-        if response.status_code != 200:
-            raise Exception(f"Failed to list resources: {response.text}")
-
-        result = response.json()
         resources = []
-
-        for item in result.get("data", []):
-            item = Resource(
-                uri=f"rag://dataset/{item.get('id')}",
-                title=item.get("name", ""),
-                description=item.get("description", ""),
+        # Without a name filter every dataset is listed, one page at a time.
+        page = 1
+        while True:
+            response = request(
+                "GET",
+                f"{self.api_url}/api/v1/datasets",
+                headers=self._headers(),
+                params={**params, "page": page},
+                timeout=self.timeout,
             )
-            resources.append(item)
 
-        return resources
+            if response.status_code != 200:
+                raise Exception(f"Failed to list resources: {response.text}")
+
+            items = response.json().get("data") or []
+            for item in items:
+                resources.append(
+                    Resource(
+                        uri=f"rag://dataset/{item.get('id')}",
+                        title=item.get("name", ""),
+                        description=item.get("description", ""),
+                    )
+                )
+            if len(items) < self.dataset_page_size:
+                return resources
+            page += 1
 
 
 def parse_uri(uri: str) -> tuple[str, str]:
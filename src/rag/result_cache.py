@@ -0,0 +1,284 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Semantic cache of retrieval results shared across sessions.
+
+``CachedRetriever`` wraps any ``Retriever``. Results are keyed by the query
+embedding and the exact set of requested resources: a query whose embedding
+is at least ``threshold`` cosine-similar to a cached query over the same
+resources is served from the cache. Entries expire after ``ttl`` seconds, the
+cache holds at most ``max_entries`` results (LRU), and every ingestion run
+invalidates all caches in the process through ``invalidate_result_caches``.
+
+Query embeddings come from the provider when it computes them itself (Milvus
+and the embedded store, whose embedding caches then serve the actual search);
+other providers are compared by hashed term vectors, which only matches
+rephrasings that use the same words.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+from src.config.loader import get_bool_env, get_int_env, get_str_env
+from src.rag.embedding_cache import normalize_query
+from src.rag.packing import hashed_term_vectors
+from src.rag.retriever import Document, Resource, Retriever
+
+logger = logging.getLogger(__name__)
+
+# Every live cache, so ingestion can invalidate them without a reference.
+_caches: "weakref.WeakSet[SemanticResultCache]" = weakref.WeakSet()
+
+
+def resource_key(resources: Optional[Sequence[Resource]]) -> tuple:
+    """Order-independent key of the requested resource set."""
+    return tuple(sorted({r.uri for r in resources or []}))
+
+
+@dataclass
+class _Entry:
+    resource_key: tuple
+    vector: np.ndarray
+    documents: List[Document]
+    expires_at: float
+
+
+class SemanticResultCache:
+    """TTL + LRU cache of retrieval results with similarity lookups.
+
+    Args:
+        threshold: Minimum cosine similarity between query embeddings for a hit.
+        ttl: Seconds an entry stays valid.
+        max_entries: Maximum number of cached results.
+        clock: Time source, monotonic seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl: float = 600.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 0)
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on invalidation; results computed before it are not stored.
+        self.generation = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        _caches.add(self)
+
+    def get(
+        self,
+        query: str,
+        resources: tuple,
+        embed: Callable[[str], Sequence[float]],
+    ) -> tuple:
+        """Look up ``query`` over ``resources``.
+
+        Returns:
+            ``(documents, vector)``: the cached documents or None, and the
+            query's unit vector (None if it was not needed) for ``put``.
+        """
+        query = normalize_query(query)
+        with self._lock:
+            self._expire()
+            entry = self._entries.get((resources, query))
+            if entry is not None:
+                self._entries.move_to_end((resources, query))
+                self.hits += 1
+                return list(entry.documents), entry.vector
+            candidates = [
+                (key, e) for key, e in self._entries.items() if key[0] == resources
+            ]
+        vector = _unit(embed(query))
+        with self._lock:
+            if candidates:
+                similarity = np.stack([e.vector for _, e in candidates]) @ vector
+                best = int(np.argmax(similarity))
+                key = candidates[best][0]
+                if similarity[best] >= self.threshold and key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return list(self._entries[key].documents), vector
+            self.misses += 1
+        return None, vector
+
+    def put(
+        self,
+        query: str,
+        resources: tuple,
+        vector: np.ndarray,
+        documents: List[Document],
+        generation: int,
+    ) -> None:
+        """Store results computed while ``generation`` was current."""
+        if self.max_entries == 0 or not documents:
+            return
+        key = (resources, normalize_query(query))
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = _Entry(
+                resources, vector, list(documents), self._clock() + self.ttl
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _expire(self) -> None:
+        now = self._clock()
+        expired = [key for key, e in self._entries.items() if e.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+
+    def invalidate(self) -> None:
+        """Drop every entry and ignore results of queries still in flight."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+
+def _unit(vector: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def _hashed_embedding(text: str) -> np.ndarray:
+    return hashed_term_vectors([text])[0]
+
+
+def invalidate_result_caches() -> None:
+    """Invalidate every result cache in the process (called after ingestion)."""
+    for cache in list(_caches):
+        cache.invalidate()
+
+
+class CachedRetriever(Retriever):
+    """Retriever wrapper serving repeated and near-duplicate queries from a cache.
+
+    Other attributes (e.g. provider-specific query methods) are delegated to
+    the wrapped retriever.
+    """
+
+    def __init__(self, retriever: Retriever, cache: SemanticResultCache):
+        self.retriever = retriever
+        self.cache = cache
+        # Prefer the provider's own (cached) query embedding.
+        self._embed = (
+            getattr(retriever, "_get_embedding", None)
+            or getattr(retriever, "_embed_query", None)
+            or _hashed_embedding
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "retriever":
+            raise AttributeError(name)
+        return getattr(self.retriever, name)
+
+    def list_resources(self, query: str | None = None) -> list[Resource]:
+        return self.retriever.list_resources(query)
+
+    def query_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        key = resource_key(resources)
+        generation = self.cache.generation
+        try:
+            documents, vector = self.cache.get(query, key, self._embed)
+        except Exception as e:
+            logger.warning("Result cache lookup failed, querying provider: %s", e)
+            return self.retriever.query_relevant_documents(query, resources)
+        if documents is not None:
+            logger.debug("Result cache hit for query: %s", query)
+            return documents
+        documents = self.retriever.query_relevant_documents(query, resources)
+        self.cache.put(query, key, vector, documents, generation)
+        return documents
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        key = resource_key(resources)
+        generation = self.cache.generation
+        try:
+            # The lookup may embed the query through the provider.
+            documents, vector = await asyncio.to_thread(
+                self.cache.get, query, key, self._embed
+            )
+        except Exception as e:
+            logger.warning("Result cache lookup failed, querying provider: %s", e)
+            return await self.retriever.aquery_relevant_documents(query, resources)
+        if documents is not None:
+            logger.debug("Result cache hit for query: %s", query)
+            return documents
+        documents = await self.retriever.aquery_relevant_documents(query, resources)
+        self.cache.put(query, key, vector, documents, generation)
+        return documents
+
+    def connect(self) -> None:
+        self.retriever.connect()
+
+    def close(self) -> None:
+        self.retriever.close()
+
+    def health_check(self) -> bool:
+        return self.retriever.health_check()
+
+
+def unwrap_retriever(retriever: Optional[Retriever]) -> Optional[Retriever]:
+    """Return the provider behind a ``CachedRetriever`` (or ``retriever`` itself)."""
+    while isinstance(retriever, CachedRetriever):
+        retriever = retriever.retriever
+    return retriever
+
+
+def with_result_cache(retriever: Retriever) -> Retriever:
+    """Wrap ``retriever`` in a semantic result cache when RAG_RESULT_CACHE is set."""
+    if not get_bool_env("RAG_RESULT_CACHE", False):
+        return retriever
+    try:
+        threshold = float(get_str_env("RAG_RESULT_CACHE_THRESHOLD", "0.95"))
+    except ValueError:
+        threshold = 0.95
+    cache = SemanticResultCache(
+        threshold=threshold,
+        ttl=get_int_env("RAG_RESULT_CACHE_TTL", 600),
+        max_entries=get_int_env("RAG_RESULT_CACHE_MAX_ENTRIES", 512),
+    )
+    return CachedRetriever(retriever, cache)
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import abc
+import asyncio
 
 from pydantic import BaseModel, Field
 
@@ -9,10 +10,17 @@ from pydantic import BaseModel, Field
 class Chunk:
     content: str
     similarity: float
+    embedding: list[float] | None = None
 
-    def __init__(self, content: str, similarity: float):
+    def __init__(
+        self,
+        content: str,
+        similarity: float,
+        embedding: list[float] | None = None,
+    ):
         self.content = content
         self.similarity = similarity
+        self.embedding = embedding
 
 
 class Document:
@@ -79,3 +87,32 @@ class Retriever(abc.ABC):
         Query relevant documents from the resources.
         """
         pass
+
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        Async variant of ``query_relevant_documents``. Providers with a native
+        async client override it; the default runs the sync method in a thread
+        so the event loop is never blocked.
+        """
+        return await asyncio.to_thread(self.query_relevant_documents, query, resources)
+
+    def connect(self) -> None:
+        """
+        Eagerly establish connections held by the provider. Optional; providers
+        that connect lazily or are stateless can keep the default no-op.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Release connections and other resources held by the provider.
+        """
+        pass
+
+    def health_check(self) -> bool:
+        """
+        Return True if the provider is able to serve requests.
+        """
+        return True
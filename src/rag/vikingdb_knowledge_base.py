@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -9,8 +10,7 @@ import urllib.parse
 from datetime import datetime
 from urllib.parse import urlparse
 
-import requests
-
+from src.rag.http_client import arequest, request
 from src.rag.retriever import Chunk, Document, Resource, Retriever
 
 
@@ -50,6 +50,9 @@ class VikingDBKnowledgeBaseProvider(Retriever):
         region = os.getenv("VIKINGDB_KNOWLEDGE_BASE_REGION", "cn-north-1")
         self.region = region
 
+        # 签名密钥只随日期变化，按 (sk, date, region, service) 缓存当天的派生结果
+        self._signed_key_cache: tuple[tuple, bytes] | None = None
+
     def _hmac_sha256(self, key: bytes, content: str) -> bytes:
         return hmac.new(key, content.encode("utf-8"), hashlib.sha256).digest()
 
@@ -59,10 +62,15 @@ class VikingDBKnowledgeBaseProvider(Retriever):
     def _get_signed_key(
         self, secret_key: str, date: str, region: str, service: str
     ) -> bytes:
+        cache_key = (secret_key, date, region, service)
+        cached = self._signed_key_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
         k_date = self._hmac_sha256(secret_key.encode("utf-8"), date)
         k_region = self._hmac_sha256(k_date, region)
         k_service = self._hmac_sha256(k_region, service)
         k_signing = self._hmac_sha256(k_service, "request")
+        self._signed_key_cache = (cache_key, k_signing)
         return k_signing
 
     def _create_canonical_request(
@@ -151,9 +159,9 @@ class VikingDBKnowledgeBaseProvider(Retriever):
 
         return headers
 
-    def _make_signed_request(
+    def _signed_request_args(
         self, method: str, path: str, params: dict = None, data: dict = None
-    ):
+    ) -> tuple[str, dict, dict, bytes]:
         if data is None:
             payload = b""
         else:
@@ -165,11 +173,19 @@ class VikingDBKnowledgeBaseProvider(Retriever):
         url = f"https://{self.api_url}{path}"
         headers = {}
         signed_headers = self._create_signature(method, path, params, headers, payload)
+        return url, signed_headers, params, payload
+
+    def _make_signed_request(
+        self, method: str, path: str, params: dict = None, data: dict = None
+    ):
+        url, headers, params, payload = self._signed_request_args(
+            method, path, params, data
+        )
         try:
-            response = requests.request(
+            response = request(
                 method=method,
                 url=url,
-                headers=signed_headers,
+                headers=headers,
                 params=params,
                 data=payload if payload else None,
                 timeout=30,
@@ -178,6 +194,84 @@ class VikingDBKnowledgeBaseProvider(Retriever):
         except Exception as e:
             raise ValueError(f"Request failed: {e}")
 
+    async def _amake_signed_request(
+        self, method: str, path: str, params: dict = None, data: dict = None
+    ):
+        url, headers, params, payload = self._signed_request_args(
+            method, path, params, data
+        )
+        try:
+            return await arequest(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                content=payload if payload else None,
+                timeout=30,
+            )
+        except Exception as e:
+            raise ValueError(f"Request failed: {e}")
+
+    def _search_params(self, query: str, resource: Resource) -> dict:
+        resource_id, document_id = parse_uri(resource.uri)
+        request_params = {
+            "resource_id": resource_id,
+            "query": query,
+            "limit": self.retrieval_size,
+            "dense_weight": 0.5,
+            "pre_processing": {
+                "need_instruction": True,
+                "rewrite": False,
+                "return_token_usage": True,
+            },
+            "post_processing": {
+                "rerank_switch": True,
+                "chunk_diffusion_count": 0,
+                "chunk_group": True,
+                "get_attachment_link": True,
+            },
+        }
+        if document_id:
+            doc_filter = {"op": "must", "field": "doc_id", "conds": [document_id]}
+            query_param = {"doc_filter": doc_filter}
+            request_params["query_param"] = query_param
+        return request_params
+
+    def _collect_documents(self, response, all_documents: dict) -> None:
+        try:
+            response_data = response.json()
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON response: {e}")
+
+        if response_data["code"] != 0:
+            raise ValueError(
+                f"Failed to query documents from resource: {response_data['message']}"
+            )
+
+        rsp_data = response_data.get("data", {})
+
+        if "result_list" not in rsp_data:
+            return
+
+        result_list = rsp_data["result_list"]
+
+        for item in result_list:
+            doc_info = item.get("doc_info", {})
+            doc_id = doc_info.get("doc_id")
+
+            if not doc_id:
+                continue
+
+            if doc_id not in all_documents:
+                all_documents[doc_id] = Document(
+                    id=doc_id, title=doc_info.get("doc_name"), chunks=[]
+                )
+
+            chunk = Chunk(
+                content=item.get("content", ""), similarity=item.get("score", 0.0)
+            )
+            all_documents[doc_id].chunks.append(chunk)
+
     def query_relevant_documents(
         self, query: str, resources: list[Resource] = []
     ) -> list[Document]:
@@ -188,71 +282,37 @@ class VikingDBKnowledgeBaseProvider(Retriever):
             return []
 
         all_documents = {}
+        path = "/api/knowledge/collection/search_knowledge"
         for resource in resources:
-            resource_id, document_id = parse_uri(resource.uri)
-            request_params = {
-                "resource_id": resource_id,
-                "query": query,
-                "limit": self.retrieval_size,
-                "dense_weight": 0.5,
-                "pre_processing": {
-                    "need_instruction": True,
-                    "rewrite": False,
-                    "return_token_usage": True,
-                },
-                "post_processing": {
-                    "rerank_switch": True,
-                    "chunk_diffusion_count": 0,
-                    "chunk_group": True,
-                    "get_attachment_link": True,
-                },
-            }
-            if document_id:
-                doc_filter = {"op": "must", "field": "doc_id", "conds": [document_id]}
-                query_param = {"doc_filter": doc_filter}
-                request_params["query_param"] = query_param
-
-            path = "/api/knowledge/collection/search_knowledge"
-
             # 使用新的签名请求方法
             response = self._make_signed_request(
-                method="POST", path=path, data=request_params
+                method="POST", path=path, data=self._search_params(query, resource)
             )
+            self._collect_documents(response, all_documents)
 
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Failed to parse JSON response: {e}")
-
-            if response_data["code"] != 0:
-                raise ValueError(
-                    f"Failed to query documents from resource: {response_data['message']}"
-                )
-
-            rsp_data = response_data.get("data", {})
-
-            if "result_list" not in rsp_data:
-                continue
-
-            result_list = rsp_data["result_list"]
-
-            for item in result_list:
-                doc_info = item.get("doc_info", {})
-                doc_id = doc_info.get("doc_id")
-
-                if not doc_id:
-                    continue
+        return list(all_documents.values())
 
-                if doc_id not in all_documents:
-                    all_documents[doc_id] = Document(
-                        id=doc_id, title=doc_info.get("doc_name"), chunks=[]
-                    )
+    async def aquery_relevant_documents(
+        self, query: str, resources: list[Resource] = []
+    ) -> list[Document]:
+        """
+        Query all resources concurrently; results keep the order of ``resources``
+        """
+        if not resources:
+            return []
 
-                chunk = Chunk(
-                    content=item.get("content", ""), similarity=item.get("score", 0.0)
+        path = "/api/knowledge/collection/search_knowledge"
+        responses = await asyncio.gather(
+            *(
+                self._amake_signed_request(
+                    method="POST", path=path, data=self._search_params(query, resource)
                 )
-                all_documents[doc_id].chunks.append(chunk)
-
+                for resource in resources
+            )
+        )
+        all_documents = {}
+        for response in responses:
+            self._collect_documents(response, all_documents)
         return list(all_documents.values())
 
     def list_resources(self, query: str | None = None) -> list[Resource]:
@@ -1,13 +1,16 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
+import os
+from contextlib import asynccontextmanager
 from typing import Annotated, Any, List, cast
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, BaseMessage, ToolMessage
@@ -27,8 +30,12 @@ from src.podcast.graph.builder import build_graph as build_podcast_graph
 from src.ppt.graph.builder import build_graph as build_ppt_graph
 from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhancer_graph
 from src.prose.graph.builder import build_graph as build_prose_graph
-from src.rag.builder import build_retriever
+from src.rag.builder import build_retriever, retriever_registry
+from src.rag.catalog import resource_catalog
+from src.rag.http_client import aclose_clients
+from src.rag.ingestion import INGESTIBLE_PROVIDERS, DocumentIngestor, ingestion_jobs
 from src.rag.milvus import load_examples
+from src.rag.result_cache import CachedRetriever, unwrap_retriever
 from src.rag.retriever import Resource
 from src.server.chat_request import (
     ChatRequest,
@@ -42,7 +49,9 @@ from src.server.config_request import ConfigResponse
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
 from src.server.mcp_utils import load_mcp_tools
 from src.server.rag_request import (
+    RAGCacheStatsResponse,
     RAGConfigResponse,
+    RAGIngestJobResponse,
     RAGResourceRequest,
     RAGResourcesResponse,
 )
@@ -54,10 +63,28 @@ logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect the shared RAG retriever once and release it on shutdown
+    retriever_registry.startup()
+    try:
+        resource_catalog.warm(build_retriever())
+    except Exception as e:
+        logger.warning(f"Failed to warm the RAG resource catalog: {e}")
+    try:
+        yield
+    finally:
+        retriever_registry.shutdown()
+        resource_catalog.clear()
+        await aclose_clients()
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -624,10 +651,79 @@ async def rag_resources(request: Annotated[RAGResourceRequest, Query()]):
     """Get the resources of the RAG."""
     retriever = build_retriever()
     if retriever:
-        return RAGResourcesResponse(resources=retriever.list_resources(request.query))
+        # Served from the in-memory catalog, refreshed in the background; the
+        # first lookup loads it from the provider, off the event loop.
+        resources = await asyncio.to_thread(
+            resource_catalog.search, retriever, request.query
+        )
+        return RAGResourcesResponse(resources=resources)
     return RAGResourcesResponse(resources=[])
 
 
+@app.get("/api/rag/cache", response_model=RAGCacheStatsResponse)
+async def rag_cache_stats():
+    """Get the metrics of the shared RAG result cache."""
+    retriever = build_retriever()
+    if isinstance(retriever, CachedRetriever):
+        return RAGCacheStatsResponse(enabled=True, **retriever.cache.stats())
+    return RAGCacheStatsResponse(enabled=False)
+
+
+@app.post("/api/rag/ingest", response_model=RAGIngestJobResponse)
+async def rag_ingest(
+    paths: Annotated[list[str], Form()] = [],
+    files: Annotated[list[UploadFile], File()] = [],
+    prune: Annotated[bool, Form()] = False,
+):
+    """Start a background job that incrementally ingests documents."""
+    if not get_bool_env("ENABLE_RAG_INGEST", False):
+        raise HTTPException(
+            status_code=403,
+            detail="RAG ingestion is disabled. Set ENABLE_RAG_INGEST=true to enable it.",
+        )
+    retriever = unwrap_retriever(build_retriever())
+    if not isinstance(retriever, INGESTIBLE_PROVIDERS):
+        raise HTTPException(
+            status_code=400,
+            detail="Ingestion is only supported for the milvus and embedded RAG providers",
+        )
+    if not paths and not files:
+        raise HTTPException(status_code=400, detail="No paths or files provided")
+
+    # Directories are read from the server's disk, so confine them to a root.
+    ingest_root = os.path.realpath(get_str_env("RAG_INGEST_ROOT", "."))
+    directories = []
+    for path in paths:
+        resolved = os.path.realpath(os.path.join(ingest_root, path))
+        if os.path.commonpath([ingest_root, resolved]) != ingest_root:
+            raise HTTPException(
+                status_code=400, detail=f"Path is outside RAG_INGEST_ROOT: {path}"
+            )
+        if not os.path.isdir(resolved):
+            raise HTTPException(status_code=400, detail=f"Not a directory: {path}")
+        directories.append(resolved)
+    uploads = [(f.filename or "upload.txt", await f.read()) for f in files]
+
+    def run(job):
+        ingestor = DocumentIngestor(retriever, root=ingest_root)
+        for directory in directories:
+            ingestor.ingest_directory(directory, prune=prune, job=job)
+        if uploads:
+            ingestor.ingest_files(uploads, job=job)
+
+    job = ingestion_jobs.submit(run)
+    return RAGIngestJobResponse(**job.to_dict())
+
+
+@app.get("/api/rag/ingest/{job_id}", response_model=RAGIngestJobResponse)
+async def rag_ingest_status(job_id: str):
+    """Get the progress of an ingestion job."""
+    job = ingestion_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return RAGIngestJobResponse(**job.to_dict())
+
+
 @app.get("/api/config", response_model=ConfigResponse)
 async def config():
     """Get the config of the server."""
@@ -26,3 +26,38 @@ class RAGResourcesResponse(BaseModel):
     """Response model for RAG resources."""
 
     resources: list[Resource] = Field(..., description="The resources of the RAG")
+
+
+class RAGIngestJobResponse(BaseModel):
+    """Response model for a RAG ingestion job."""
+
+    id: str = Field(..., description="The id of the ingestion job")
+    status: str = Field(
+        ..., description="The status of the job: pending, running, completed or failed"
+    )
+    documents_total: int = Field(0, description="Documents scheduled for ingestion")
+    documents_processed: int = Field(0, description="Documents read and chunked")
+    documents_failed: int = Field(0, description="Documents that could not be read")
+    documents_deleted: int = Field(0, description="Removed documents deleted")
+    chunks_added: int = Field(0, description="New or changed chunks inserted")
+    chunks_unchanged: int = Field(0, description="Chunks skipped as unchanged")
+    chunks_deleted: int = Field(0, description="Stale chunks deleted")
+    chunks_failed: int = Field(0, description="Chunks that failed to embed or insert")
+    error: str | None = Field(None, description="The error if the job failed")
+    created_at: float = Field(..., description="Creation time (unix seconds)")
+    started_at: float | None = Field(None, description="Start time (unix seconds)")
+    finished_at: float | None = Field(None, description="Finish time (unix seconds)")
+
+
+class RAGCacheStatsResponse(BaseModel):
+    """Response model for the RAG result cache metrics."""
+
+    enabled: bool = Field(..., description="Whether RAG_RESULT_CACHE is enabled")
+    hits: int = Field(0, description="Queries served from the cache")
+    semantic_hits: int = Field(0, description="Hits on a similar, not identical, query")
+    misses: int = Field(0, description="Queries sent to the provider")
+    hit_rate: float = Field(0.0, description="hits / (hits + misses)")
+    evictions: int = Field(0, description="Entries evicted by the size bound")
+    expirations: int = Field(0, description="Entries dropped after their TTL")
+    invalidations: int = Field(0, description="Cache flushes caused by ingestion")
+    size: int = Field(0, description="Cached results")
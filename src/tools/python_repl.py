@@ -6,9 +6,9 @@ import os
 from typing import Annotated, Optional
 
 from langchain_core.tools import tool
-from langchain_experimental.utilities import PythonREPL
 
 from .decorators import log_io
+from .python_repl_pool import PythonREPLPool, create_python_repl_pool
 
 
 def _is_python_repl_enabled() -> bool:
@@ -20,8 +20,10 @@ def _is_python_repl_enabled() -> bool:
     return False
 
 
-# Initialize REPL and logger
-repl: Optional[PythonREPL] = PythonREPL() if _is_python_repl_enabled() else None
+# Initialize REPL pool and logger. Workers are spawned lazily on first use.
+repl: Optional[PythonREPLPool] = (
+    create_python_repl_pool() if _is_python_repl_enabled() else None
+)
 logger = logging.getLogger(__name__)
 
 
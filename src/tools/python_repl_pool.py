@@ -0,0 +1,368 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import atexit
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from langchain_core.runnables.config import ensure_config
+
+from src.config.loader import get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SCRIPT = Path(__file__).with_name("python_repl_worker.py")
+_DEFAULT_SESSION = "default"
+
+
+class _Worker:
+    """A single pre-warmed interpreter subprocess."""
+
+    def __init__(self, preload: list[str], memory_limit_mb: int):
+        env = os.environ.copy()
+        env["PYTHON_REPL_WORKER_PRELOAD"] = ",".join(preload)
+        env["PYTHON_REPL_WORKER_MEMORY_MB"] = str(memory_limit_mb)
+        env["PYTHONUNBUFFERED"] = "1"
+        self.process = subprocess.Popen(
+            [sys.executable, str(_WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            env=env,
+        )
+        self.executions = 0
+        self.ready = False
+        self._lines: queue.Queue = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+    def _read_stdout(self) -> None:
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_message(self, timeout: float) -> dict:
+        line = self._lines.get(timeout=timeout)
+        if line is None:
+            raise RuntimeError("Python worker exited unexpectedly")
+        return json.loads(line)
+
+    def wait_ready(self, timeout: float) -> None:
+        if self.ready:
+            return
+        message = self._read_message(timeout)
+        if not message.get("ready"):
+            raise RuntimeError("Python worker failed to start")
+        self.ready = True
+
+    def execute(self, code: str, timeout: float) -> str:
+        self.process.stdin.write(json.dumps({"code": code}) + "\n")
+        self.process.stdin.flush()
+        self.executions += 1
+        return self._read_message(timeout).get("output", "")
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self) -> None:
+        if self.alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:  # pragma: no cover - best effort
+            pass
+
+
+class _SessionLock:
+    """Serializes the calls of one session; ``users`` counts holders and waiters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class PythonREPLPool:
+    """Pool of sandboxed, pre-warmed Python interpreters.
+
+    Each session (one per graph thread) is bound to its own subprocess so
+    concurrent coder steps neither share globals nor block the API process.
+    Calls are bounded by a wall-clock timeout and an address-space limit, and
+    a worker is recycled after ``max_executions`` runs. A small number of idle
+    workers is kept warm with ``preload`` modules already imported so new
+    sessions start without paying the import cost; idle workers count
+    against ``max_workers`` like session workers do.
+
+    Environment variables (selected):
+        PYTHON_REPL_MAX_WORKERS: Upper bound on live interpreters (default: CPU count).
+        PYTHON_REPL_WARM_WORKERS: Idle interpreters kept ready (default: 2).
+        PYTHON_REPL_TIMEOUT: Per-call wall-clock limit in seconds (default: 60).
+        PYTHON_REPL_MEMORY_LIMIT_MB: Address-space limit per worker, 0 disables (default: 2048).
+        PYTHON_REPL_MAX_EXECUTIONS: Executions before a worker is recycled (default: 50).
+        PYTHON_REPL_PRELOAD: Comma separated modules imported on warm-up (default: numpy,pandas).
+        PYTHON_REPL_ACQUIRE_TIMEOUT: Seconds a new session waits for a free worker (default: 60).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        warm_workers: int = 2,
+        timeout_seconds: float = 60,
+        memory_limit_mb: int = 2048,
+        max_executions: int = 50,
+        preload: Optional[list[str]] = None,
+        startup_timeout_seconds: float = 60,
+        acquire_timeout_seconds: float = 60,
+    ):
+        self.max_workers = max(max_workers, 1)
+        self.warm_workers = max(min(warm_workers, self.max_workers), 0)
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.max_executions = max(max_executions, 1)
+        self.preload = list(preload) if preload is not None else ["numpy", "pandas"]
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+
+        self._lock = threading.Lock()
+        # Notified whenever a session call ends or a worker slot is freed.
+        self._released = threading.Condition(self._lock)
+        self._idle: list[_Worker] = []
+        # session id -> worker, ordered by last use for LRU eviction
+        self._sessions: "OrderedDict[str, _Worker]" = OrderedDict()
+        # Only sessions with a worker or a call in progress keep a lock.
+        self._session_locks: dict[str, _SessionLock] = {}
+        self._warming = False
+        self._closed = False
+
+    @classmethod
+    def from_env(cls) -> "PythonREPLPool":
+        preload_raw = get_str_env("PYTHON_REPL_PRELOAD", "numpy,pandas")
+        return cls(
+            max_workers=get_int_env("PYTHON_REPL_MAX_WORKERS", os.cpu_count() or 4),
+            warm_workers=get_int_env("PYTHON_REPL_WARM_WORKERS", 2),
+            timeout_seconds=get_int_env("PYTHON_REPL_TIMEOUT", 60),
+            memory_limit_mb=get_int_env("PYTHON_REPL_MEMORY_LIMIT_MB", 2048),
+            max_executions=get_int_env("PYTHON_REPL_MAX_EXECUTIONS", 50),
+            preload=[m.strip() for m in preload_raw.split(",") if m.strip()],
+            acquire_timeout_seconds=get_int_env("PYTHON_REPL_ACQUIRE_TIMEOUT", 60),
+        )
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.preload, self.memory_limit_mb)
+
+    def warm_up(self) -> None:
+        """Top up the idle pool so new sessions get a ready interpreter."""
+        with self._lock:
+            if self._closed:
+                return
+            self._idle = [w for w in self._idle if w.alive()]
+            capacity = self.max_workers - len(self._sessions) - len(self._idle)
+            missing = min(self.warm_workers - len(self._idle), capacity)
+            for _ in range(max(missing, 0)):
+                self._idle.append(self._spawn())
+
+    def _schedule_warm_up(self) -> None:
+        """Refill the idle pool in the background unless a refill is running."""
+        with self._lock:
+            if self._closed or self._warming or len(self._idle) >= self.warm_workers:
+                return
+            self._warming = True
+        threading.Thread(target=self._warm_up_once, daemon=True).start()
+
+    def _warm_up_once(self) -> None:
+        try:
+            self.warm_up()
+        finally:
+            with self._lock:
+                self._warming = False
+
+    @contextmanager
+    def _session_lock(self, session_id: str) -> Iterator[None]:
+        with self._lock:
+            entry = self._session_locks.setdefault(session_id, _SessionLock())
+            entry.users += 1
+        try:
+            with entry.lock:
+                yield
+        finally:
+            with self._lock:
+                entry.users -= 1
+                self._released.notify_all()
+                if (
+                    not entry.users
+                    and session_id not in self._sessions
+                    and self._session_locks.get(session_id) is entry
+                ):
+                    del self._session_locks[session_id]
+
+    def _evict_session(self) -> Optional[_Worker]:
+        # Caller holds the lock. Evict the least recently used session that
+        # is neither running nor waiting to run.
+        for candidate in list(self._sessions):
+            entry = self._session_locks.get(candidate)
+            if entry is None or not entry.users:
+                self._session_locks.pop(candidate, None)
+                return self._sessions.pop(candidate)
+        return None
+
+    def _acquire_worker(self, session_id: str) -> _Worker:
+        retired: list[_Worker] = []
+        try:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Python REPL pool is shut down")
+                worker = self._sessions.get(session_id)
+                if worker and worker.alive():
+                    self._sessions.move_to_end(session_id)
+                    return worker
+                self._sessions.pop(session_id, None)
+
+                deadline = time.monotonic() + self.acquire_timeout_seconds
+                self._idle = [w for w in self._idle if w.alive()]
+                # Live interpreters once this session has one; idle ones count.
+                while len(self._sessions) + max(len(self._idle), 1) > self.max_workers:
+                    if len(self._idle) > 1:
+                        retired.append(self._idle.pop())
+                        continue
+                    evicted = self._evict_session()
+                    if evicted is not None:
+                        retired.append(evicted)
+                        continue
+                    # Every session is mid-call: wait for one to finish.
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"All {self.max_workers} Python workers stayed busy "
+                            f"for {self.acquire_timeout_seconds}s"
+                        )
+                    self._released.wait(remaining)
+                    if self._closed:
+                        raise RuntimeError("Python REPL pool is shut down")
+                    self._idle = [w for w in self._idle if w.alive()]
+
+                worker = self._idle.pop(0) if self._idle else self._spawn()
+                self._sessions[session_id] = worker
+        finally:
+            for old in retired:
+                logger.info("Evicting idle Python REPL worker")
+                old.kill()
+        # The idle pool just lost a worker (or had none): refill it once.
+        self._schedule_warm_up()
+        return worker
+
+    def _release_worker(self, session_id: str, worker: _Worker) -> None:
+        with self._lock:
+            if self._sessions.get(session_id) is worker:
+                self._sessions.pop(session_id)
+                self._released.notify_all()
+        worker.kill()
+        # A slot was freed: let the idle pool use it.
+        self._schedule_warm_up()
+
+    def run(self, code: str, session_id: Optional[str] = None) -> str:
+        """Execute ``code`` in the interpreter bound to ``session_id``.
+
+        Args:
+            code: Python source to execute.
+            session_id: Isolation key; defaults to the current graph thread id.
+
+        Returns:
+            Captured stdout, or the ``repr`` of the raised exception.
+        """
+        session_id = session_id or _current_session_id()
+        with self._session_lock(session_id):
+            worker = self._acquire_worker(session_id)
+            try:
+                worker.wait_ready(self.startup_timeout_seconds)
+            except queue.Empty:
+                self._release_worker(session_id, worker)
+                return repr(
+                    RuntimeError(
+                        "Python worker did not start within "
+                        f"{self.startup_timeout_seconds}s"
+                    )
+                )
+            except Exception as e:
+                self._release_worker(session_id, worker)
+                return repr(RuntimeError(f"Python worker failed to start: {e}"))
+            try:
+                start = time.monotonic()
+                output = worker.execute(code, self.timeout_seconds)
+                logger.debug(
+                    "Python REPL call finished in %.3fs", time.monotonic() - start
+                )
+            except queue.Empty:
+                self._release_worker(session_id, worker)
+                output = repr(
+                    TimeoutError(
+                        f"Execution exceeded the {self.timeout_seconds}s time limit"
+                    )
+                )
+            except Exception as e:
+                self._release_worker(session_id, worker)
+                output = repr(RuntimeError(f"Python worker failed: {e}"))
+            else:
+                if worker.executions >= self.max_executions:
+                    self._release_worker(session_id, worker)
+        return output
+
+    def close_session(self, session_id: str) -> None:
+        """Terminate the interpreter bound to ``session_id`` if any."""
+        with self._lock:
+            worker = self._sessions.pop(session_id, None)
+            self._released.notify_all()
+            entry = self._session_locks.get(session_id)
+            if entry is not None and not entry.users:
+                del self._session_locks[session_id]
+        if worker:
+            worker.kill()
+            self._schedule_warm_up()
+
+    def shutdown(self) -> None:
+        """Terminate every interpreter owned by the pool (idempotent)."""
+        with self._lock:
+            self._closed = True
+            self._released.notify_all()
+            workers = list(self._sessions.values()) + self._idle
+            self._sessions.clear()
+            self._idle = []
+        for worker in workers:
+            worker.kill()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "idle": len(self._idle),
+                "max_workers": self.max_workers,
+            }
+
+
+def _current_session_id() -> str:
+    """Derive the isolation key from the LangGraph run that invoked the tool."""
+    try:
+        config = ensure_config()
+    except Exception:
+        return _DEFAULT_SESSION
+    for section in ("configurable", "metadata"):
+        thread_id = (config.get(section) or {}).get("thread_id")
+        if thread_id:
+            return str(thread_id)
+    return _DEFAULT_SESSION
+
+
+def create_python_repl_pool() -> PythonREPLPool:
+    pool = PythonREPLPool.from_env()
+    atexit.register(pool.shutdown)
+    return pool
@@ -0,0 +1,87 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Standalone interpreter process used by ``PythonREPLPool``.
+
+This file is executed by path (``python python_repl_worker.py``) rather than
+imported, so it must only depend on the standard library. The protocol is one
+JSON object per line: the parent writes ``{"code": ...}`` to stdin and the
+worker answers ``{"output": ...}`` on the original stdout. Anything user code
+writes to file descriptor 1 directly is redirected to stderr so it can never
+corrupt the protocol stream.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+
+
+def _apply_memory_limit(limit_mb: int) -> None:
+    if limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX platforms
+        return
+    limit_bytes = limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except (ValueError, OSError):
+        pass
+
+
+def _preload(modules: list[str], namespace: dict) -> None:
+    aliases = {"numpy": "np", "pandas": "pd"}
+    for name in modules:
+        try:
+            module = importlib.import_module(name)
+        except Exception:
+            continue
+        namespace[aliases.get(name, name)] = module
+
+
+def _execute(code: str, namespace: dict) -> str:
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            exec(code, namespace)
+        return buffer.getvalue()
+    except BaseException as e:  # noqa: BLE001 - mirror PythonREPL.run
+        return repr(e)
+
+
+def main() -> None:
+    # Limit native thread pools before numpy/pandas are imported so that
+    # parallel workers do not oversubscribe the CPU.
+    for var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, "1")
+
+    protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    preload = [m for m in os.getenv("PYTHON_REPL_WORKER_PRELOAD", "").split(",") if m]
+    namespace: dict = {"__name__": "__main__"}
+    _preload(preload, namespace)
+    _apply_memory_limit(int(os.getenv("PYTHON_REPL_WORKER_MEMORY_MB", "0") or 0))
+
+    protocol_out.write(json.dumps({"ready": True}) + "\n")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            protocol_out.write(json.dumps({"output": repr(e)}) + "\n")
+            continue
+        output = _execute(request.get("code", ""), namespace)
+        protocol_out.write(json.dumps({"output": output}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
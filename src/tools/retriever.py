@@ -14,6 +14,7 @@ from pydantic import BaseModel, Field
 
 from src.config.tools import SELECTED_RAG_PROVIDER
 from src.rag import Document, Resource, Retriever, build_retriever
+from src.rag.packing import pack_documents
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,9 @@ class RetrieverTool(BaseTool):
             f"Retriever tool query: {keywords}", extra={"resources": self.resources}
         )
         documents = self.retriever.query_relevant_documents(keywords, self.resources)
+        return self._pack(documents)
+
+    def _pack(self, documents: list[Document]) -> list[dict] | str:
         if not documents:
             return "No results found from the local knowledge base."
 
@@ -56,77 +60,47 @@ class RetrieverTool(BaseTool):
         except ValueError:
             max_chunks_per_doc = 5
         try:
-            max_chars_per_doc = int(os.getenv("RAG_TOOL_MAX_CHARS_PER_DOC", "4000"))
+            max_total_tokens = int(os.getenv("RAG_TOOL_MAX_TOTAL_TOKENS", "2000"))
         except ValueError:
-            max_chars_per_doc = 4000
+            max_total_tokens = 2000
         try:
-            max_total_chars = int(os.getenv("RAG_TOOL_MAX_TOTAL_CHARS", "8000"))
+            mmr_lambda = float(os.getenv("RAG_TOOL_MMR_LAMBDA", "0.7"))
         except ValueError:
-            max_total_chars = 8000
-
-        trimmed_docs = []
-        seen_hashes = set()
-        for doc in documents[:max_docs]:
-            # sort chunks by similarity desc if available
-            chunks = getattr(doc, "chunks", []) or []
-            try:
-                chunks = sorted(
-                    [c for c in chunks if getattr(c, "content", None)],
-                    key=lambda c: getattr(c, "similarity", 0.0),
-                    reverse=True,
-                )
-            except Exception:
-                pass
-
-            selected = chunks[:max_chunks_per_doc]
-            content = "\n\n".join(getattr(c, "content", "") for c in selected)
-            if len(content) > max_chars_per_doc:
-                content = content[:max_chars_per_doc] + "\n\n...[truncated]"
-
-            h = hash(content)
-            if content and h not in seen_hashes:
-                seen_hashes.add(h)
-                trimmed_docs.append(
-                    {
-                        "id": getattr(doc, "id", ""),
-                        **({"url": doc.url} if getattr(doc, "url", None) else {}),
-                        **({"title": doc.title} if getattr(doc, "title", None) else {}),
-                        "content": content,
-                    }
-                )
-
-        # Enforce total characters cap across all docs
-        total_chars = sum(len(d.get("content", "")) for d in trimmed_docs)
-        if total_chars > max_total_chars and trimmed_docs:
-            # Simple proportional trimming to fit within cap
-            scale = max_total_chars / max(total_chars, 1)
-            new_total = 0
-            for d in trimmed_docs:
-                content = d.get("content", "")
-                new_len = int(len(content) * scale)
-                d["content"] = content[: new_len] + ("\n\n...[truncated]" if len(content) > new_len else "")
-                new_total += len(d["content"])
-            total_chars = new_total
+            mmr_lambda = 0.7
+
+        # Diverse chunks first (MMR), then whole sentences up to the budget
+        packed_docs = pack_documents(
+            documents,
+            max_tokens=max_total_tokens,
+            max_docs=max_docs,
+            max_chunks_per_doc=max_chunks_per_doc,
+            lambda_mult=mmr_lambda,
+        )
 
         logger.info(
-            "Retriever output trimmed.",
+            "Retriever output packed.",
             extra={
-                "docs": len(trimmed_docs),
+                "docs": len(packed_docs),
                 "max_chunks_per_doc": max_chunks_per_doc,
-                "max_chars_per_doc": max_chars_per_doc,
-                "max_total_chars": max_total_chars,
-                "total_chars_after_trim": total_chars,
-                **({"max_total_tokens": max_total_tokens} if "max_total_tokens" in locals() and max_total_tokens else {}),
+                "max_total_tokens": max_total_tokens,
+                "mmr_lambda": mmr_lambda,
             },
         )
-        return trimmed_docs
+        return packed_docs
 
     async def _arun(
         self,
         keywords: str,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> list[Document]:
-        return self._run(keywords, run_manager.get_sync())
+        logger.info(
+            f"Retriever tool query: {keywords}", extra={"resources": self.resources}
+        )
+        # Awaited so remote providers do not hold a thread per search
+        documents = await self.retriever.aquery_relevant_documents(
+            keywords, self.resources
+        )
+        return self._pack(documents)
 
 
 def get_retriever_tool(resources: List[Resource]) -> RetrieverTool | None:
@@ -0,0 +1,209 @@
+"""DeepResearch 任务检查点单元测试"""
+
+from unittest.mock import patch
+
+import pytest
+from qwen_agent.llm.schema import FunctionCall, Message
+
+from src.deep_research.adapter import DeepResearchAdapter, ResearchState
+from src.deep_research.agent import MultiTurnReactAgent
+from src.deep_research.checkpoint import TaskCheckpointStore, make_task_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TaskCheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+
+def _round(i: int):
+    """一轮：助手发起工具调用 + 工具结果"""
+    return [
+        Message(
+            "assistant",
+            f"第{i}轮",
+            function_call=FunctionCall(name="search", arguments="{}"),
+        ),
+        Message(role="function", content=f"结果{i}", name="search"),
+    ]
+
+
+class TestTaskCheckpointStore:
+    """TaskCheckpointStore 单元测试"""
+
+    def test_save_load_delete(self, store):
+        messages = [{"role": "function", "content": "结果", "name": "search"}]
+        store.save("task", messages, 1)
+
+        checkpoint = store.load("task")
+        assert checkpoint["rounds"] == 1
+        assert checkpoint["messages"] == messages
+
+        store.delete("task")
+        assert store.load("task") is None
+
+    def test_expired_checkpoint_is_ignored(self, tmp_path):
+        store = TaskCheckpointStore(
+            str(tmp_path / "checkpoints.sqlite"), ttl_seconds=10
+        )
+        store.save("stale", [], 1)
+        store.save("task", [], 1)
+        with patch("src.deep_research.checkpoint.time.time", return_value=10**12):
+            assert store.load("task") is None
+            assert store.prune() == 1
+
+    def test_make_task_id_is_stable(self):
+        assert make_task_id("thread", 0, "任务") == make_task_id("thread", 0, "任务")
+        assert make_task_id("thread", 0, "任务") != make_task_id("other", 0, "任务")
+
+
+class TestAgentCheckpointing:
+    """MultiTurnReactAgent 检查点与恢复测试"""
+
+    def test_saves_completed_rounds_and_resumes(self, store):
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+
+        def crashing_run(messages, **kwargs):
+            responses = _round(0)
+            yield responses
+            responses = responses + _round(1)
+            yield responses
+            # 未完成的第三轮不应写入检查点
+            yield responses + [Message("assistant", "第2轮草稿")]
+            raise RuntimeError("服务中断")
+
+        with patch.object(agent, "run", side_effect=crashing_run):
+            result = agent._run(
+                {"item": {"question": "问题"}},
+                "test-model",
+                checkpoint_store=store,
+                task_id="task",
+            )
+
+        assert result["termination"] == "error"
+        checkpoint = store.load("task")
+        assert checkpoint["rounds"] == 2
+        assert len(checkpoint["messages"]) == 4
+        assert checkpoint["messages"][0]["function_call"]["name"] == "search"
+
+        received = []
+        budgets = []
+
+        def resumed_run(messages, **kwargs):
+            received.extend(messages)
+            budgets.append(kwargs["max_round"])
+            yield [Message("assistant", "最终答案")]
+
+        with patch.object(agent, "run", side_effect=resumed_run):
+            result = agent._run(
+                {"item": {"question": "问题"}},
+                "test-model",
+                max_rounds=5,
+                checkpoint_store=store,
+                task_id="task",
+            )
+
+        assert result["termination"] == "success"
+        assert result["prediction"] == "最终答案"
+        assert result["resumed_rounds"] == 2
+        # 已恢复的两轮计入轮次预算
+        assert budgets == [3]
+        # 系统消息 + 问题 + 两轮历史
+        assert [m.content for m in received[2:]] == ["第0轮", "结果0", "第1轮", "结果1"]
+        assert len(result["messages"]) == 5
+        assert store.load("task") is None
+
+
+class TestAdapterResume:
+    """DeepResearchAdapter 重试时从检查点恢复"""
+
+    def test_retry_resumes_from_last_round(self, store):
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+        adapter = DeepResearchAdapter(
+            agent=agent,
+            model="test-model",
+            planning_port=6001,
+            max_retries=2,
+            checkpoint_store=store,
+        )
+        calls = []
+
+        def run(messages, **kwargs):
+            calls.append(len(messages))
+            if len(calls) == 1:
+                yield _round(0)
+                raise RuntimeError("服务中断")
+            yield [Message("assistant", "最终答案")]
+
+        state = ResearchState(
+            messages=[], plan=["任务1"], current_task_index=0, task_results=[]
+        )
+        with patch.object(agent, "run", side_effect=run):
+            result = adapter.invoke(state, config={"configurable": {"thread_id": "t1"}})
+
+        task_result = result["task_results"][0]
+        assert task_result["status"] == "success"
+        assert task_result["attempts"] == 2
+        assert task_result["resumed_rounds"] == 1
+        # 第二次尝试带上了第一轮的调用与结果
+        assert calls == [2, 4]
+        assert store.load(make_task_id("t1", 0, "任务1")) is None
+
+    @pytest.mark.asyncio
+    async def test_async_timeout_is_retried_from_checkpoint(self, store, monkeypatch):
+        from src.deep_research import adapter as adapter_module
+
+        monkeypatch.setattr(adapter_module, "_TIMEOUT_GRACE_SECONDS", 0)
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+        adapter = DeepResearchAdapter(
+            agent=agent,
+            model="test-model",
+            planning_port=6001,
+            max_retries=2,
+            checkpoint_store=store,
+        )
+        adapter.timeout_seconds = 0.1
+        task_ids = []
+
+        def run(input_payload, model, cancel_event=None, task_id=None, **kwargs):
+            task_ids.append(task_id)
+            if len(task_ids) == 1:
+                cancel_event.wait(2)
+                return {"prediction": "", "termination": "cancelled", "messages": []}
+            return {"prediction": "最终答案", "termination": "success", "messages": []}
+
+        state = ResearchState(
+            messages=[], plan=["任务1"], current_task_index=0, task_results=[]
+        )
+        with patch.object(agent, "_run", side_effect=run):
+            result = await adapter.ainvoke(
+                state, config={"configurable": {"thread_id": "t1"}}
+            )
+
+        task_result = result["task_results"][0]
+        assert task_result["status"] == "success"
+        assert task_result["attempts"] == 2
+        assert task_ids == [make_task_id("t1", 0, "任务1")] * 2
+
+    def test_runs_without_thread_id_do_not_share_checkpoints(self, store):
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+        adapter = DeepResearchAdapter(
+            agent=agent, model="test-model", planning_port=6001, checkpoint_store=store
+        )
+        task_ids = []
+
+        def run(input_payload, model, task_id=None, **kwargs):
+            task_ids.append(task_id)
+            return {"prediction": "答案", "termination": "success", "messages": []}
+
+        with patch.object(agent, "_run", side_effect=run):
+            for _ in range(2):
+                adapter.invoke(
+                    ResearchState(
+                        messages=[],
+                        plan=["任务1"],
+                        current_task_index=0,
+                        task_results=[],
+                    )
+                )
+
+        assert len(set(task_ids)) == 2
@@ -49,6 +49,24 @@ class TestDeepResearchConfig:
         assert config.planner_model == "test-planner"
         assert config.synthesizer_model == "test-synthesizer"
 
+    @patch.dict(os.environ, {
+        "DEEPRESEARCH_PARALLEL": "true",
+        "DEEPRESEARCH_MAX_WORKERS": "3",
+    })
+    def test_parallel_config(self):
+        """测试并行配置"""
+        config = DeepResearchConfig()
+
+        assert config.parallel is True
+        assert config.max_workers == 3
+
+    def test_default_parallel_config(self):
+        """测试默认并行配置"""
+        config = DeepResearchConfig()
+
+        assert config.parallel is False
+        assert config.max_workers == 4
+
     def test_validate_success(self):
         """测试配置验证成功"""
         config = DeepResearchConfig()
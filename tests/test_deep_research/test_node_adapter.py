@@ -332,6 +332,154 @@ class TestDeepResearchAdapter:
         assert "messages" in result
         assert result["task_results"][0]["status"] == "failed"
 
+    def test_invoke_parallel_runs_tasks_concurrently(self, adapter):
+        """测试并行执行：按 max_workers 限制并发，结果按计划顺序返回"""
+        import threading
+        import time
+
+        adapter.max_workers = 2
+        lock = threading.Lock()
+        running = {"now": 0, "peak": 0}
+        ports = []
+
+        def run(input_payload, model, **kwargs):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                ports.append(input_payload["planning_port"])
+            question = input_payload["item"]["question"]
+            # 先提交的任务更慢，验证结果仍按计划顺序
+            time.sleep(0.2 if question == "任务1" else 0.05)
+            with lock:
+                running["now"] -= 1
+            return {"prediction": f"{question}答案", "termination": "success", "messages": []}
+
+        adapter.agent._run.side_effect = run
+        state = ResearchState(
+            messages=[],
+            plan=["任务1", "任务2", "任务3", "任务4"],
+            current_task_index=0,
+            task_results=[],
+        )
+
+        result = adapter.invoke_parallel(state)
+
+        assert running["peak"] == 2
+        assert set(ports) == {adapter.planning_port}
+        assert [r["answer"] for r in result["task_results"]] == [
+            "任务1答案", "任务2答案", "任务3答案", "任务4答案"
+        ]
+        assert [r["task_index"] for r in result["task_results"]] == [0, 1, 2, 3]
+        assert [m.additional_kwargs["task_index"] for m in result["messages"]] == [0, 1, 2, 3]
+        assert result["current_task_index"] == 4
+
+    def test_parallel_executor_graph(self, adapter):
+        """测试并行模式的执行图"""
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        adapter.parallel = True
+        planner = RunnableLambda(lambda _: AIMessage(content='{"steps": ["任务1", "任务2"]}'))
+        synthesizer = RunnableLambda(
+            lambda payload: AIMessage(content=f"共{len(payload['task_results'])}个结果")
+        )
+
+        graph = adapter.create_executor_graph(planner, synthesizer)
+        result = graph.invoke({"messages": [], "task_results": []})
+
+        assert adapter.agent._run.call_count == 2
+        assert result["messages"][-1].content == "共2个结果"
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_does_not_block_event_loop(self, adapter):
+        """测试异步执行不阻塞事件循环"""
+        import asyncio
+        import time
+
+        def run(input_payload, model, **kwargs):
+            time.sleep(0.3)
+            return {"prediction": "答案", "termination": "success", "messages": []}
+
+        adapter.agent._run.side_effect = run
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await adapter.ainvoke(ResearchState(plan=["任务1"], current_task_index=0))
+        ticker_task.cancel()
+
+        assert ticks > 10
+        assert result["task_results"][0]["answer"] == "答案"
+        assert "cancel_event" in adapter.agent._run.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_timeout_signals_agent(self, adapter, monkeypatch):
+        """测试超时后通知 agent 停止，且不再重试"""
+        import threading
+        from src.deep_research import adapter as adapter_module
+
+        monkeypatch.setattr(adapter_module, "_TIMEOUT_GRACE_SECONDS", 0)
+        adapter.timeout_seconds = 0.1
+        stopped = threading.Event()
+
+        def run(input_payload, model, cancel_event=None, **kwargs):
+            if cancel_event.wait(2):
+                stopped.set()
+            return {"prediction": "", "termination": "cancelled", "messages": []}
+
+        adapter.agent._run.side_effect = run
+        result = await adapter.ainvoke(ResearchState(plan=["任务1"], current_task_index=0))
+
+        assert result["task_results"][0]["termination"] == "timeout"
+        assert adapter.agent._run.call_count == 1
+        assert stopped.wait(2)
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_cancellation_propagates(self, adapter):
+        """测试取消（如客户端断开）传递到 agent"""
+        import asyncio
+        import threading
+
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def run(input_payload, model, cancel_event=None, **kwargs):
+            started.set()
+            if cancel_event.wait(2):
+                stopped.set()
+            return {"prediction": "", "termination": "cancelled", "messages": []}
+
+        adapter.agent._run.side_effect = run
+        task = asyncio.create_task(
+            adapter.ainvoke(ResearchState(plan=["任务1"], current_task_index=0))
+        )
+        await asyncio.to_thread(started.wait, 2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await asyncio.to_thread(stopped.wait, 2)
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_parallel(self, adapter):
+        """测试异步并行执行按计划顺序返回"""
+        adapter.max_workers = 2
+        adapter.agent._run.side_effect = lambda payload, model, **kwargs: {
+            "prediction": payload["item"]["question"],
+            "termination": "success",
+            "messages": [],
+        }
+
+        result = await adapter.ainvoke_parallel(
+            ResearchState(plan=["任务1", "任务2", "任务3"], current_task_index=0)
+        )
+
+        assert [r["answer"] for r in result["task_results"]] == ["任务1", "任务2", "任务3"]
+
     def test_convert_messages(self, adapter):
         """测试消息转换"""
         messages = [
@@ -442,4 +590,47 @@ class TestDeepResearchAdapter:
 
         graph = adapter.create_executor_graph(mock_planner, mock_synthesizer)
 
-        assert graph is not None
\ No newline at end of file
+        assert graph is not None
+
+class TestMultiTurnReactAgentCancellation:
+    """MultiTurnReactAgent 取消信号测试"""
+
+    def test_run_stops_between_responses_when_cancelled(self):
+        """测试设置取消信号后在下一次响应前停止"""
+        import threading
+        from qwen_agent.llm.schema import Message
+
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+        cancel_event = threading.Event()
+        produced = []
+
+        def run(messages, **kwargs):
+            for i in range(5):
+                produced.append(i)
+                if i == 1:
+                    cancel_event.set()
+                yield [Message("assistant", f"第{i}轮")]
+
+        with patch.object(agent, "run", side_effect=run):
+            result = agent._run(
+                {"item": {"question": "问题"}}, "test-model", cancel_event=cancel_event
+            )
+
+        assert result["termination"] == "cancelled"
+        assert produced == [0, 1]
+
+    def test_run_returns_last_response(self):
+        """测试正常结束时返回最后一次响应"""
+        from qwen_agent.llm.schema import Message
+
+        agent = MultiTurnReactAgent(llm={"model": "test-model"})
+
+        def run(messages, **kwargs):
+            yield [Message("assistant", "草稿")]
+            yield [Message("assistant", "最终答案")]
+
+        with patch.object(agent, "run", side_effect=run):
+            result = agent._run({"item": {"question": "问题"}}, "test-model")
+
+        assert result["termination"] == "success"
+        assert result["prediction"] == "最终答案"
@@ -3,11 +3,13 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
+from src.deep_research import tools
 from src.deep_research.tools import (
     SearchTool,
     VisitTool,
     ScholarTool,
     PythonInterpreterTool,
+    ToolRegistry,
     TOOL_CLASS,
     TOOL_MAP
 )
@@ -229,4 +231,40 @@ class TestToolRegistration:
         for tool in TOOL_CLASS:
             assert hasattr(tool, 'name')
             assert hasattr(tool, 'call')
-            assert callable(tool.call)
\ No newline at end of file
+            assert callable(tool.call)
+
+
+class TestLazyTools:
+    """测试工具惰性构建"""
+
+    def test_registry_builds_on_first_access(self):
+        """测试注册表在首次访问时构建工具并缓存"""
+        factory = MagicMock(side_effect=SearchTool)
+        registry = ToolRegistry({"search": factory})
+
+        assert list(registry) == ["search"]
+        factory.assert_not_called()
+
+        assert registry["search"] is registry["search"]
+        factory.assert_called_once()
+
+    def test_search_backend_is_shared(self):
+        """测试学术搜索与网络搜索共享同一个搜索后端"""
+        backend = MagicMock()
+        with patch.object(tools, "_search_backend", None), patch(
+            "src.tools.search.get_web_search_tool", return_value=backend
+        ) as factory:
+            assert SearchTool().search_tool is backend
+            assert ScholarTool().search_tool is backend
+        factory.assert_called_once_with(max_search_results=10)
+
+    @pytest.mark.asyncio
+    async def test_acall(self):
+        """测试异步调用"""
+        tool = SearchTool()
+        tool.search_tool = MagicMock()
+        tool.search_tool.invoke.return_value = {"result": "搜索结果"}
+        registry = ToolRegistry({"search": lambda: tool})
+
+        assert await registry.acall("search", {"query": "测试查询"}) == "搜索结果"
+
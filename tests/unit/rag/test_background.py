@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.rag.background import (
+    PRIORS_HEADER,
+    TRUNCATED_MARK,
+    BackgroundPriorsService,
+    compress_priors,
+)
+from src.rag.catalog import resource_catalog
+from src.rag.retriever import Resource, Retriever
+
+
+class BackgroundRetriever(Retriever):
+    def __init__(self):
+        self.listed = 0
+        self.queries = []
+
+    def list_resources(self, query=None):
+        self.listed += 1
+        return [
+            Resource(uri="lightrag://a", title="A"),
+            Resource(uri="lightrag://b", title="B"),
+        ]
+
+    def query_relevant_documents(self, query, resources=[]):
+        return []
+
+    def query_background_knowledge(self, query, resources=[]):
+        self.queries.append((query, [r.uri for r in resources]))
+        return {"background": f"About {query}.", "entities": [], "relationships": []}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def word_count(text):
+    return len(text.split())
+
+
+def test_query_is_cached_per_query_and_resources():
+    clock = FakeClock()
+    retriever = BackgroundRetriever()
+    service = BackgroundPriorsService(ttl=60, clock=clock)
+    a = [Resource(uri="lightrag://a", title="A")]
+
+    first = service.query(retriever, "Deer Flow", a)
+    assert service.query(retriever, "deer flow ", a) is first
+    service.query(retriever, "deer flow", [Resource(uri="lightrag://b", title="B")])
+    assert len(retriever.queries) == 2
+
+    clock.now = 61
+    service.query(retriever, "deer flow", a)
+    assert len(retriever.queries) == 3
+    assert service.stats() == {"hits": 1, "misses": 3, "size": 2}
+
+    service.invalidate()
+    service.query(retriever, "deer flow", a)
+    assert len(retriever.queries) == 4
+
+
+def test_resources_are_discovered_through_catalog():
+    retriever = BackgroundRetriever()
+    service = BackgroundPriorsService()
+    try:
+        service.query(retriever, "topic")
+        service.query(retriever, "other topic")
+    finally:
+        resource_catalog.clear()
+    assert retriever.listed == 1
+    assert [uris for _, uris in retriever.queries] == [["lightrag://a"]] * 2
+
+
+def test_compress_priors_without_budget_keeps_everything():
+    text = compress_priors(
+        {
+            "background": "Background text.",
+            "entities": [{"entity": "Milvus", "description": "A vector DB"}, {"id": 7}],
+            "relationships": [{"src_id": "Milvus", "tgt_id": "RAG"}],
+            "metadata": {"mode": "global"},
+        }
+    )
+    assert text.startswith(PRIORS_HEADER)
+    assert "- Milvus: A vector DB\n- 7" in text
+    assert "- Milvus -> RAG" in text
+    assert '"mode": "global"' in text
+
+
+def test_compress_priors_fits_token_budget():
+    result = {
+        "background": " ".join(f"Sentence number {i} is here." for i in range(50)),
+        "entities": [
+            {"entity": f"E{i}", "description": "described", "score": i}
+            for i in range(30)
+        ],
+        "relationships": [{"src_id": "E1", "tgt_id": "E2"}],
+    }
+    text = compress_priors(result, max_tokens=120, count_tokens=word_count)
+    assert word_count(text) <= 120
+    assert TRUNCATED_MARK in text
+    # Whole sentences are kept and the highest scored entities come first.
+    assert "Sentence number 0 is here.\n" in text
+    assert "- E29: described" in text
+    assert "- E0:" not in text
+    assert '"total_entities": 30' in text
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+
+from src.rag.catalog import ResourceCatalog
+from src.rag.retriever import Resource, Retriever
+
+
+class CatalogRetriever(Retriever):
+    def __init__(self, titles):
+        self.titles = titles
+        self.calls = 0
+        self.release = None
+
+    def list_resources(self, query=None):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return [Resource(uri=f"rag://{i}", title=t) for i, t in enumerate(self.titles)]
+
+    def query_relevant_documents(self, query, resources=[]):
+        return []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def titles(resources):
+    return [r.title for r in resources]
+
+
+def test_search_ranks_prefix_word_substring_and_fuzzy():
+    retriever = CatalogRetriever(
+        ["Guide to Milvus", "Milvus Lite", "RAGFlow notes", "Deer flow", "Milvs typo"]
+    )
+    catalog = ResourceCatalog()
+
+    assert titles(catalog.search(retriever, "milvus")) == [
+        "Milvus Lite",
+        "Guide to Milvus",
+        "Milvs typo",
+    ]
+    assert titles(catalog.search(retriever, "flow")) == ["Deer flow", "RAGFlow notes"]
+    # URIs match as substrings ahead of fuzzy title matches.
+    assert titles(catalog.search(retriever, "rag://4"))[0] == "Milvs typo"
+    assert len(catalog.search(retriever, None)) == 5
+    assert catalog.search(retriever, "zz") == []
+    assert retriever.calls == 1
+
+
+def test_stale_catalog_is_served_while_refreshing():
+    clock = FakeClock()
+    retriever = CatalogRetriever(["Alpha"])
+    catalog = ResourceCatalog(refresh_interval=10, clock=clock)
+    catalog.search(retriever)
+
+    retriever.titles = ["Alpha", "Beta"]
+    retriever.release = threading.Event()
+    clock.now = 11
+    # The provider blocks, but the lookup answers from the old catalog.
+    assert titles(catalog.search(retriever)) == ["Alpha"]
+    assert titles(catalog.search(retriever)) == ["Alpha"]
+    retriever.release.set()
+    catalog._executor.submit(lambda: None).result()
+    catalog._executor.shutdown(wait=True)
+    assert titles(catalog.search(retriever)) == ["Alpha", "Beta"]
+    assert retriever.calls == 2
+
+
+def test_invalidate_triggers_refresh():
+    retriever = CatalogRetriever(["Alpha"])
+    catalog = ResourceCatalog(refresh_interval=3600)
+    catalog.search(retriever)
+    retriever.titles = ["Alpha", "Beta"]
+    catalog.invalidate()
+    catalog.search(retriever)
+    catalog._executor.shutdown(wait=True)
+    assert titles(catalog.search(retriever)) == ["Alpha", "Beta"]
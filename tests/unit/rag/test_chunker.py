@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.rag.chunker import MarkdownChunker
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def make_chunker(**kwargs) -> MarkdownChunker:
+    kwargs.setdefault("count_tokens", count_words)
+    return MarkdownChunker(**kwargs)
+
+
+def test_small_text_is_single_chunk():
+    chunker = make_chunker(chunk_tokens=50)
+    assert chunker.split_text("# Title\n\nShort paragraph.") == [
+        "# Title\n\nShort paragraph."
+    ]
+    assert chunker.split_text("   \n\n") == []
+
+
+def test_chunks_respect_token_budget_and_sentences():
+    sentences = [f"Sentence number {i} is here." for i in range(40)]
+    text = " ".join(sentences)
+    chunker = make_chunker(chunk_tokens=20, overlap_tokens=0)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(count_words(c) <= 20 for c in chunks)
+    # No sentence is cut in half and nothing is lost or duplicated.
+    assert " ".join(chunks) == text
+
+
+def test_overlap_repeats_trailing_sentences():
+    text = " ".join(f"Sentence {i} ends." for i in range(12))
+    chunker = make_chunker(chunk_tokens=9, overlap_tokens=3)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 2
+    for previous, current in zip(chunks, chunks[1:]):
+        last_sentence = previous.rsplit(". ", 1)[-1]
+        assert current.startswith(last_sentence.rstrip("."))
+
+
+def test_markdown_structure_is_preserved():
+    text = (
+        "# Heading\n\nFirst paragraph line one.\nLine two.\n\n"
+        "```python\nprint('a')\n\nprint('b')\n```\n\n## Next\n\nTail."
+    )
+    chunker = make_chunker(chunk_tokens=6, overlap_tokens=0)
+
+    chunks = chunker.split_text(text)
+
+    # The fenced block stays together despite its blank line.
+    assert "```python\nprint('a')\n\nprint('b')\n```" in chunks
+    assert chunks[-1] == "## Next\n\nTail."
+
+
+def test_oversize_sentence_and_char_cap():
+    chunker = make_chunker(chunk_tokens=5, overlap_tokens=0, max_chars=30)
+    text = " ".join(["word"] * 23) + " " + "x" * 70
+
+    chunks = chunker.split_text(text)
+
+    assert all(len(c) <= 30 for c in chunks)
+    assert all(count_words(c) <= 5 for c in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+
+def test_iter_chunks_streams_lines_without_blank_lines():
+    consumed = []
+
+    def lines():
+        for i in range(5000):
+            consumed.append(i)
+            yield f"Line {i} of an endless paragraph.\n"
+
+    chunker = make_chunker(chunk_tokens=50, overlap_tokens=10, max_chars=1000)
+    first = next(chunker.iter_chunks(lines()))
+
+    assert count_words(first) <= 50
+    # The generator produced a chunk long before reading the whole input.
+    assert len(consumed) < 1000
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        MarkdownChunker(chunk_tokens=0)
+
+
+def test_heading_before_oversize_paragraph_is_kept():
+    text = (
+        "# Title\n\n"
+        + " ".join(["word"] * 300)
+        + ".\n\n## Section Two\n\n"
+        + " ".join(["more"] * 700)
+        + ".\n"
+    )
+
+    chunks = MarkdownChunker().split_text(text)
+
+    assert any("## Section Two" in c for c in chunks)
+
+
+def test_heading_is_kept_without_overlap():
+    text = (
+        "# Guide\n\nThis guide explains how to install the tool.\n\n"
+        "## Setup\n\n"
+        + " ".join(
+            f"Step {i} runs the installer with the default flags and then checks "
+            "that every service started."
+            for i in range(3)
+        )
+    )
+    chunker = make_chunker(chunk_tokens=16, overlap_tokens=0)
+
+    chunks = chunker.split_text(text)
+
+    assert any("## Setup" in c for c in chunks)
+    setup = next(c for c in chunks if "## Setup" in c)
+    assert setup.startswith("## Setup\n\nStep 0")
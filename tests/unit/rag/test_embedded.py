@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import pytest
+
+from src.rag.embedded import EmbeddedProvider, EmbeddedVectorStore
+from src.rag.ingestion import DocumentIngestor
+from src.rag.retriever import Resource
+
+
+def make_chunks(n, url="u"):
+    return [
+        {"id": f"{url}-{i}", "content": f"c{i}", "title": url.upper(), "url": url}
+        for i in range(n)
+    ]
+
+
+def test_store_search_filters_and_deletes(tmp_path):
+    store = EmbeddedVectorStore(tmp_path, dim=2)
+    store.add(make_chunks(2, "a"), np.array([[1.0, 0.0], [0.0, 1.0]]))
+    store.add(make_chunks(1, "b"), np.array([[1.0, 0.1]]))
+
+    hits = store.search([1.0, 0.0], k=2)
+    assert [c["id"] for c, _ in hits] == ["a-0", "b-0"]
+    assert hits[0][1] == pytest.approx(1.0, abs=1e-3)
+
+    # Resource filtering by document url or chunk id.
+    assert [c["id"] for c, _ in store.search([1.0, 0.0], 5, uris=["b"])] == ["b-0"]
+    assert [c["id"] for c, _ in store.search([1.0, 0.0], 5, uris=["a-1"])] == ["a-1"]
+    assert store.search([1.0, 0.0], 5, uris=["missing"]) == []
+
+    store.delete(["a-0"])
+    assert [c["id"] for c, _ in store.search([1.0, 0.0], 1)] == ["b-0"]
+    assert store.chunk_ids_by_url("") == {"a": {"a-1"}, "b": {"b-0"}}
+
+
+def test_store_reopens_grows_and_compacts(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(3000, 8))
+    store = EmbeddedVectorStore(tmp_path, dim=8, dtype="float32")
+    store.add(make_chunks(3000), vectors)
+    store.delete([f"u-{i}" for i in range(0, 3000, 2)])
+    store.close()
+
+    store = EmbeddedVectorStore(tmp_path, dim=8, dtype="float32")
+    assert store.size == 1500
+    assert store.search(vectors[1], 1)[0][0]["id"] == "u-1"
+    store.compact()
+    assert store.count == 1500
+    assert store.search(vectors[2999], 1)[0][0]["id"] == "u-2999"
+
+    with pytest.raises(ValueError):
+        EmbeddedVectorStore(tmp_path, dim=4, dtype="float32")
+
+
+def test_ivf_search_matches_exact_on_clusters(tmp_path):
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(16, 32))
+    vectors = centers[rng.integers(0, 16, 4000)] + 0.05 * rng.normal(size=(4000, 32))
+    store = EmbeddedVectorStore(tmp_path, dim=32)
+    store.add(make_chunks(4000), vectors)
+    store.train_ivf(16)
+
+    queries = vectors[:50]
+    exact = [store.search(q, 5)[0][0]["id"] for q in queries]
+    approx = [store.search(q, 5, nprobe=2)[0][0]["id"] for q in queries]
+    assert exact == approx == [f"u-{i}" for i in range(50)]
+
+    # Rows added after training are assigned to an existing list.
+    store.add([{"id": "new", "content": "n", "url": "n"}], vectors[:1] * 2)
+    assert store.search(vectors[0], 2, uris=["n"], nprobe=1)[0][0]["id"] == "new"
+
+
+class DummyEmbedding:
+    def embed_query(self, text):
+        return [1.0, 0.0] if "alpha" in text else [0.0, 1.0]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    monkeypatch.setenv("EMBEDDED_STORE_PATH", str(tmp_path / "kb"))
+    monkeypatch.setenv("EMBEDDED_EMBEDDING_DIM", "2")
+    monkeypatch.setattr(
+        EmbeddedProvider,
+        "_init_embedding_model",
+        lambda self: setattr(self, "embedding_model", DummyEmbedding()),
+    )
+    provider = EmbeddedProvider()
+    yield provider
+    provider.close()
+
+
+def test_provider_ingests_and_queries(provider, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "alpha.md").write_text("# Alpha\n\nalpha facts", encoding="utf-8")
+    (docs / "beta.md").write_text("# Beta\n\nbeta facts", encoding="utf-8")
+
+    job = DocumentIngestor(provider, root=tmp_path).ingest_directory(docs)
+    assert job.chunks_added == 2
+
+    resources = provider.list_resources()
+    assert [r.uri for r in resources] == [
+        "embedded://kb/docs/alpha.md",
+        "embedded://kb/docs/beta.md",
+    ]
+    assert [r.title for r in provider.list_resources("bet")] == ["Beta"]
+
+    documents = provider.query_relevant_documents("alpha?")
+    assert documents[0].url == "embedded://kb/docs/alpha.md"
+    assert documents[0].chunks[0].similarity == pytest.approx(1.0, abs=1e-3)
+
+    only_beta = provider.query_relevant_documents(
+        "alpha?", resources=[Resource(uri=resources[1].uri, title="Beta")]
+    )
+    assert [d.title for d in only_beta] == ["Beta"]
+
+
+def test_provider_rejects_unknown_index(provider, monkeypatch):
+    monkeypatch.setenv("EMBEDDED_INDEX", "hnsw")
+    with pytest.raises(ValueError):
+        EmbeddedProvider()
+
+
+def test_provider_hybrid_search_finds_exact_tokens(tmp_path, monkeypatch):
+    monkeypatch.setenv("EMBEDDED_STORE_PATH", str(tmp_path / "kb"))
+    monkeypatch.setenv("EMBEDDED_EMBEDDING_DIM", "2")
+    monkeypatch.setenv("EMBEDDED_HYBRID_SEARCH", "true")
+    monkeypatch.setenv("EMBEDDED_TOP_K", "1")
+    monkeypatch.setenv("EMBEDDED_HYBRID_CANDIDATES", "3")
+    monkeypatch.setattr(
+        EmbeddedProvider,
+        "_init_embedding_model",
+        lambda self: setattr(self, "embedding_model", DummyEmbedding()),
+    )
+    provider = EmbeddedProvider()
+    provider.insert_chunks(
+        [
+            {"id": "1", "content": "alpha ERR_42 details", "url": "a", "title": "A"},
+            {"id": "2", "content": "beta notes", "url": "b", "title": "B"},
+            {"id": "3", "content": "gamma notes", "url": "c", "title": "C"},
+        ]
+    )
+
+    # Vector search alone ranks chunk 1 last; the keyword match lifts it.
+    assert [h["id"] for h in provider._vector_search("ERR_42", None, 3)][-1] == "1"
+    assert [d.url for d in provider.query_relevant_documents("ERR_42")] == ["a"]
+    assert provider.rebuild_keyword_index() == 3
+    provider.delete_chunks(["1"])
+    assert provider.keyword_index.search("err_42", 5) == []
+    provider.close()
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from src.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 0.5, 0.25]
+
+    def embed_documents(self, texts):
+        return [[1.0] for _ in texts]
+
+
+def test_lru_hits_misses_and_normalization():
+    cache = EmbeddingCache(model="m", dimensions=3, max_entries=2)
+    assert cache.get("hello world") is None
+    cache.put("hello world", [1.0, 2.0, 3.0])
+    assert cache.get("  hello \n world ") == [1.0, 2.0, 3.0]
+    cache.put("b", [2.0])
+    cache.put("c", [3.0])  # evicts "hello world"
+    assert cache.get("hello world") is None
+    assert cache.stats() == {
+        "hits": 1,
+        "disk_hits": 0,
+        "misses": 2,
+        "hit_rate": 1 / 3,
+        "size": 2,
+    }
+
+
+def test_key_includes_model_and_dimensions():
+    cache = EmbeddingCache(model="m", dimensions=3)
+    assert cache.key("q") != EmbeddingCache(model="m", dimensions=4).key("q")
+    assert cache.key("q") != EmbeddingCache(model="n", dimensions=3).key("q")
+
+
+def test_disk_tier_persists_float32(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.db")
+    cache = EmbeddingCache(model="m", dimensions=3, max_entries=0, disk_path=path)
+    cache.put("query", [0.1, 0.2, 0.3])
+    cache.close()
+
+    reopened = EmbeddingCache(model="m", dimensions=3, disk_path=path)
+    vector = reopened.get("query")
+    assert np.allclose(vector, [0.1, 0.2, 0.3], atol=1e-7)
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("query") == vector  # now served from memory
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_cached_embeddings_wrapper():
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, EmbeddingCache(model="m", dimensions=3))
+    first = embeddings.embed_query("what is rag")
+    assert embeddings.embed_query("what is rag") == first
+    assert inner.queries == ["what is rag"]
+    assert embeddings.embed_documents(["a", "b"]) == [[1.0], [1.0]]
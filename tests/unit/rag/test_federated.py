@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+import time
+
+import pytest
+
+import src.rag.builder as builder
+from src.rag.federated import FederatedRetriever, split_uri
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+
+
+class StaticRetriever(Retriever):
+    def __init__(self, scores, delay=0.0, error=None):
+        self.scores = scores
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    def list_resources(self, query=None):
+        time.sleep(self.delay)
+        return [Resource(uri="rag://dataset/1", title="Dataset")]
+
+    def query_relevant_documents(self, query, resources=[]):
+        self.calls.append([r.uri for r in resources])
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [
+            Document(id=f"d{i}", url=f"u{i}", chunks=[Chunk(f"c{i}", s)])
+            for i, s in enumerate(self.scores)
+        ]
+
+
+def test_split_uri():
+    assert split_uri("ragflow+rag://dataset/1") == ("ragflow", "rag://dataset/1")
+    assert split_uri("rag://dataset/a+b") == (None, "rag://dataset/a+b")
+    assert split_uri("plain") == (None, "plain")
+
+
+def test_normalizes_scores_and_merges():
+    retriever = FederatedRetriever(
+        {
+            "ragflow": StaticRetriever([0.9, 0.5, 0.1]),
+            "milvus": StaticRetriever([30.0, 20.0]),  # different score scale
+        }
+    )
+    documents = retriever.query_relevant_documents("q")
+    assert [d.id for d in documents] == [
+        "ragflow+d0",
+        "milvus+d0",
+        "ragflow+d1",
+        "ragflow+d2",
+        "milvus+d1",
+    ]
+    assert documents[2].chunks[0].similarity == pytest.approx(0.5)
+    assert documents[0].url == "u0"
+
+
+def test_providers_run_concurrently_with_partial_results():
+    started = threading.Barrier(2, timeout=5)
+
+    class WaitingRetriever(StaticRetriever):
+        def query_relevant_documents(self, query, resources=[]):
+            started.wait()
+            return super().query_relevant_documents(query, resources)
+
+    retriever = FederatedRetriever(
+        {
+            "a": WaitingRetriever([1.0]),
+            "b": WaitingRetriever([1.0]),
+            "slow": StaticRetriever([1.0], delay=2),
+            "broken": StaticRetriever([1.0], error=RuntimeError("down")),
+        },
+        timeout=0.5,
+    )
+    begin = time.monotonic()
+    documents = retriever.query_relevant_documents("q")
+    assert time.monotonic() - begin < 1.5
+    assert sorted(d.id for d in documents) == ["a+d0", "b+d0"]
+
+
+def test_resources_are_prefixed_and_routed():
+    ragflow = StaticRetriever([1.0])
+    milvus = StaticRetriever([1.0])
+    retriever = FederatedRetriever({"ragflow": ragflow, "milvus": milvus})
+
+    resources = retriever.list_resources()
+    assert [r.uri for r in resources] == [
+        "ragflow+rag://dataset/1",
+        "milvus+rag://dataset/1",
+    ]
+
+    documents = retriever.query_relevant_documents("q", resources[:1])
+    assert ragflow.calls == [["rag://dataset/1"]]
+    assert milvus.calls == []
+    assert [d.id for d in documents] == ["ragflow+d0"]
+
+
+def test_builder_creates_federated_retriever(monkeypatch):
+    created = []
+
+    def fake_create(provider):
+        if provider == "federated":
+            return original(provider)
+        created.append(provider)
+        return StaticRetriever([1.0])
+
+    original = builder._create_retriever
+    monkeypatch.setattr(builder, "_create_retriever", fake_create)
+    monkeypatch.setenv("RAG_FEDERATED_PROVIDERS", "ragflow, milvus,ragflow")
+    monkeypatch.setenv("RAG_FEDERATED_TIMEOUT", "2.5")
+
+    retriever = builder._create_retriever("federated")
+    assert created == ["ragflow", "milvus"]
+    assert retriever.timeout == 2.5
+
+    monkeypatch.setenv("RAG_FEDERATED_PROVIDERS", "milvus,federated")
+    with pytest.raises(ValueError):
+        builder._create_retriever("federated")
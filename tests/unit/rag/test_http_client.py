@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+
+from src.rag import http_client
+from src.rag.http_client import arequest, backoff_delay, request
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setenv("RAG_HTTP_BACKOFF", "0")
+    monkeypatch.setenv("RAG_HTTP_MAX_RETRIES", "2")
+
+
+def response(status):
+    resp = MagicMock()
+    resp.status_code = status
+    return resp
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(10):
+        delay = backoff_delay(attempt, base=0.5, cap=4.0)
+        assert 0 <= delay <= min(4.0, 0.5 * 2**attempt)
+
+
+def test_request_retries_transient_status(monkeypatch):
+    session = MagicMock()
+    session.request.side_effect = [response(503), response(200)]
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    assert request("GET", "http://rag").status_code == 200
+    assert session.request.call_count == 2
+
+
+def test_request_returns_last_response_and_raises_last_error(monkeypatch):
+    session = MagicMock()
+    session.request.return_value = response(502)
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    assert request("GET", "http://rag").status_code == 502
+    assert session.request.call_count == 3
+
+    session.request.side_effect = requests.ConnectionError("refused")
+    with pytest.raises(requests.ConnectionError):
+        request("GET", "http://rag")
+
+
+def test_request_does_not_retry_client_errors(monkeypatch):
+    session = MagicMock()
+    session.request.return_value = response(400)
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    assert request("POST", "http://rag", json={}).status_code == 400
+    session.request.assert_called_once_with("POST", "http://rag", json={})
+
+
+@pytest.mark.asyncio
+async def test_arequest_retries_on_pooled_client():
+    calls = []
+
+    def handler(req):
+        calls.append(req)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=req)
+        return httpx.Response(429 if len(calls) == 2 else 200)
+
+    http_client._async_clients.clear()
+    client = http_client.get_async_client()
+    client._transport = httpx.MockTransport(handler)
+    try:
+        resp = await arequest("GET", "http://rag/api")
+        assert resp.status_code == 200
+        assert len(calls) == 3
+        # The loop's client is reused.
+        assert http_client.get_async_client() is client
+    finally:
+        await http_client.aclose_clients()
@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+
+import pytest
+
+from src.rag.hybrid import BM25Index, hybrid_search, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_keeps_identifiers_and_splits_cjk():
+    assert tokenize("Set max_tokens for GPT-4o") == [
+        "set",
+        "max_tokens",
+        "max",
+        "tokens",
+        "for",
+        "gpt-4o",
+        "gpt",
+        "4o",
+    ]
+    assert tokenize("检索增强") == ["检索", "索增", "增强"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BM25Index(tmp_path / "bm25.db")
+    index.add(
+        [
+            {"id": "a", "url": "u1", "title": "", "content": "The ERR_4012 code"},
+            {"id": "b", "url": "u1", "title": "", "content": "generic error codes"},
+            {"id": "c", "url": "u2", "title": "Errors", "content": "error error"},
+        ]
+    )
+    yield index
+    index.close()
+
+
+def test_bm25_ranks_exact_identifiers(index):
+    hits = index.search("what is err_4012", k=5)
+    assert [h["id"] for h in hits] == ["a"]
+    assert hits[0]["url"] == "u1" and hits[0]["score"] > 0
+
+    # Higher term frequency (title + body) ranks first.
+    assert [h["id"] for h in index.search("error", k=5)] == ["c", "b"]
+    assert [h["id"] for h in index.search("error", k=5, uris=["u1"])] == ["b"]
+    assert index.search("", k=5) == []
+
+
+def test_bm25_replaces_and_deletes(index):
+    index.add([{"id": "a", "url": "u1", "content": "rewritten"}])
+    assert index.search("err_4012", k=5) == []
+    assert index.search("rewritten", k=5)[0]["id"] == "a"
+    index.delete(["a", "c"])
+    assert len(index) == 1
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    vector = [{"id": "x"}, {"id": "y"}, {"id": "z"}]
+    keyword = [{"id": "y"}, {"id": "w"}]
+    fused = reciprocal_rank_fusion([vector, keyword], k=60)
+    assert [c["id"] for c in fused] == ["y", "x", "w", "z"]
+    assert fused[0]["score"] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_hybrid_search_runs_concurrently_and_degrades():
+    both_started = threading.Barrier(2, timeout=5)
+
+    def vector(n):
+        both_started.wait()
+        return [{"id": "v"}]
+
+    def keyword(n):
+        both_started.wait()
+        return [{"id": "v"}, {"id": "k"}]
+
+    # Would deadlock on the barrier if the searches ran one after the other.
+    hits = hybrid_search(vector, keyword, k=1, candidates=4)
+    assert [c["id"] for c in hits] == ["v"]
+
+    def broken(n):
+        raise RuntimeError("index unavailable")
+
+    hits = hybrid_search(lambda n: [{"id": "v"}], broken, k=5, candidates=5)
+    assert [c["id"] for c in hits] == ["v"]
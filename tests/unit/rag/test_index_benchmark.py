@@ -0,0 +1,97 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from src.rag.index_benchmark import (
+    BenchmarkResult,
+    IndexBenchmark,
+    IndexConfig,
+    default_configs,
+    exact_top_k,
+    recall_at_k,
+    recommend,
+    synthetic_vectors,
+)
+
+
+class FakeClient:
+    """Exact-search stand-in for MilvusClient."""
+
+    def __init__(self):
+        self.collections = {}
+        self.indexes = []
+
+    def list_collections(self):
+        return list(self.collections)
+
+    def create_collection(self, collection_name, schema):
+        self.collections[collection_name] = []
+
+    def drop_collection(self, collection_name):
+        del self.collections[collection_name]
+
+    def insert(self, collection_name, data):
+        self.collections[collection_name].extend(data)
+
+    def create_index(self, collection_name, index_params):
+        self.indexes.extend(index.index_type for index in index_params)
+
+    def load_collection(self, collection_name):
+        pass
+
+    def search(self, collection_name, data, limit, search_params):
+        rows = self.collections[collection_name]
+        base = np.asarray([row["vector"] for row in rows])
+        top = exact_top_k(base, np.asarray(data), limit)
+        return [[{"id": rows[i]["id"]} for i in hits] for hits in top]
+
+
+def test_exact_top_k_metrics():
+    base = np.array([[1.0, 0.0], [0.0, 1.0], [3.0, 3.0]])
+    query = np.array([[1.0, 0.1]])
+    assert exact_top_k(base, query, 2, "IP").tolist() == [[2, 0]]
+    assert exact_top_k(base, query, 2, "L2").tolist() == [[0, 1]]
+    assert exact_top_k(base, query, 1, "COSINE").tolist() == [[0]]
+    assert exact_top_k(base, query, 10).shape == (1, 3)
+
+
+def test_recall_at_k():
+    truth = np.array([[1, 2], [3, 4]])
+    assert recall_at_k([[2, 1], [3, 9]], truth) == 0.75
+
+
+def test_benchmark_skips_unsupported_lite_indexes():
+    vectors = synthetic_vectors(120, 8, clusters=4)
+    client = FakeClient()
+    benchmark = IndexBenchmark(client, k=5, lite=True)
+
+    results = benchmark.run(vectors[20:], vectors[:20], default_configs(100))
+
+    assert set(client.indexes) == {"FLAT", "IVF_FLAT"}
+    assert all(r.recall == 1.0 for r in results)
+    assert all(r.p99_ms >= r.p50_ms for r in results)
+    # Scratch collection is dropped after each configuration.
+    assert client.collections == {}
+
+
+def test_recommend_prefers_fastest_passing_config():
+    ivf = IndexConfig("IVF_FLAT", {"nlist": 64})
+    hnsw = IndexConfig("HNSW", {"M": 16, "efConstruction": 200})
+    results = [
+        BenchmarkResult(ivf, {"nprobe": 4}, 0.80, 1.0, 2.0, 0.1),
+        BenchmarkResult(ivf, {"nprobe": 16}, 0.96, 2.0, 4.0, 0.1),
+        BenchmarkResult(hnsw, {"ef": 64}, 0.97, 1.5, 3.0, 0.5),
+    ]
+
+    best = recommend(results, 0.95)
+    assert best.config is hnsw
+    assert best.config.env(best.search_params) == {
+        "MILVUS_INDEX_TYPE": "HNSW",
+        "MILVUS_HNSW_M": 16,
+        "MILVUS_HNSW_EF_CONSTRUCTION": 200,
+        "MILVUS_HNSW_EF": 64,
+    }
+    # Nothing reaches the target: fall back to the most accurate.
+    assert recommend(results, 0.99).recall == 0.97
+    assert recommend([], 0.9) is None
@@ -0,0 +1,206 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+
+import pytest
+
+from src.rag.ingestion import (
+    DocumentIngestor,
+    IngestionJobManager,
+    chunk_id,
+    read_document,
+)
+from src.rag.milvus import IngestionProgress
+
+
+class FakeMilvus:
+    """In-memory stand-in for the MilvusRetriever ingestion surface."""
+
+    collection_name = "documents"
+
+    def __init__(self):
+        self.rows = {}
+        self.embedded = []
+        self.failing = set()
+
+    def _split_content(self, content):
+        return [p for p in content.split("\n\n") if p.strip()]
+
+    def get_chunk_ids_by_url(self, url_prefix):
+        grouped = {}
+        for cid, row in self.rows.items():
+            if row["url"].startswith(url_prefix):
+                grouped.setdefault(row["url"], set()).add(cid)
+        return grouped
+
+    def insert_chunks(self, chunks, on_progress=None):
+        progress = IngestionProgress()
+        for chunk in chunks:
+            if chunk["content"] in self.failing:
+                progress.record_failure([chunk])
+                continue
+            self.embedded.append(chunk["content"])
+            self.rows[chunk["id"]] = chunk
+            progress.chunks_inserted += 1
+        return progress
+
+    def delete_chunks(self, ids):
+        for cid in ids:
+            self.rows.pop(cid, None)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "kb"
+    root.mkdir()
+    (root / "a.md").write_text("# Alpha\n\npara one\n\npara two", encoding="utf-8")
+    (root / "b.txt").write_text("plain text", encoding="utf-8")
+    (root / "ignored.bin").write_bytes(b"\x00\x01")
+    return root
+
+
+def test_read_document_formats():
+    assert read_document("notes.md", b"# Heading\nbody") == (
+        "Heading",
+        "# Heading\nbody",
+    )
+    assert read_document("my_notes.txt", b"body") == ("My Notes", "body")
+    title, text = read_document(
+        "page.html",
+        b"<html><head><title>Page</title><style>p{}</style></head>"
+        b"<body><h1>Hi</h1><p>there</p></body></html>",
+    )
+    assert title == "Page"
+    assert "there" in text and "p{}" not in text
+    with pytest.raises(ValueError):
+        read_document("image.png", b"")
+
+
+def test_ingest_directory_is_incremental(corpus):
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=corpus.parent)
+
+    job = ingestor.ingest_directory(corpus)
+    assert job.documents_total == 2
+    assert job.chunks_added == 4
+    assert {row["url"] for row in store.rows.values()} == {
+        "milvus://documents/kb/a.md",
+        "milvus://documents/kb/b.txt",
+    }
+
+    store.embedded.clear()
+    job = ingestor.ingest_directory(corpus)
+    assert job.chunks_added == 0
+    assert job.chunks_unchanged == 4
+    assert store.embedded == []
+
+    (corpus / "a.md").write_text("# Alpha\n\npara one\n\npara 2", encoding="utf-8")
+    job = ingestor.ingest_directory(corpus)
+    assert store.embedded == ["para 2"]
+    assert job.chunks_deleted == 1
+    assert chunk_id("milvus://documents/kb/a.md", "para two") not in store.rows
+
+
+def test_failed_replacements_keep_previous_chunks(corpus):
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=corpus.parent)
+    ingestor.ingest_directory(corpus)
+
+    (corpus / "a.md").write_text("# Alpha\n\npara one\n\npara 2", encoding="utf-8")
+    (corpus / "b.txt").write_text("new text", encoding="utf-8")
+    store.failing = {"para 2"}
+    job = ingestor.ingest_directory(corpus)
+    assert job.chunks_failed == 1
+    assert job.chunks_deleted == 1
+    assert chunk_id("milvus://documents/kb/a.md", "para two") in store.rows
+    assert chunk_id("milvus://documents/kb/b.txt", "plain text") not in store.rows
+
+    store.failing = set()
+    job = ingestor.ingest_directory(corpus)
+    assert chunk_id("milvus://documents/kb/a.md", "para two") not in store.rows
+    assert chunk_id("milvus://documents/kb/a.md", "para 2") in store.rows
+
+
+def test_ingest_directory_prunes_removed_documents(corpus):
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=corpus.parent)
+    ingestor.ingest_directory(corpus)
+
+    (corpus / "b.txt").unlink()
+    job = ingestor.ingest_directory(corpus, prune=False)
+    assert job.documents_deleted == 0
+    job = ingestor.ingest_directory(corpus)
+    assert job.documents_deleted == 1
+    assert all(row["url"].endswith("a.md") for row in store.rows.values())
+
+
+def test_same_named_directories_are_kept_apart(tmp_path):
+    for parent in ("a", "b"):
+        docs = tmp_path / parent / "docs"
+        docs.mkdir(parents=True)
+        (docs / f"{parent}.md").write_text(f"from {parent}", encoding="utf-8")
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=tmp_path)
+
+    ingestor.ingest_directory(tmp_path / "a" / "docs")
+    job = ingestor.ingest_directory(tmp_path / "b" / "docs", prune=True)
+    assert job.documents_deleted == 0
+    assert {row["url"] for row in store.rows.values()} == {
+        "milvus://documents/a/docs/a.md",
+        "milvus://documents/b/docs/b.md",
+    }
+
+
+def test_nested_directory_is_stored_once(tmp_path):
+    sub = tmp_path / "docs" / "sub"
+    sub.mkdir(parents=True)
+    (sub / "note.md").write_text("note", encoding="utf-8")
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=tmp_path)
+
+    ingestor.ingest_directory(sub)
+    job = ingestor.ingest_directory(tmp_path / "docs")
+    assert job.chunks_unchanged == 1
+    assert [row["url"] for row in store.rows.values()] == [
+        "milvus://documents/docs/sub/note.md"
+    ]
+
+
+def test_pruning_the_root_keeps_uploads(tmp_path):
+    (tmp_path / "kb").mkdir()
+    (tmp_path / "kb" / "a.md").write_text("a", encoding="utf-8")
+    store = FakeMilvus()
+    ingestor = DocumentIngestor(store, root=tmp_path)
+    ingestor.ingest_files([("up.md", b"uploaded")])
+    ingestor.ingest_directory(tmp_path)
+
+    (tmp_path / "kb" / "a.md").unlink()
+    job = ingestor.ingest_directory(tmp_path, prune=True)
+    assert job.documents_deleted == 1
+    assert [row["url"] for row in store.rows.values()] == [
+        "milvus://documents/uploads/up.md"
+    ]
+
+
+def test_ingest_files_uses_uploads_prefix():
+    store = FakeMilvus()
+    job = DocumentIngestor(store).ingest_files([("../etc/note.md", b"hello")])
+    assert job.chunks_added == 1
+    row = next(iter(store.rows.values()))
+    assert row["url"] == "milvus://documents/uploads/note.md"
+    assert row["metadata"]["source"] == "ingest"
+
+
+def test_job_manager_tracks_status():
+    manager = IngestionJobManager()
+    ok = manager.submit(lambda job: setattr(job, "chunks_added", 3))
+    failed = manager.submit(lambda job: 1 / 0)
+    deadline = time.monotonic() + 5
+    while failed.finished_at is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert manager.get(ok.id).status == "completed"
+    assert manager.get(ok.id).chunks_added == 3
+    assert failed.status == "failed"
+    assert "division by zero" in failed.error
+    assert manager.get("missing") is None
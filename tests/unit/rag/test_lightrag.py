@@ -48,7 +48,7 @@ def test_query_relevant_documents_api_format():
         }
     }
 
-    with patch("src.rag.lightrag.requests.post", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response):
         docs = provider.query_relevant_documents("什么是RAG")
 
         # 验证返回结果
@@ -87,7 +87,7 @@ def test_query_relevant_documents_merge_chunks():
         }
     }
 
-    with patch("src.rag.lightrag.requests.post", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response):
         docs = provider.query_relevant_documents("test")
 
         assert len(docs) == 1
@@ -112,7 +112,7 @@ def test_list_resources_api_format():
         "resources": ["default", "space1"]
     }
 
-    with patch("src.rag.lightrag.requests.get", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response):
         resources = provider.list_resources()
 
         # 验证返回结果
@@ -147,14 +147,14 @@ def test_query_relevant_documents_with_resources():
         }
     }
 
-    with patch("src.rag.lightrag.requests.post", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response) as request:
         # 验证资源参数被正确传递
         provider.query_relevant_documents("test query", [test_resource])
 
         # 检查请求是否包含正确的参数
-        from src.rag.lightrag import requests
-        requests.post.assert_called_once()
-        call_args = requests.post.call_args
+        request.assert_called_once()
+        assert request.call_args[0][0] == "POST"
+        call_args = request.call_args
         payload = call_args[1]['json']
 
         assert "resources" in payload
@@ -175,15 +175,15 @@ def test_list_resources_get_request():
         "resources": []
     }
 
-    with patch("src.rag.lightrag.requests.get", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response) as request:
         provider.list_resources("search query")
 
         # 验证使用了 GET 请求
-        from src.rag.lightrag import requests
-        requests.get.assert_called_once()
+        request.assert_called_once()
+        assert request.call_args[0][0] == "GET"
 
         # 验证查询参数
-        call_args = requests.get.call_args
+        call_args = request.call_args
         params = call_args[1]['params']
         assert params["query"] == "search query"
 
@@ -204,7 +204,7 @@ def test_list_resources_uri_cleanup():
         ]
     }
 
-    with patch("src.rag.lightrag.requests.get", return_value=mock_response):
+    with patch("src.rag.lightrag.request", return_value=mock_response):
         resources = provider.list_resources()
 
         assert len(resources) == 2
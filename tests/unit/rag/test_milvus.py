@@ -5,6 +5,7 @@ from __future__ import annotations
 from uuid import uuid4
 from types import SimpleNamespace
 from pathlib import Path
+import shutil
 import pytest
 
 import src.rag.milvus as milvus_mod
@@ -13,7 +14,6 @@ from src.rag.retriever import Resource
 
 
 class DummyEmbedding:
-
     def __init__(self, **kwargs):
         self.kwargs = kwargs
 
@@ -221,28 +221,58 @@ def test_list_resources_remote_success_and_dedup(monkeypatch):
     assert calls["similarity_search"] == 1
 
 
+class _RowIterator:
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    def next(self):
+        return self.batches.pop(0) if self.batches else []
+
+    def close(self):
+        pass
+
+
 def test_list_resources_lite_success(monkeypatch):
     _patch_init(monkeypatch)
     retriever = MilvusProvider()
 
     class DummyMilvusLite:
-        def query(self, collection_name, filter, output_fields, limit):  # noqa: D401
-            return [
-                {
-                    retriever.id_field: "idA",
-                    retriever.title_field: "Alpha",
-                    retriever.url_field: "u://a",
-                },
+        def query_iterator(self, collection_name, batch_size, filter, output_fields):
+            # More chunks than one query may return, several per document
+            rows = [
                 {
-                    retriever.id_field: "idB",
-                    retriever.title_field: "Beta",
-                    retriever.url_field: "u://b",
-                },
+                    retriever.id_field: f"id{i}",
+                    retriever.title_field: f"Doc {i // 2}",
+                    retriever.url_field: f"u://{i // 2}",
+                }
+                for i in range(300)
             ]
+            return _RowIterator([rows[:200], rows[200:]])
 
     retriever.client = DummyMilvusLite()
     resources = retriever.list_resources()
-    assert {r.title for r in resources} == {"Alpha", "Beta"}
+    assert len(resources) == 150
+    assert resources[0].title == "Doc 0"
+
+
+def test_list_resources_remote_without_query(monkeypatch):
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+
+    class RemoteClient:
+        class client:
+            @staticmethod
+            def query_iterator(collection_name, batch_size, filter, output_fields):
+                return _RowIterator(
+                    [[{retriever.title_field: "Alpha", retriever.url_field: "u://a"}]]
+                )
+
+        def similarity_search(self, query, k, expr):
+            raise AssertionError("listing must not embed a missing query")
+
+    retriever.client = RemoteClient()
+    assert [r.title for r in retriever.list_resources(None)] == ["Alpha"]
 
 
 def test_query_relevant_documents_lite_success(monkeypatch):
@@ -252,22 +282,23 @@ def test_query_relevant_documents_lite_success(monkeypatch):
     # Provide deterministic embedding output
     retriever.embedding_model.embed_query = lambda text: [0.1, 0.2, 0.3]  # type: ignore
 
+    captured = {}
+
     class DummyMilvusLite:
         def search(
-            self, collection_name, data, anns_field, param, limit, output_fields
+            self,
+            collection_name,
+            data,
+            anns_field,
+            search_params,
+            limit,
+            output_fields,
+            filter,
         ):  # noqa: D401
-            # Simulate two result entries
+            captured["filter"] = filter
+            # Simulate the filtered result entries
             return [
                 [
-                    {
-                        "entity": {
-                            retriever.id_field: "d1",
-                            retriever.content_field: "c1",
-                            retriever.title_field: "T1",
-                            retriever.url_field: "u1",
-                        },
-                        "distance": 0.9,
-                    },
                     {
                         "entity": {
                             retriever.id_field: "d2",
@@ -286,6 +317,10 @@ def test_query_relevant_documents_lite_success(monkeypatch):
         "question", resources=[Resource(uri="milvus://d2", title="", description="")]
     )
     assert len(docs) == 1 and docs[0].id == "d2" and docs[0].chunks[0].similarity == 0.8
+    assert captured["filter"] == 'url in ["milvus://d2"] or id in ["d2"]'
+
+    retriever.query_relevant_documents("question")
+    assert captured["filter"] == ""
 
 
 def test_query_relevant_documents_remote_success(monkeypatch):
@@ -299,8 +334,11 @@ def test_query_relevant_documents_remote_success(monkeypatch):
             self.page_content = content
             self.metadata = meta
 
+    captured = {}
+
     class RemoteClient:
-        def similarity_search_with_score(self, query, k):  # noqa: D401
+        def similarity_search_with_score(self, query, k, expr):  # noqa: D401
+            captured["expr"] = expr
             return [
                 (
                     DocObj(
@@ -313,17 +351,6 @@ def test_query_relevant_documents_remote_success(monkeypatch):
                     ),
                     0.7,
                 ),
-                (
-                    DocObj(
-                        "c2",
-                        {
-                            retriever.id_field: "d2",
-                            retriever.title_field: "T2",
-                            retriever.url_field: "u2",
-                        },
-                    ),
-                    0.6,
-                ),
             ]
 
     retriever.client = RemoteClient()
@@ -332,6 +359,7 @@ def test_query_relevant_documents_remote_success(monkeypatch):
         "q", resources=[Resource(uri="milvus://d1", title="", description="")]
     )
     assert len(docs) == 1 and docs[0].id == "d1" and docs[0].chunks[0].similarity == 0.7
+    assert captured["expr"] == 'url in ["milvus://d1"] or id in ["d1"]'
 
 
 def test_get_embedding_dimension_explicit(monkeypatch):
@@ -369,9 +397,7 @@ def test_create_collection_lite(monkeypatch):
         def list_collections(self):  # noqa: D401
             return []  # empty triggers creation
 
-        def create_collection(
-            self, collection_name, schema, index_params
-        ):  # noqa: D401
+        def create_collection(self, collection_name, schema, index_params):  # noqa: D401
             created["name"] = collection_name
             created["schema"] = schema
             created["index"] = index_params
@@ -379,6 +405,41 @@ def test_create_collection_lite(monkeypatch):
     retriever.client = DummyMilvusLite()
     retriever._ensure_collection_exists()
     assert created["name"] == retriever.collection_name
+    index = next(iter(created["index"]))
+    assert index.index_type == "IVF_FLAT"
+    assert index.get_index_configs()["nlist"] == 1024
+
+
+def test_index_and_search_params(monkeypatch):
+    _patch_init(monkeypatch)
+    monkeypatch.setenv("MILVUS_URI", "http://remote:19530")
+    monkeypatch.setenv("MILVUS_INDEX_TYPE", "hnsw")
+    monkeypatch.setenv("MILVUS_HNSW_M", "32")
+    monkeypatch.setenv("MILVUS_HNSW_EF", "4")
+    retriever = MilvusProvider()
+    assert retriever._index_params() == {
+        "index_type": "HNSW",
+        "metric_type": "IP",
+        "params": {"M": 32, "efConstruction": 200},
+    }
+    # ef is raised to top_k so the search can return k results.
+    assert retriever._search_params()["params"] == {"ef": retriever.top_k}
+
+    # Milvus Lite cannot build HNSW and falls back to FLAT.
+    monkeypatch.setenv("MILVUS_URI", "local.db")
+    lite = MilvusProvider()
+    assert lite._index_params()["index_type"] == "FLAT"
+    assert lite._search_params() == {"metric_type": "IP", "params": {}}
+
+    monkeypatch.setenv("MILVUS_INDEX_TYPE", "IVF_SQ8")
+    monkeypatch.setenv("MILVUS_IVF_NLIST", "8")
+    monkeypatch.setenv("MILVUS_IVF_NPROBE", "16")
+    monkeypatch.setenv("MILVUS_URI", "http://remote:19530")
+    assert MilvusProvider()._search_params()["params"] == {"nprobe": 8}
+
+    monkeypatch.setenv("MILVUS_INDEX_TYPE", "DISKANN")
+    with pytest.raises(ValueError):
+        MilvusProvider()
 
 
 def test_ensure_collection_exists_remote(monkeypatch):
@@ -414,51 +475,6 @@ def test_get_existing_document_ids_remote(monkeypatch):
     assert retriever._get_existing_document_ids() == set()
 
 
-def test_insert_document_chunk_lite_and_error(monkeypatch):
-    _patch_init(monkeypatch)
-    retriever = MilvusProvider()
-
-    captured = {}
-
-    class DummyMilvusLite:
-        def insert(self, collection_name, data):  # noqa: D401
-            captured["data"] = data
-
-    retriever.client = DummyMilvusLite()
-    retriever._insert_document_chunk(
-        doc_id="id1", content="hello", title="T", url="u", metadata={"m": 1}
-    )
-    assert captured["data"][0][retriever.id_field] == "id1"
-
-    # error path: patch embedding to raise
-    def bad_embed(text):  # noqa: D401
-        raise RuntimeError("boom")
-
-    retriever.embedding_model.embed_query = bad_embed  # type: ignore[attr-defined]
-    with pytest.raises(RuntimeError):
-        retriever._insert_document_chunk(
-            doc_id="id2", content="err", title="T", url="u", metadata={}
-        )
-
-
-def test_insert_document_chunk_remote(monkeypatch):
-    _patch_init(monkeypatch)
-    monkeypatch.setenv("MILVUS_URI", "http://remote")
-    retriever = MilvusProvider()
-    added = {}
-
-    class RemoteClient:
-        def add_texts(self, texts, metadatas):  # noqa: D401
-            added["texts"] = texts
-            added["meta"] = metadatas
-
-    retriever.client = RemoteClient()
-    retriever._insert_document_chunk(
-        doc_id="idx", content="ct", title="Title", url="urlx", metadata={"k": 2}
-    )
-    assert added["meta"][0][retriever.id_field] == "idx"
-
-
 def test_connect_lite_and_error(monkeypatch):
     # patch MilvusClient to a dummy
     class FakeMilvusClient:
@@ -518,7 +534,7 @@ def test_list_resources_remote_failure(monkeypatch):
 
     retriever.client = BadClient()
     # Should fallback to [] without raising
-    assert retriever.list_resources() == []
+    assert retriever.list_resources("query") == []
 
 
 def test_list_local_markdown_resources_empty(monkeypatch):
@@ -728,8 +744,8 @@ def test_load_example_files_directory_missing(monkeypatch):
     called = {"insert": 0}
     monkeypatch.setattr(
         retriever,
-        "_insert_document_chunk",
-        lambda **kwargs: (_ for _ in ()).throw(AssertionError("should not insert")),
+        "_insert_rows",
+        lambda rows: (_ for _ in ()).throw(AssertionError("should not insert")),
     )
     retriever._load_example_files()
     assert called["insert"] == 0  # sanity (no insertion attempted)
@@ -761,26 +777,16 @@ def test_load_example_files_loads_and_skips_existing(monkeypatch):
     monkeypatch.setattr(retriever, "_split_content", lambda content: ["part1", "part2"])
 
     calls = []
-
-    def record_insert(doc_id, content, title, url, metadata):
-        calls.append(
-            {
-                "doc_id": doc_id,
-                "content": content,
-                "title": title,
-                "url": url,
-                "metadata": metadata,
-            }
-        )
-
-    monkeypatch.setattr(retriever, "_insert_document_chunk", record_insert)
+    retriever.client = SimpleNamespace()
+    monkeypatch.setattr(retriever, "_insert_rows", calls.extend)
 
     retriever._load_example_files()
 
     # Only file2 processed -> two chunk inserts
     assert len(calls) == 2
     expected_ids = {f"{doc_id_file2}_chunk_0", f"{doc_id_file2}_chunk_1"}
-    assert {c["doc_id"] for c in calls} == expected_ids
+    assert {c["id"] for c in calls} == expected_ids
+    assert all(c["embedding"] == [0.1, 0.2, 0.3] for c in calls)
     assert all(c["metadata"]["file"] == "file2.md" for c in calls)
     assert all(c["metadata"]["source"] == "examples" for c in calls)
     assert all(c["title"] == "Title Two" for c in calls)
@@ -807,18 +813,261 @@ def test_load_example_files_single_chunk_no_suffix(monkeypatch):
     monkeypatch.setattr(retriever, "_get_existing_document_ids", lambda: set())
     monkeypatch.setattr(retriever, "_split_content", lambda content: ["onlychunk"])
 
-    captured = {}
-
-    def capture(doc_id, content, title, url, metadata):
-        captured["doc_id"] = doc_id
-        captured["title"] = title
-        captured["metadata"] = metadata
-
-    monkeypatch.setattr(retriever, "_insert_document_chunk", capture)
+    rows = []
+    retriever.client = SimpleNamespace()
+    monkeypatch.setattr(retriever, "_insert_rows", rows.extend)
 
     retriever._load_example_files()
 
-    assert captured["doc_id"] == base_doc_id  # no _chunk_ suffix
+    assert len(rows) == 1
+    captured = rows[0]
+    assert captured["id"] == base_doc_id  # no _chunk_ suffix
     assert captured["title"] == "Single Title"
     assert captured["metadata"]["file"] == "single.md"
     assert captured["metadata"]["source"] == "examples"
+
+
+def test_load_example_files_counts_only_fully_inserted(monkeypatch, caplog):
+    _patch_init(monkeypatch)
+    project_root = Path(milvus_mod.__file__).parent.parent.parent
+    examples_dir_name = f"examples_test_{uuid4().hex}"
+    examples_path = project_root / examples_dir_name
+    examples_path.mkdir()
+    try:
+        (examples_path / "good.md").write_text("# Good\nA", encoding="utf-8")
+        (examples_path / "bad.md").write_text("# Bad\nB", encoding="utf-8")
+
+        retriever = MilvusProvider()
+        retriever.examples_dir = examples_dir_name
+        retriever.embedding_batch_size = 1
+        retriever.insert_batch_size = 1
+        monkeypatch.setattr(retriever, "_get_existing_document_ids", lambda: set())
+        monkeypatch.setattr(retriever, "_split_content", lambda content: ["p1", "p2"])
+
+        def insert_rows(rows):
+            if any(
+                r["metadata"]["file"] == "bad.md" and r["content"] == "p2" for r in rows
+            ):
+                raise RuntimeError("insert failed")
+
+        retriever.client = SimpleNamespace()
+        monkeypatch.setattr(retriever, "_insert_rows", insert_rows)
+
+        with caplog.at_level("INFO", logger=milvus_mod.__name__):
+            retriever._load_example_files()
+    finally:
+        shutil.rmtree(examples_path)
+
+    assert "Failed to load example files into Milvus: bad.md" in caplog.text
+    assert "Successfully loaded 1 example files" in caplog.text
+
+
+def _chunk(i: int) -> dict:
+    return {
+        "id": f"doc_{i}",
+        "content": f"content {i}",
+        "title": "Title",
+        "url": "milvus://documents/doc.md",
+        "metadata": {"source": "examples", "file": "doc.md"},
+    }
+
+
+def test_insert_chunks_batches_embeddings_and_inserts(monkeypatch):
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    retriever.embedding_batch_size = 3
+    retriever.insert_batch_size = 4
+    retriever.embedding_concurrency = 2
+    embed_calls = []
+
+    def embed_documents(texts):
+        embed_calls.append(list(texts))
+        return [[float(t.split()[-1])] for t in texts]
+
+    retriever.embedding_model.embed_documents = embed_documents  # type: ignore
+    inserted = []
+    retriever.client = SimpleNamespace(
+        insert=lambda collection_name, data: inserted.append(data)
+    )
+    reports = []
+
+    progress = retriever.insert_chunks(
+        (_chunk(i) for i in range(10)), on_progress=lambda p: reports.append(p)
+    )
+
+    assert [len(c) for c in embed_calls] == [3, 3, 3, 1]
+    assert [len(batch) for batch in inserted] == [6, 4]
+    rows = [row for batch in inserted for row in batch]
+    assert [row["id"] for row in rows] == [f"doc_{i}" for i in range(10)]
+    assert all(row["embedding"] == [float(row["id"][4:])] for row in rows)
+    assert rows[0]["file"] == "doc.md"
+    assert progress.chunks_inserted == 10
+    assert progress.chunks_failed == 0
+    assert len(reports) == 2
+
+
+def test_insert_chunks_retries_then_skips_failed_batch(monkeypatch):
+    _patch_init(monkeypatch)
+    monkeypatch.setattr(milvus_mod.time, "sleep", lambda s: None)
+    retriever = MilvusProvider()
+    retriever.embedding_batch_size = 2
+    retriever.embedding_max_retries = 1
+    attempts = {}
+
+    def embed_documents(texts):
+        key = texts[0]
+        attempts[key] = attempts.get(key, 0) + 1
+        if key == "content 0" and attempts[key] == 1:
+            raise RuntimeError("transient")
+        if key == "content 2":
+            raise RuntimeError("permanent")
+        return [[0.1] for _ in texts]
+
+    retriever.embedding_model.embed_documents = embed_documents  # type: ignore
+    inserted = []
+    retriever.client = SimpleNamespace(
+        insert=lambda collection_name, data: inserted.extend(data)
+    )
+
+    progress = retriever.insert_chunks(_chunk(i) for i in range(4))
+
+    assert attempts == {"content 0": 2, "content 2": 2}
+    assert [row["id"] for row in inserted] == ["doc_0", "doc_1"]
+    assert progress.chunks_inserted == 2
+    assert progress.chunks_failed == 2
+
+
+def test_insert_chunks_remote_uses_add_embeddings(monkeypatch):
+    _patch_init(monkeypatch)
+    monkeypatch.setenv("MILVUS_URI", "http://remote")
+    retriever = MilvusProvider()
+    captured = {}
+
+    def add_embeddings(ids, texts, embeddings, metadatas, batch_size):
+        captured.update(
+            ids=ids, texts=texts, embeddings=embeddings, metadatas=metadatas
+        )
+
+    retriever.client = SimpleNamespace(add_embeddings=add_embeddings)
+
+    retriever.insert_chunks([_chunk(0), {**_chunk(1), "content": "  "}])
+
+    assert captured["ids"] == ["doc_0"]
+    assert captured["texts"] == ["content 0"]
+    assert captured["embeddings"] == [[0.1, 0.2, 0.3]]
+    assert captured["metadatas"][0]["id"] == "doc_0"
+
+
+def test_get_chunk_ids_by_url_and_delete_lite(monkeypatch):
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    calls = {}
+
+    class Iterator:
+        def __init__(self, batches):
+            self.batches = batches
+
+        def next(self):
+            return self.batches.pop(0) if self.batches else []
+
+        def close(self):
+            calls["closed"] = True
+
+    class DummyMilvusLite:
+        def query_iterator(self, collection_name, batch_size, filter, output_fields):
+            calls["filter"] = filter
+            return Iterator(
+                [
+                    [
+                        {"id": "c1", "url": "milvus://documents/kb/a.md"},
+                        {"id": "c2", "url": "milvus://documents/kb/a.md"},
+                    ],
+                    [
+                        {"id": "c3", "url": "milvus://documents/kb/b.md"},
+                        {"id": "c4", "url": "milvus://documents/kbx/c.md"},
+                    ],
+                ]
+            )
+
+        def delete(self, collection_name, ids):
+            calls["deleted"] = ids
+
+    retriever.client = DummyMilvusLite()
+    grouped = retriever.get_chunk_ids_by_url("milvus://documents/kb/")
+    assert grouped == {
+        "milvus://documents/kb/a.md": {"c1", "c2"},
+        "milvus://documents/kb/b.md": {"c3"},
+    }
+    assert calls["filter"] == 'url like "milvus://documents/kb/%"'
+    assert calls["closed"]
+
+    retriever.delete_chunks(["c1"])
+    assert calls["deleted"] == ["c1"]
+
+
+def test_get_embedding_uses_query_cache(monkeypatch):
+    _patch_init(monkeypatch)
+    retriever = MilvusProvider()
+    calls = []
+
+    def embed_query(text):
+        calls.append(text)
+        return [0.1, 0.2, 0.3]
+
+    retriever.embedding_model.embed_query = embed_query  # type: ignore
+    assert retriever._get_embedding("same query") == [0.1, 0.2, 0.3]
+    assert retriever._get_embedding(" same  query ") == [0.1, 0.2, 0.3]
+    assert calls == ["same query"]
+    assert retriever.embedding_cache.stats()["hits"] == 1
+
+
+def test_hybrid_search_indexes_inserts_and_fuses(monkeypatch, tmp_path):
+    _patch_init(monkeypatch)
+    monkeypatch.setenv("MILVUS_URI", "local.db")
+    monkeypatch.setenv("MILVUS_HYBRID_SEARCH", "true")
+    monkeypatch.setenv("MILVUS_BM25_PATH", str(tmp_path / "bm25.db"))
+    retriever = MilvusProvider()
+    retriever.top_k = 1
+
+    class DummyMilvusLite:
+        def insert(self, collection_name, data):
+            pass
+
+        def delete(self, collection_name, ids):
+            pass
+
+        def search(self, limit, **kwargs):
+            entity = {
+                retriever.id_field: "vec",
+                retriever.content_field: "semantic match",
+                retriever.title_field: "",
+                retriever.url_field: "milvus://vec",
+            }
+            return [[{"entity": entity, "distance": 0.9}]]
+
+    retriever.client = DummyMilvusLite()
+    retriever._insert_rows(
+        [
+            {
+                "id": "kw",
+                "embedding": [0.0],
+                "content": "The ERR_4012 handler",
+                "title": "Errors",
+                "url": "milvus://kw",
+                "metadata": {},
+            }
+        ]
+    )
+
+    docs = retriever.query_relevant_documents("ERR_4012")
+    # RRF: "kw" ranks first in BM25; "vec" first in the vector search. Tie
+    # is broken by the vector ranking, so widen top_k to see both.
+    assert docs[0].id == "vec"
+    retriever.top_k = 2
+    assert {d.id for d in retriever.query_relevant_documents("ERR_4012")} == {
+        "vec",
+        "kw",
+    }
+
+    retriever.delete_chunks(["kw"])
+    assert retriever.keyword_index.search("err_4012", 5) == []
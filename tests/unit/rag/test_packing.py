@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from src.rag.packing import mmr_order, pack_documents
+from src.rag.retriever import Chunk, Document
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def test_mmr_prefers_diverse_items():
+    relevance = np.array([1.0, 0.95, 0.6])
+    vectors = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+    order = [index for index, _, _ in mmr_order(relevance, vectors, 0.5)]
+    assert order == [0, 2, 1]
+    # Pure relevance keeps the original ranking.
+    assert [i for i, _, _ in mmr_order(relevance, vectors, 1.0)] == [0, 1, 2]
+
+
+def test_pack_skips_duplicates_and_keeps_distinct_evidence():
+    repeated = "Paris is the capital of France. It is on the Seine."
+    doc = Document(
+        id="d1",
+        url="u1",
+        title="France",
+        chunks=[
+            Chunk(repeated, 0.9),
+            Chunk(repeated, 0.89),
+            Chunk("Lyon is known for its cuisine. It lies on the Rhone.", 0.7),
+        ],
+    )
+
+    packed = pack_documents([doc], max_tokens=40, count_tokens=count_words)
+
+    assert packed == [
+        {
+            "id": "d1",
+            "url": "u1",
+            "title": "France",
+            "content": repeated + "\n\n"
+            "Lyon is known for its cuisine. It lies on the Rhone.",
+        }
+    ]
+
+
+def test_pack_uses_embeddings_for_redundancy():
+    doc = Document(
+        id="d1",
+        chunks=[
+            Chunk("alpha text", 0.9, embedding=[1.0, 0.0]),
+            Chunk("different words entirely", 0.85, embedding=[1.0, 0.01]),
+            Chunk("gamma text", 0.5, embedding=[0.0, 1.0]),
+        ],
+    )
+    packed = pack_documents([doc], max_tokens=4, count_tokens=count_words)
+    # The second chunk is a semantic duplicate despite sharing no words.
+    assert packed[0]["content"] == "alpha text\n\ngamma text"
+
+
+def test_pack_trims_to_whole_sentences_within_budget():
+    doc = Document(
+        id="d1",
+        chunks=[Chunk("One two three. Four five six. Seven eight nine.", 0.9)],
+    )
+    packed = pack_documents([doc], max_tokens=7, count_tokens=count_words)
+    assert packed[0]["content"] == "One two three. Four five six."
+
+    # Not even one sentence fits: nothing is returned instead of a fragment.
+    assert pack_documents([doc], max_tokens=2, count_tokens=count_words) == []
+
+
+def test_pack_respects_document_limit_and_rank_order():
+    docs = [
+        Document(id=f"d{i}", chunks=[Chunk(f"fact number {i} here.", 1.0 - i / 10)])
+        for i in range(5)
+    ]
+    packed = pack_documents(docs, max_tokens=100, max_docs=2, count_tokens=count_words)
+    assert [d["id"] for d in packed] == ["d0", "d1"]
@@ -89,7 +89,7 @@ def test_init_missing_env(monkeypatch):
         RAGFlowProvider()
 
 
-@patch("src.rag.ragflow.requests.post")
+@patch("src.rag.ragflow.request")
 def test_query_relevant_documents_success(mock_post, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -115,7 +115,7 @@ def test_query_relevant_documents_success(mock_post, monkeypatch):
     assert docs[0].chunks[0].similarity == 0.9
 
 
-@patch("src.rag.ragflow.requests.post")
+@patch("src.rag.ragflow.request")
 def test_query_relevant_documents_error(mock_post, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -128,7 +128,7 @@ def test_query_relevant_documents_error(mock_post, monkeypatch):
         provider.query_relevant_documents("query", [])
 
 
-@patch("src.rag.ragflow.requests.get")
+@patch("src.rag.ragflow.request")
 def test_list_resources_success(mock_get, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -152,7 +152,33 @@ def test_list_resources_success(mock_get, monkeypatch):
     assert resources[1].description == "desc2"
 
 
-@patch("src.rag.ragflow.requests.get")
+@patch("src.rag.ragflow.request")
+def test_list_resources_lists_every_page(mock_get, monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    provider.dataset_page_size = 2
+    pages = [
+        [{"id": "1", "name": "A"}, {"id": "2", "name": "B"}],
+        [{"id": "3", "name": "C"}],
+    ]
+
+    def respond(method, url, headers, params, timeout):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"data": pages[params["page"] - 1]}
+        return response
+
+    mock_get.side_effect = respond
+    assert [r.title for r in provider.list_resources()] == ["A", "B", "C"]
+    assert mock_get.call_count == 2
+
+    mock_get.reset_mock()
+    provider.list_resources("A")
+    assert mock_get.call_args.kwargs["params"]["name"] == "A"
+
+
+@patch("src.rag.ragflow.request")
 def test_list_resources_error(mock_get, monkeypatch):
     monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
     monkeypatch.setenv("RAGFLOW_API_KEY", "key")
@@ -163,3 +189,33 @@ def test_list_resources_error(mock_get, monkeypatch):
     mock_get.return_value = mock_response
     with pytest.raises(Exception):
         provider.list_resources()
+
+
+@pytest.mark.asyncio
+async def test_aquery_relevant_documents(monkeypatch):
+    monkeypatch.setenv("RAGFLOW_API_URL", "http://api")
+    monkeypatch.setenv("RAGFLOW_API_KEY", "key")
+    provider = RAGFlowProvider()
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {
+        "data": {
+            "doc_aggs": [{"doc_id": "doc1", "doc_name": "Doc1"}],
+            "chunks": [{"document_id": "doc1", "content": "chunk", "similarity": 0.9}],
+        }
+    }
+    calls = []
+
+    async def fake_arequest(method, url, **kwargs):
+        calls.append((method, url, kwargs))
+        return resp
+
+    monkeypatch.setattr("src.rag.ragflow.arequest", fake_arequest)
+    docs = await provider.aquery_relevant_documents(
+        "q", [DummyResource("rag://dataset/123#456")]
+    )
+    assert docs[0].id == "doc1"
+    assert docs[0].chunks[0].content == "chunk"
+    method, url, kwargs = calls[0]
+    assert (method, url) == ("POST", "http://api/api/v1/retrieval")
+    assert kwargs["json"]["document_ids"] == ["456"]
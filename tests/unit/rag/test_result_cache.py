@@ -0,0 +1,150 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import src.rag.builder as builder
+from src.rag.builder import RetrieverRegistry
+from src.rag.ingestion import DocumentIngestor
+from src.rag.milvus import IngestionProgress
+from src.rag.result_cache import (
+    CachedRetriever,
+    SemanticResultCache,
+    invalidate_result_caches,
+    unwrap_retriever,
+    with_result_cache,
+)
+from src.rag.retriever import Chunk, Document, Resource, Retriever
+
+
+class CountingRetriever(Retriever):
+    def __init__(self):
+        self.queries = []
+
+    def list_resources(self, query=None):
+        return []
+
+    def query_relevant_documents(self, query, resources=[]):
+        self.queries.append(query)
+        return [Document(id=query, chunks=[Chunk(f"about {query}", 0.9)])]
+
+    def query_background_knowledge(self, query, resources):
+        return {"background": query}
+
+
+class EmbeddingRetriever(CountingRetriever):
+    """Exposes a provider query embedding like Milvus does."""
+
+    def _get_embedding(self, text):
+        return [1.0, 0.0] if "paris" in text.lower() else [0.0, 1.0]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_and_semantic_hits_share_results():
+    inner = EmbeddingRetriever()
+    retriever = CachedRetriever(inner, SemanticResultCache(threshold=0.9))
+
+    first = retriever.query_relevant_documents("Capital of France? Paris")
+    assert retriever.query_relevant_documents(" Capital  of France? Paris")[0].id == (
+        first[0].id
+    )
+    # Different words, same provider embedding: served from the cache.
+    assert retriever.query_relevant_documents("Is Paris the capital")[0].id == (
+        first[0].id
+    )
+    retriever.query_relevant_documents("Berlin")
+    assert len(inner.queries) == 2
+    assert retriever.cache.stats()["semantic_hits"] == 1
+    assert retriever.cache.stats()["hit_rate"] == 0.5
+
+
+def test_resource_set_is_part_of_the_key():
+    inner = CountingRetriever()
+    retriever = CachedRetriever(inner, SemanticResultCache())
+    a = Resource(uri="rag://a", title="A")
+    b = Resource(uri="rag://b", title="B")
+
+    retriever.query_relevant_documents("q", [a, b])
+    retriever.query_relevant_documents("q", [b, a])
+    retriever.query_relevant_documents("q", [a])
+    retriever.query_relevant_documents("q")
+    assert inner.queries == ["q", "q", "q"]
+
+
+def test_ttl_and_size_bound():
+    clock = FakeClock()
+    inner = CountingRetriever()
+    cache = SemanticResultCache(ttl=10, max_entries=2, clock=clock)
+    retriever = CachedRetriever(inner, cache)
+
+    for query in ("one", "two", "three"):
+        retriever.query_relevant_documents(query)
+    retriever.query_relevant_documents("one")  # evicted, fetched again
+    assert len(inner.queries) == 4
+    assert cache.stats()["evictions"] == 2
+
+    clock.now = 11
+    retriever.query_relevant_documents("one")
+    assert len(inner.queries) == 5
+    assert cache.stats()["expirations"] == 2
+
+
+def test_ingestion_invalidates_and_drops_in_flight_results():
+    inner = CountingRetriever()
+    retriever = CachedRetriever(inner, SemanticResultCache())
+    retriever.query_relevant_documents("q")
+    invalidate_result_caches()
+    retriever.query_relevant_documents("q")
+    assert len(inner.queries) == 2
+
+    class IngestingRetriever(CountingRetriever):
+        def query_relevant_documents(self, query, resources=[]):
+            invalidate_result_caches()  # ingestion finishes mid-query
+            return super().query_relevant_documents(query, resources)
+
+    racing = CachedRetriever(IngestingRetriever(), SemanticResultCache())
+    racing.query_relevant_documents("q")
+    assert racing.cache.stats()["size"] == 0
+
+
+def test_ingestor_invalidates_caches(tmp_path):
+    class Store:
+        collection_name = "kb"
+
+        def get_chunk_ids_by_url(self, prefix):
+            return {}
+
+        def _split_content(self, text):
+            return [text]
+
+        def insert_chunks(self, chunks, on_progress=None):
+            list(chunks)
+            return IngestionProgress(chunks_inserted=1)
+
+        def delete_chunks(self, ids):
+            pass
+
+    cache = SemanticResultCache()
+    DocumentIngestor(Store()).ingest_files([("a.md", b"# A")])
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_registry_wraps_when_enabled(monkeypatch):
+    monkeypatch.setattr(builder, "_create_retriever", lambda p: CountingRetriever())
+    monkeypatch.setattr(builder, "SELECTED_RAG_PROVIDER", "milvus")
+    assert isinstance(RetrieverRegistry().get(), CountingRetriever)
+
+    monkeypatch.setenv("RAG_RESULT_CACHE", "true")
+    monkeypatch.setenv("RAG_RESULT_CACHE_TTL", "5")
+    retriever = RetrieverRegistry().get()
+    assert isinstance(retriever, CachedRetriever)
+    assert retriever.cache.ttl == 5
+    assert isinstance(unwrap_retriever(retriever), CountingRetriever)
+    # Provider-specific methods stay reachable through the wrapper.
+    assert retriever.query_background_knowledge("x", []) == {"background": "x"}
+    assert with_result_cache(retriever.retriever) is not retriever
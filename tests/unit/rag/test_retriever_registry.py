@@ -0,0 +1,165 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import threading
+
+import pytest
+
+import src.rag.builder as builder
+from src.rag.builder import RetrieverRegistry
+from src.rag.retriever import Retriever
+
+
+class DummyRetriever(Retriever):
+    instances = 0
+
+    def __init__(self):
+        DummyRetriever.instances += 1
+        self.healthy = True
+        self.connects = 0
+        self.closes = 0
+
+    def list_resources(self, query=None):
+        return []
+
+    def query_relevant_documents(self, query, resources=[]):
+        return []
+
+    def connect(self):
+        self.connects += 1
+
+    def close(self):
+        self.closes += 1
+
+    def health_check(self):
+        return self.healthy
+
+
+@pytest.fixture(autouse=True)
+def dummy_provider(monkeypatch):
+    DummyRetriever.instances = 0
+
+    def fake_create(provider):
+        if provider != "milvus":
+            raise ValueError(f"Unsupported RAG provider: {provider}")
+        return DummyRetriever()
+
+    monkeypatch.setattr(builder, "_create_retriever", fake_create)
+    monkeypatch.setattr(builder, "SELECTED_RAG_PROVIDER", "milvus")
+
+
+def test_get_reuses_instance():
+    registry = RetrieverRegistry()
+    assert registry.get() is registry.get("milvus")
+    assert DummyRetriever.instances == 1
+
+
+def test_get_without_provider_returns_none(monkeypatch):
+    monkeypatch.setattr(builder, "SELECTED_RAG_PROVIDER", None)
+    assert RetrieverRegistry().get() is None
+
+
+def test_unsupported_provider_raises():
+    with pytest.raises(ValueError):
+        RetrieverRegistry().get("unknown")
+
+
+def test_config_change_creates_new_instance(monkeypatch):
+    registry = RetrieverRegistry()
+    monkeypatch.setenv("MILVUS_COLLECTION", "a")
+    first = registry.get()
+    monkeypatch.setenv("MILVUS_COLLECTION", "b")
+    assert registry.get() is not first
+    monkeypatch.setenv("MILVUS_COLLECTION", "a")
+    assert registry.get() is first
+
+
+def test_unhealthy_retriever_is_replaced():
+    registry = RetrieverRegistry(health_check_interval=0)
+    retriever = registry.get()
+    retriever.healthy = False
+    fresh = registry.get()
+    assert fresh is not retriever
+    assert fresh.connects == 1
+    # Requests still using the old instance are not cut off.
+    assert retriever.closes == 0
+    assert registry.get() is fresh
+
+
+def test_replaced_retriever_is_closed_after_grace_period():
+    registry = RetrieverRegistry(health_check_interval=0, retire_grace_period=0)
+    retriever = registry.get()
+    retriever.healthy = False
+    fresh = registry.get()
+    assert retriever.closes == 0
+    registry.get()
+    assert retriever.closes == 1
+    assert fresh.closes == 0
+
+
+def test_shutdown_closes_replaced_retrievers():
+    registry = RetrieverRegistry(health_check_interval=0, retire_grace_period=3600)
+    retriever = registry.get()
+    retriever.healthy = False
+    registry.get()
+    registry.shutdown()
+    assert retriever.closes == 1
+
+
+def test_concurrent_health_checks_reconnect_once():
+    registry = RetrieverRegistry(health_check_interval=0)
+    retriever = registry.get()
+    retriever.healthy = False
+    barrier = threading.Barrier(8)
+    checking = threading.Event()
+    release = threading.Event()
+
+    def slow_check():
+        checking.set()
+        release.wait(5)
+        return False
+
+    retriever.health_check = slow_check
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(registry.get())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    checking.wait(5)
+    release.set()
+    for t in threads:
+        t.join()
+    assert DummyRetriever.instances == 2
+    assert registry.get() in results
+
+
+def test_startup_and_shutdown():
+    registry = RetrieverRegistry()
+    registry.startup()
+    retriever = registry.get()
+    assert retriever.connects == 1
+    registry.shutdown()
+    assert retriever.closes == 1
+    assert registry.get() is not retriever
+
+
+def test_concurrent_get_creates_single_instance():
+    registry = RetrieverRegistry()
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(registry.get())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert DummyRetriever.instances == 1
+    assert all(r is results[0] for r in results)
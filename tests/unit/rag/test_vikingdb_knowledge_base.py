@@ -217,6 +217,19 @@ class TestVikingDBKnowledgeBaseProviderSignature:
         assert isinstance(result, bytes)
         assert len(result) == 32  # SHA256 digest is 32 bytes
 
+    def test_get_signed_key_is_cached_per_day(self, provider):
+        """Test signed key is derived once per date"""
+        with patch.object(
+            provider, "_hmac_sha256", wraps=provider._hmac_sha256
+        ) as mock_hmac:
+            first = provider._get_signed_key("sk", "20250722", "cn-north-1", "air")
+            again = provider._get_signed_key("sk", "20250722", "cn-north-1", "air")
+            assert first == again
+            assert mock_hmac.call_count == 4
+            next_day = provider._get_signed_key("sk", "20250723", "cn-north-1", "air")
+            assert next_day != first
+            assert mock_hmac.call_count == 8
+
     def test_create_canonical_request(self, provider):
         """Test canonical request creation"""
         method = "POST"
@@ -260,7 +273,7 @@ class TestVikingDBKnowledgeBaseProviderSignature:
         assert "Authorization" in result
         assert "HMAC-SHA256" in result["Authorization"]
 
-    @patch("src.rag.vikingdb_knowledge_base.requests.request")
+    @patch("src.rag.vikingdb_knowledge_base.request")
     def test_make_signed_request_success(self, mock_request, provider):
         """Test successful signed request"""
         mock_response = MagicMock()
@@ -280,7 +293,7 @@ class TestVikingDBKnowledgeBaseProviderSignature:
         assert call_args[1]["url"] == f"https://{provider.api_url}/api/test"
         assert call_args[1]["timeout"] == 30
 
-    @patch("src.rag.vikingdb_knowledge_base.requests.request")
+    @patch("src.rag.vikingdb_knowledge_base.request")
     def test_make_signed_request_with_exception(self, mock_request, provider):
         """Test signed request with exception"""
         mock_request.side_effect = Exception("Network error")
@@ -12,6 +12,9 @@ from langchain_core.messages import AIMessageChunk, ToolMessage
 from langgraph.types import Command
 
 from src.config.report_style import ReportStyle
+from src.rag.ingestion import IngestionJob
+from src.rag.milvus import MilvusRetriever
+from src.rag.result_cache import CachedRetriever, SemanticResultCache
 from src.server.app import _astream_workflow_generator, _make_event, app
 
 
@@ -384,6 +387,62 @@ class TestRAGEndpoints:
         assert response.status_code == 200
         assert response.json()["resources"] == []
 
+    @patch.dict(os.environ, {"ENABLE_RAG_INGEST": "false"})
+    def test_rag_ingest_disabled(self, client):
+        response = client.post("/api/rag/ingest", data={"paths": ["docs"]})
+
+        assert response.status_code == 403
+
+    @patch.dict(os.environ, {"ENABLE_RAG_INGEST": "true"})
+    @patch("src.server.app.build_retriever")
+    def test_rag_ingest_rejects_path_outside_root(
+        self, mock_build_retriever, client, tmp_path
+    ):
+        mock_build_retriever.return_value = MagicMock(spec=MilvusRetriever)
+
+        with patch.dict(os.environ, {"RAG_INGEST_ROOT": str(tmp_path)}):
+            response = client.post("/api/rag/ingest", data={"paths": ["../"]})
+
+        assert response.status_code == 400
+
+    @patch.dict(os.environ, {"ENABLE_RAG_INGEST": "true"})
+    @patch("src.server.app.ingestion_jobs")
+    @patch("src.server.app.build_retriever")
+    def test_rag_ingest_upload_starts_job(
+        self, mock_build_retriever, mock_jobs, client
+    ):
+        mock_build_retriever.return_value = MagicMock(spec=MilvusRetriever)
+        mock_jobs.submit.return_value = IngestionJob(id="job-1")
+
+        response = client.post(
+            "/api/rag/ingest", files=[("files", ("a.md", b"# A", "text/markdown"))]
+        )
+
+        assert response.status_code == 200
+        assert response.json()["id"] == "job-1"
+        assert response.json()["status"] == "pending"
+        mock_jobs.submit.assert_called_once()
+
+    def test_rag_ingest_status_not_found(self, client):
+        response = client.get("/api/rag/ingest/unknown")
+
+        assert response.status_code == 404
+
+    @patch("src.server.app.build_retriever")
+    def test_rag_cache_stats(self, mock_build_retriever, client):
+        cache = SemanticResultCache()
+        cache.misses = 3
+        mock_build_retriever.return_value = CachedRetriever(MagicMock(), cache)
+
+        response = client.get("/api/rag/cache")
+
+        assert response.status_code == 200
+        assert response.json()["enabled"] is True
+        assert response.json()["misses"] == 3
+
+        mock_build_retriever.return_value = None
+        assert client.get("/api/rag/cache").json()["enabled"] is False
+
 
 class TestChatStreamEndpoint:
     @patch("src.server.app.graph")
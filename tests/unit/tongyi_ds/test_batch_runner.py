@@ -0,0 +1,152 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# tongyi-ds is a standalone script directory with flat imports.
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "tongyi-ds"))
+
+import batch_runner  # noqa: E402
+from batch_runner import (  # noqa: E402
+    INDEX_SUFFIX,
+    BatchRunner,
+    ResumeIndex,
+    RolloutWriter,
+    question_key,
+)
+
+
+def _write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def _task(question, rollout_idx=1, **item):
+    return {"item": {"question": question, **item}, "rollout_idx": rollout_idx}
+
+
+def test_resume_index_rebuilds_from_legacy_output(tmp_path):
+    output = tmp_path / "iter1.jsonl"
+    _write_lines(
+        output,
+        [
+            json.dumps({"question": "  done  ", "prediction": "a"}),
+            json.dumps(
+                {"question": "failed", "error": "Timeout", "prediction": "[Failed]"}
+            ),
+            "{not json",
+            json.dumps({"prediction": "no question"}),
+        ],
+    )
+
+    index = ResumeIndex(str(output))
+    assert index.load() == {question_key("done")}
+    assert "done" in index
+    assert "failed" not in index
+    # The sidecar is written once and read from then on.
+    sidecar = Path(str(output) + INDEX_SUFFIX)
+    assert sidecar.read_text(encoding="utf-8") == question_key("done") + "\n"
+    output.unlink()
+    assert ResumeIndex(str(output)).load() == {question_key("done")}
+
+
+def test_resume_index_without_output_is_empty(tmp_path):
+    index = ResumeIndex(str(tmp_path / "iter1.jsonl"))
+    assert index.load() == set()
+    assert not Path(index.path).exists()
+
+
+def test_writer_only_indexes_results_without_error(tmp_path):
+    output = tmp_path / "iter1.jsonl"
+    writer = RolloutWriter(str(output))
+    writer.write("ok", {"question": "ok", "prediction": "a"})
+    writer.write("bad", {"question": "bad", "error": "boom"})
+    writer.close()
+
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+    assert ResumeIndex(str(output)).load() == {question_key("ok")}
+
+
+def test_writer_flushes_whole_records_output_first(tmp_path, monkeypatch):
+    output = tmp_path / "iter1.jsonl"
+    writer = RolloutWriter(str(output))
+    synced = []
+    monkeypatch.setattr(batch_runner.os, "fsync", synced.append)
+
+    writer.write("q", {"question": "q", "prediction": "a"})
+    assert output.read_text(encoding="utf-8") == ""
+    assert synced == []
+
+    writer.flush()
+    assert synced == [writer.output.fileno(), writer.index.fileno()]
+    assert json.loads(output.read_text(encoding="utf-8")) == {
+        "question": "q",
+        "prediction": "a",
+    }
+
+    # Nothing buffered: nothing to write or sync.
+    writer.flush()
+    assert len(synced) == 2
+    writer.close()
+
+
+def test_writer_terminates_partial_last_line(tmp_path):
+    output = tmp_path / "iter1.jsonl"
+    output.write_text(
+        json.dumps({"question": "done"}) + "\n" + '{"question": "cut', encoding="utf-8"
+    )
+
+    writer = RolloutWriter(str(output))
+    writer.write("next", {"question": "next"})
+    writer.close()
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[1] == '{"question": "cut'
+    assert json.loads(lines[2]) == {"question": "next"}
+    assert ResumeIndex(str(output)).load() == {question_key("next")}
+
+
+def test_runner_writes_results_and_errors(tmp_path):
+    def run_task(task):
+        if task["item"]["question"] == "bad":
+            raise ValueError("boom")
+        return {"question": task["item"]["question"], "prediction": "a"}
+
+    writers = {1: RolloutWriter(str(tmp_path / "iter1.jsonl"))}
+    runner = BatchRunner(run_task, writers, concurrency=2)
+    asyncio.run(runner.run([_task("ok"), _task("bad", answer="x")]))
+    writers[1].close()
+
+    assert (runner.done, runner.failed) == (2, 1)
+    results = {
+        r["question"]: r
+        for r in map(json.loads, (tmp_path / "iter1.jsonl").open(encoding="utf-8"))
+    }
+    assert results["ok"]["prediction"] == "a"
+    assert results["bad"]["error"] == "Future resolution failed: boom"
+    assert results["bad"]["answer"] == "x"
+    assert ResumeIndex(str(tmp_path / "iter1.jsonl")).load() == {question_key("ok")}
+
+
+def test_task_timeout_counts_from_task_start(tmp_path):
+    def run_task(task):
+        time.sleep(task["item"]["seconds"])
+        return {"question": task["item"]["question"]}
+
+    writers = {1: RolloutWriter(str(tmp_path / "iter1.jsonl"))}
+    runner = BatchRunner(run_task, writers, concurrency=1, task_timeout=0.5)
+    # The slow task times out but keeps the only thread busy for another
+    # 0.5s; the quick task queued behind it must not be charged for that.
+    asyncio.run(runner.run([_task("slow", seconds=1.0), _task("quick", seconds=0.2)]))
+    writers[1].close()
+
+    results = {
+        r["question"]: r
+        for r in map(json.loads, (tmp_path / "iter1.jsonl").open(encoding="utf-8"))
+    }
+    assert results["slow"]["error"] == "Timeout (>0.5s)"
+    assert "error" not in results["quick"]
+    assert (runner.done, runner.failed) == (2, 1)
@@ -0,0 +1,187 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# tongyi-ds is a standalone script directory with flat imports.
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "tongyi-ds"))
+
+import context_compactor  # noqa: E402
+from context_compactor import (  # noqa: E402
+    DROPPED_MARK,
+    OBS_END,
+    OBS_START,
+    SUMMARY_MARK,
+    ContextCompactor,
+)
+
+
+class Summarizer:
+    """Stub ``summarize`` recording the tool outputs it was asked about."""
+
+    def __init__(self, summary="facts", gate=None):
+        self.summary = summary
+        self.gate = gate
+        self.calls = []
+
+    def __call__(self, question, tool_output):
+        self.calls.append(tool_output)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.summary
+
+
+def count_tokens(messages):
+    """Fake token counter: one token per character of content."""
+    return sum(len(msg["content"]) for msg in messages)
+
+
+def _history(*bodies):
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "question"},
+    ]
+    for body in bodies:
+        messages.append({"role": "assistant", "content": "call"})
+        messages.append({"role": "user", "content": f"{OBS_START}\n{body}\n{OBS_END}"})
+    return messages
+
+
+def _responses(messages):
+    return [m["content"] for m in messages if m["content"].startswith(OBS_START)]
+
+
+def _wait_for_summaries(compactor):
+    for future in list(compactor._summaries.values()):
+        future.result(timeout=5)
+
+
+def test_compact_summarizes_oldest_and_keeps_recent():
+    summarize = Summarizer()
+    compactor = ContextCompactor("q", summarize=summarize, budget=1100, keep_recent=2)
+    messages = _history("a" * 400, "b" * 400, "c" * 400, "d" * 400)
+    recent = _responses(messages)[2:]
+
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+    assert summarize.calls == ["a" * 400, "b" * 400]
+
+    assert compactor.compact(messages, count_tokens) <= 1100
+    responses = _responses(messages)
+    assert responses[0] == f"{OBS_START}\n{SUMMARY_MARK}\nfacts\n{OBS_END}"
+    assert responses[2:] == recent
+
+
+def test_compact_stops_once_under_budget():
+    compactor = ContextCompactor(
+        "q", summarize=Summarizer(), budget=1000, keep_recent=1
+    )
+    messages = _history("a" * 400, "b" * 400, "c" * 400)
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+    compactor.compact(messages, count_tokens)
+
+    responses = _responses(messages)
+    assert SUMMARY_MARK in responses[0]
+    assert responses[1] == f"{OBS_START}\n{'b' * 400}\n{OBS_END}"
+
+
+def test_schedule_waits_for_prefetch_ratio():
+    summarize = Summarizer()
+    compactor = ContextCompactor("q", summarize=summarize, budget=10_000, keep_recent=0)
+    messages = _history("a" * 400)
+
+    compactor.schedule(messages, count_tokens(messages))
+    assert compactor._summaries == {}
+    assert summarize.calls == []
+
+
+def test_pending_summary_falls_back_to_excerpt(monkeypatch):
+    monkeypatch.setattr(context_compactor, "EXCERPT_CHARS", 10)
+    gate = threading.Event()
+    summarize = Summarizer(gate=gate)
+    compactor = ContextCompactor("q", summarize=summarize, budget=150, keep_recent=1)
+    messages = _history("x" * 200, "y" * 20)
+    try:
+        compactor.schedule(messages, count_tokens(messages))
+        compactor.compact(messages, count_tokens)
+    finally:
+        gate.set()
+    _wait_for_summaries(compactor)
+
+    assert (
+        _responses(messages)[0]
+        == f"{OBS_START}\n{SUMMARY_MARK}\n{'x' * 10}...\n{OBS_END}"
+    )
+
+
+@pytest.mark.parametrize("summary", ["", None])
+def test_failed_summary_falls_back_to_excerpt(monkeypatch, summary):
+    monkeypatch.setattr(context_compactor, "EXCERPT_CHARS", 10)
+
+    def summarize(question, tool_output):
+        if summary is None:
+            raise RuntimeError("model down")
+        return summary
+
+    compactor = ContextCompactor("q", summarize=summarize, budget=100, keep_recent=0)
+    messages = _history("x" * 200)
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+    compactor.compact(messages, count_tokens)
+
+    assert _responses(messages) == [
+        f"{OBS_START}\n{SUMMARY_MARK}\n{'x' * 10}...\n{OBS_END}"
+    ]
+
+
+def test_blocks_are_dropped_when_summaries_are_not_enough():
+    summarize = Summarizer(summary="s" * 150)
+    compactor = ContextCompactor("q", summarize=summarize, budget=800, keep_recent=1)
+    messages = _history("a" * 400, "b" * 400, "c" * 400)
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+
+    token_count = compactor.compact(messages, count_tokens)
+    assert token_count == count_tokens(messages) <= 800
+    responses = _responses(messages)
+    # Oldest first: the first summary is dropped, the second one is enough.
+    assert responses[0] == f"{OBS_START}\n{DROPPED_MARK}\n{OBS_END}"
+    assert SUMMARY_MARK in responses[1]
+    assert responses[2] == f"{OBS_START}\n{'c' * 400}\n{OBS_END}"
+
+
+def test_recent_blocks_are_kept_even_over_budget():
+    compactor = ContextCompactor("q", summarize=Summarizer(), budget=10, keep_recent=1)
+    messages = _history("a" * 400, "b" * 400)
+
+    assert compactor.compact(messages, count_tokens) > 10
+    responses = _responses(messages)
+    assert DROPPED_MARK in responses[0]
+    assert responses[1] == f"{OBS_START}\n{'b' * 400}\n{OBS_END}"
+
+
+def test_compacted_blocks_are_not_compacted_again():
+    summarize = Summarizer()
+    compactor = ContextCompactor("q", summarize=summarize, budget=600, keep_recent=1)
+    messages = _history("a" * 400, "b" * 400)
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+    compactor.compact(messages, count_tokens)
+    compacted = _responses(messages)
+    assert SUMMARY_MARK in compacted[0]
+
+    # The history grows: the previous recent block becomes stale as well.
+    messages += _history("c" * 400)[2:]
+    compactor.schedule(messages, count_tokens(messages))
+    _wait_for_summaries(compactor)
+    compactor.compact(messages, count_tokens)
+
+    assert summarize.calls == ["a" * 400, "b" * 400]
+    responses = _responses(messages)
+    assert responses[0] == compacted[0]
+    assert SUMMARY_MARK in responses[1]
@@ -0,0 +1,147 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# tongyi-ds is a standalone script directory with flat imports.
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "tongyi-ds"))
+
+from port_dispatcher import PortDispatcher, _start_fake_servers, probe_models  # noqa: E402
+
+
+class Probe:
+    """Injected health probe answering from a set of live ports."""
+
+    def __init__(self, live):
+        self.live = set(live)
+
+    def __call__(self, port):
+        return port in self.live
+
+
+def _call(dispatcher, port, ok, latency=0.0):
+    dispatcher.end(port, dispatcher.begin(port) - latency, ok)
+
+
+@pytest.fixture
+def dispatcher():
+    d = PortDispatcher(
+        [6001, 6002, 6003], eject_after=2, probe_interval=0, probe=Probe([])
+    )
+    yield d
+    d.close()
+
+
+def test_acquire_picks_least_loaded_port(dispatcher):
+    first, second, third = (dispatcher.acquire() for _ in range(3))
+    assert {first, second, third} == {6001, 6002, 6003}
+
+    dispatcher.release(second)
+    assert dispatcher.acquire() == second
+
+
+def test_acquire_prefers_faster_port():
+    dispatcher = PortDispatcher([6001, 6002], probe_interval=0, probe=Probe([]))
+    _call(dispatcher, 6001, ok=True, latency=1.0)
+    _call(dispatcher, 6002, ok=True, latency=0.1)
+
+    # 6002 is ten times faster, so it takes several tasks before 6001 does.
+    assert [dispatcher.acquire() for _ in range(3)] == [6002] * 3
+    dispatcher.close()
+
+
+def test_port_is_ejected_after_consecutive_failures(dispatcher):
+    _call(dispatcher, 6001, ok=False)
+    _call(dispatcher, 6001, ok=True)
+    _call(dispatcher, 6001, ok=False)
+    assert dispatcher.stats()[6001]["healthy"]
+
+    _call(dispatcher, 6001, ok=False)
+    stats = dispatcher.stats()[6001]
+    assert not stats["healthy"]
+    assert stats["errors"] == 3
+    assert 6001 not in {dispatcher.acquire() for _ in range(6)}
+
+
+def test_probe_readmits_ejected_port(dispatcher):
+    for _ in range(2):
+        _call(dispatcher, 6001, ok=False)
+    dispatcher.probe.live = {6002, 6003}
+    dispatcher.probe_all()
+    assert not dispatcher.stats()[6001]["healthy"]
+
+    dispatcher.probe.live.add(6001)
+    dispatcher.probe_all()
+    stats = dispatcher.stats()[6001]
+    assert stats["healthy"]
+    assert stats["failures"] == 0
+
+
+def test_probe_ejects_dead_port(dispatcher):
+    dispatcher.probe.live = {6001, 6003}
+    dispatcher.probe_all()
+    assert [p for p, s in dispatcher.stats().items() if not s["healthy"]] == [6002]
+
+
+def test_resolve_moves_calls_off_ejected_port(dispatcher):
+    with dispatcher.lease() as port:
+        assert dispatcher.resolve(port) == port
+        for _ in range(2):
+            _call(dispatcher, port, ok=False)
+        moved = dispatcher.resolve(port)
+        assert moved != port
+        assert dispatcher.stats()[moved]["healthy"]
+
+        dispatcher.probe.live = {6001, 6002, 6003}
+        dispatcher.probe_all()
+        assert dispatcher.resolve(port) == port
+    assert all(s["active_tasks"] == 0 for s in dispatcher.stats().values())
+
+
+def test_all_ports_ejected_still_routes(dispatcher):
+    for port in (6001, 6002, 6003):
+        for _ in range(2):
+            _call(dispatcher, port, ok=False)
+    assert dispatcher.acquire() in (6001, 6002, 6003)
+
+
+def test_probe_models_against_fake_servers():
+    servers = _start_fake_servers([{"latency": 0.0}, {"failing": True}])
+    try:
+        live, failing = (server.server_address[1] for server in servers)
+        dispatcher = PortDispatcher([live, failing], probe_interval=0)
+        dispatcher.probe_all()
+        assert {p: s["healthy"] for p, s in dispatcher.stats().items()} == {
+            live: True,
+            failing: False,
+        }
+
+        servers[1].RequestHandlerClass.failing = False
+        assert probe_models("127.0.0.1", failing)
+        dispatcher.probe_all()
+        assert dispatcher.stats()[failing]["healthy"]
+        assert dispatcher.resolve(failing) == failing
+        dispatcher.close()
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+def test_background_probe_loop_readmits():
+    probe = Probe([])
+    dispatcher = PortDispatcher(
+        [6001, 6002], eject_after=1, probe_interval=0.01, probe=probe
+    )
+    try:
+        _call(dispatcher, 6001, ok=False)
+        probe.live = {6001, 6002}
+        deadline = time.monotonic() + 5
+        while not dispatcher.stats()[6001]["healthy"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert dispatcher.stats()[6001]["healthy"]
+    finally:
+        dispatcher.close()
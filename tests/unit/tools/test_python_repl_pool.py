@@ -0,0 +1,190 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import queue
+import threading
+
+import pytest
+
+from src.tools.python_repl_pool import PythonREPLPool
+
+
+@pytest.fixture
+def pool():
+    pool = PythonREPLPool(
+        max_workers=3,
+        warm_workers=1,
+        timeout_seconds=5,
+        memory_limit_mb=0,
+        max_executions=3,
+        preload=[],
+    )
+    yield pool
+    pool.shutdown()
+
+
+def test_run_captures_stdout(pool):
+    assert pool.run("print(1 + 2)", session_id="a") == "3\n"
+
+
+def test_run_returns_exception_repr(pool):
+    result = pool.run("1/0", session_id="a")
+    assert "ZeroDivisionError" in result
+
+
+def test_session_state_persists_and_is_isolated(pool):
+    pool.run("x = 41", session_id="a")
+    assert pool.run("print(x + 1)", session_id="a") == "42\n"
+    assert "NameError" in pool.run("print(x)", session_id="b")
+
+
+def test_timeout_kills_worker_and_recovers(pool):
+    pool.timeout_seconds = 0.5
+    result = pool.run("import time\ntime.sleep(5)", session_id="a")
+    assert "TimeoutError" in result
+    pool.timeout_seconds = 5
+    assert pool.run("print('ok')", session_id="a") == "ok\n"
+
+
+def test_worker_recycled_after_max_executions(pool):
+    pool.run("y = 1", session_id="a")
+    pool.run("y += 1", session_id="a")
+    pool.run("y += 1", session_id="a")  # third execution triggers recycling
+    assert "NameError" in pool.run("print(y)", session_id="a")
+
+
+def test_lru_session_evicted_when_pool_is_full(pool):
+    for session in ("a", "b", "c"):
+        pool.run(f"name = '{session}'", session_id=session)
+    pool.run("print(name)", session_id="d")
+    assert pool.stats()["sessions"] == 3
+    assert "NameError" in pool.run("print(name)", session_id="a")
+
+
+def test_sessions_run_in_parallel(pool, tmp_path):
+    results = {}
+    # Each session marks its arrival, then waits for the other one: a
+    # rendezvous only both sessions running at once can complete.
+    code = (
+        "import os, time\n"
+        "open(os.path.join({dir!r}, {me!r}), 'w').close()\n"
+        "deadline = time.monotonic() + 4\n"
+        "while not os.path.exists(os.path.join({dir!r}, {other!r})):\n"
+        "    if time.monotonic() > deadline:\n"
+        "        break\n"
+        "    time.sleep(0.01)\n"
+        "print(os.path.exists(os.path.join({dir!r}, {other!r})))"
+    )
+
+    def worker(session, other):
+        results[session] = pool.run(
+            code.format(dir=str(tmp_path), me=session, other=other),
+            session_id=session,
+        )
+
+    threads = [
+        threading.Thread(target=worker, args=pair) for pair in (("a", "b"), ("b", "a"))
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {"a": "True\n", "b": "True\n"}
+
+
+def test_idle_workers_count_against_max_workers(pool):
+    for session in ("a", "b", "c", "d", "e"):
+        pool.run("pass", session_id=session)
+        pool.warm_up()
+        stats = pool.stats()
+        assert stats["sessions"] + stats["idle"] <= pool.max_workers
+
+
+def test_session_locks_are_evicted_with_workers(pool):
+    for i in range(20):
+        pool.run("pass", session_id=f"s{i}")
+    assert set(pool._session_locks) <= set(pool._sessions)
+    pool.close_session("s19")
+    assert "s19" not in pool._session_locks
+
+
+def test_new_session_waits_for_busy_worker(tmp_path):
+    pool = PythonREPLPool(
+        max_workers=1, warm_workers=0, memory_limit_mb=0, preload=[], timeout_seconds=5
+    )
+    started = tmp_path / "started"
+    release = tmp_path / "release"
+    results = {}
+
+    def first():
+        results["a"] = pool.run(
+            "import os, time\n"
+            f"open({str(started)!r}, 'w').close()\n"
+            f"while not os.path.exists({str(release)!r}):\n"
+            "    time.sleep(0.01)\n"
+            "print('a')",
+            session_id="a",
+        )
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    try:
+        while not started.exists():
+            thread.join(0.01)
+        second = threading.Thread(
+            target=lambda: results.__setitem__(
+                "b", pool.run("print('b')", session_id="b")
+            )
+        )
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()  # queued behind session a, not failed
+        release.touch()
+        thread.join(5)
+        second.join(5)
+        assert results == {"a": "a\n", "b": "b\n"}
+    finally:
+        release.touch()
+        pool.shutdown()
+
+
+def test_acquire_times_out_when_workers_stay_busy(tmp_path):
+    pool = PythonREPLPool(
+        max_workers=1,
+        warm_workers=0,
+        memory_limit_mb=0,
+        preload=[],
+        acquire_timeout_seconds=0.2,
+    )
+    started = tmp_path / "started"
+    thread = threading.Thread(
+        target=pool.run,
+        args=(f"import time\nopen({str(started)!r}, 'w').close()\ntime.sleep(1)",),
+        kwargs={"session_id": "a"},
+    )
+    thread.start()
+    try:
+        while not started.exists():
+            thread.join(0.01)
+        with pytest.raises(RuntimeError, match="stayed busy"):
+            pool.run("print(1)", session_id="b")
+    finally:
+        thread.join(5)
+        pool.shutdown()
+
+
+def test_startup_timeout_is_reported_as_startup_failure(pool, monkeypatch):
+    pool.startup_timeout_seconds = 0.01
+    monkeypatch.setattr(
+        "src.tools.python_repl_pool._Worker.wait_ready",
+        lambda self, timeout: (_ for _ in ()).throw(queue.Empty()),
+    )
+    result = pool.run("print(1)", session_id="a")
+    assert "did not start within" in result
+    assert "time limit" not in result
+
+
+def test_shutdown_rejects_new_work(pool):
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.run("print(1)", session_id="a")
@@ -66,18 +66,19 @@ async def test_retriever_tool_arun():
     mock_retriever = Mock(spec=Retriever)
     chunk = Chunk(content="async content", similarity=0.8)
     doc = Document(id="doc2", chunks=[chunk])
-    mock_retriever.query_relevant_documents.return_value = [doc]
+    mock_retriever.aquery_relevant_documents.return_value = [doc]
 
     resources = [Resource(uri="test://uri", title="Test")]
     tool = RetrieverTool(retriever=mock_retriever, resources=resources)
 
     mock_run_manager = Mock(spec=AsyncCallbackManagerForToolRun)
-    mock_sync_manager = Mock(spec=CallbackManagerForToolRun)
-    mock_run_manager.get_sync.return_value = mock_sync_manager
 
     result = await tool._arun("async keywords", mock_run_manager)
 
-    mock_run_manager.get_sync.assert_called_once()
+    mock_retriever.aquery_relevant_documents.assert_awaited_once_with(
+        "async keywords", resources
+    )
+    mock_retriever.query_relevant_documents.assert_not_called()
     assert isinstance(result, list)
     assert len(result) == 1
     assert result[0] == doc.to_dict()
@@ -122,3 +123,21 @@ def test_retriever_tool_run_with_callback_manager():
     result = tool._run("test keywords", mock_callback_manager)
 
     assert result == "No results found from the local knowledge base."
+
+
+def test_retriever_tool_packs_within_token_budget(monkeypatch):
+    monkeypatch.setenv("RAG_TOOL_MAX_TOTAL_TOKENS", "15")
+    mock_retriever = Mock(spec=Retriever)
+    repeated = "Milvus stores vectors. It supports filtering."
+    mock_retriever.query_relevant_documents.return_value = [
+        Document(id="a", chunks=[Chunk(repeated, 0.9), Chunk(repeated, 0.8)]),
+        Document(id="b", chunks=[Chunk("BM25 ranks keywords. It is fast.", 0.7)]),
+    ]
+    tool = RetrieverTool(retriever=mock_retriever, resources=[])
+
+    result = tool._run("vectors")
+
+    assert [d["id"] for d in result] == ["a", "b"]
+    assert result[0]["content"] == repeated
+    # Only the whole first sentence of the second chunk fits the budget.
+    assert result[1]["content"] == "BM25 ranks keywords."
@@ -0,0 +1,162 @@
+"""Context compaction for the ReAct message history.
+
+Instead of forcing an answer once the history exceeds the context limit, the
+agent keeps it under ``CONTEXT_TOKEN_BUDGET`` by compacting old
+``<tool_response>`` blocks, oldest first:
+
+1. Replace a block with a summary of the facts it contains.
+2. If that is not enough, drop the oldest summarized blocks entirely, as a
+   last resort before the agent has to answer.
+
+The most recent ``KEEP_RECENT_TOOL_RESPONSES`` blocks are never touched.
+Once the history reaches ``COMPACTION_PREFETCH_RATIO`` of the budget, stale
+blocks are summarized in the background while the agent keeps working, so
+summaries are usually ready (and cached by content) by the time compaction
+needs them; a block whose summary is still pending falls back to an
+extractive excerpt.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from openai import OpenAI
+
+from prompt import COMPACTION_PROMPT
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 96 * 1024))
+KEEP_RECENT_TOOL_RESPONSES = int(os.getenv("KEEP_RECENT_TOOL_RESPONSES", 2))
+# Start summarizing stale blocks once the history uses this share of the budget.
+PREFETCH_RATIO = float(os.getenv("COMPACTION_PREFETCH_RATIO", 0.5))
+# Characters of a tool response kept when no summary is available.
+EXCERPT_CHARS = int(os.getenv("COMPACTION_EXCERPT_CHARS", 1500))
+
+OBS_START = "<tool_response>"
+OBS_END = "</tool_response>"
+SUMMARY_MARK = "[Compacted tool response]"
+DROPPED_MARK = "[Tool response removed to save context.]"
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="compaction")
+
+
+def summarize_with_llm(question: str, tool_output: str) -> str:
+    """Summarize ``tool_output`` with the summary model used by the visit tool."""
+    api_key = os.environ.get("API_KEY")
+    url_llm = os.environ.get("API_BASE")
+    model_name = os.environ.get("SUMMARY_MODEL_NAME", "")
+    if not (api_key and url_llm and model_name):
+        return ""
+    client = OpenAI(api_key=api_key, base_url=url_llm)
+    chat_response = client.chat.completions.create(
+        model=model_name,
+        messages=[{"role": "user", "content": COMPACTION_PROMPT.format(question=question, tool_output=tool_output)}],
+        temperature=0.3,
+    )
+    if not chat_response.choices:
+        return ""
+    return (chat_response.choices[0].message.content or "").strip()
+
+
+def _is_tool_response(msg: Dict) -> bool:
+    content = msg.get("content") or ""
+    return msg.get("role") == "user" and content.startswith(OBS_START)
+
+
+def _is_compacted(content: str) -> bool:
+    return SUMMARY_MARK in content or DROPPED_MARK in content
+
+
+def _key(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class ContextCompactor:
+    """Summarize stale tool responses in the background and compact on demand.
+
+    Args:
+        question: The research question, to judge what facts matter.
+        summarize: ``(question, tool_output) -> summary``; an empty result or
+            an exception falls back to an excerpt.
+        budget: Token budget of the whole history.
+        keep_recent: Latest tool responses that are never compacted.
+    """
+
+    def __init__(
+        self,
+        question: str,
+        summarize: Callable[[str, str], str] = summarize_with_llm,
+        budget: int = CONTEXT_TOKEN_BUDGET,
+        keep_recent: int = KEEP_RECENT_TOOL_RESPONSES,
+    ):
+        self.question = question
+        self.summarize = summarize
+        self.budget = budget
+        self.keep_recent = max(keep_recent, 0)
+        self._summaries: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _stale_indices(self, messages: List[Dict]) -> List[int]:
+        indices = [i for i, msg in enumerate(messages) if _is_tool_response(msg)]
+        return indices[: max(len(indices) - self.keep_recent, 0)]
+
+    def schedule(self, messages: List[Dict], token_count: int) -> None:
+        """Start summarizing stale tool responses once compaction is getting close."""
+        if token_count < self.budget * PREFETCH_RATIO:
+            return
+        for i in self._stale_indices(messages):
+            content = messages[i]["content"]
+            if _is_compacted(content):
+                continue
+            key = _key(content)
+            with self._lock:
+                if key not in self._summaries:
+                    self._summaries[key] = _executor.submit(self._summarize, content)
+
+    def _summarize(self, content: str) -> str:
+        body = content[len(OBS_START):].rsplit(OBS_END, 1)[0].strip()
+        try:
+            summary = self.summarize(self.question, body)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[compaction] Summarization failed: {exc}")
+            summary = ""
+        if not summary:
+            excerpt = body[:EXCERPT_CHARS]
+            summary = excerpt + ("..." if len(body) > EXCERPT_CHARS else "")
+        return summary
+
+    def _summary(self, content: str) -> str:
+        with self._lock:
+            future = self._summaries.get(_key(content))
+        if future is not None and future.done():
+            return future.result()
+        # Not summarized yet: do not wait for the model, use an excerpt.
+        body = content[len(OBS_START):].rsplit(OBS_END, 1)[0].strip()
+        return body[:EXCERPT_CHARS] + ("..." if len(body) > EXCERPT_CHARS else "")
+
+    def compact(self, messages: List[Dict], count_tokens: Callable[[List[Dict]], int]) -> int:
+        """Compact ``messages`` in place until they fit the budget.
+
+        Returns:
+            The token count after compaction (may still exceed the budget if
+            only recent tool responses are left).
+        """
+        token_count = count_tokens(messages)
+        stale = self._stale_indices(messages)
+        for i in stale:
+            if token_count <= self.budget:
+                return token_count
+            content = messages[i]["content"]
+            if _is_compacted(content):
+                continue
+            messages[i]["content"] = f"{OBS_START}\n{SUMMARY_MARK}\n{self._summary(content)}\n{OBS_END}"
+            token_count = count_tokens(messages)
+        for i in stale:
+            if token_count <= self.budget:
+                break
+            if DROPPED_MARK in messages[i]["content"]:
+                continue
+            messages[i]["content"] = f"{OBS_START}\n{DROPPED_MARK}\n{OBS_END}"
+            token_count = count_tokens(messages)
+        return token_count
@@ -0,0 +1,298 @@
+"""Load-aware routing of rollouts across planning ports (vLLM/SGLang servers).
+
+Round-robin assignment ignores how busy or healthy each server is, so one slow
+instance becomes the tail of the whole batch. ``PortDispatcher`` instead:
+
+- routes each new task to the healthy port with the lowest expected wait,
+  ``(load + 1) * recent latency``, where load is the number of tasks (or
+  calls, if more were moved there) in flight and latency is an EWMA of the
+  LLM calls made on the port;
+- ejects a port after ``eject_after`` consecutive failed calls, and moves the
+  remaining calls of its tasks to the least-loaded healthy port;
+- probes every port's ``/v1/models`` in the background, re-admitting ejected
+  ports that answer again.
+
+Demo against local fake OpenAI-compatible servers (one fast, one slow, one
+failing), compared with round-robin over the two live ones:
+    python port_dispatcher.py [--tasks 120] [--workers 16] [--calls-per-task 3]
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+
+@dataclass
+class PortState:
+    active_tasks: int = 0
+    inflight: int = 0
+    latency: Optional[float] = None
+    failures: int = 0
+    healthy: bool = True
+    requests: int = 0
+    errors: int = 0
+
+
+def probe_models(host: str, port: int, timeout: float = 5.0) -> bool:
+    """An OpenAI-compatible server is up when ``GET /v1/models`` answers 200."""
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/v1/models", timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+class PortDispatcher:
+    """Track load and health per planning port and pick the best one.
+
+    Args:
+        ports: Planning ports of the model servers.
+        host: Host of the servers, used by the default probe.
+        eject_after: Consecutive failed calls before a port is ejected.
+        probe_interval: Seconds between health probes; 0 disables probing.
+        alpha: Weight of the newest sample in the latency EWMA.
+        probe: ``(port) -> healthy``; defaults to ``probe_models``.
+    """
+
+    def __init__(
+        self,
+        ports: Sequence[int],
+        host: str = "127.0.0.1",
+        eject_after: int = 3,
+        probe_interval: float = 30.0,
+        alpha: float = 0.3,
+        probe: Optional[Callable[[int], bool]] = None,
+    ):
+        if not ports:
+            raise ValueError("PortDispatcher needs at least one port")
+        self.ports = list(ports)
+        self.eject_after = max(eject_after, 1)
+        self.alpha = alpha
+        self.probe = probe or (lambda port: probe_models(host, port))
+        self._states: Dict[int, PortState] = {port: PortState() for port in self.ports}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._prober = None
+        if probe_interval > 0:
+            self._prober = threading.Thread(
+                target=self._probe_loop, args=(probe_interval,), name="port-probe", daemon=True
+            )
+            self._prober.start()
+
+    def _expected_wait(self, state: PortState, default_latency: float) -> float:
+        latency = state.latency if state.latency is not None else default_latency
+        return (max(state.active_tasks, state.inflight) + 1) * latency
+
+    def _pick(self) -> int:
+        # Caller holds the lock. Unmeasured ports count as average ones.
+        known = [s.latency for s in self._states.values() if s.latency is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        candidates = [p for p in self.ports if self._states[p].healthy]
+        if not candidates:
+            # Everything is ejected: keep going rather than stall the batch.
+            candidates = self.ports
+        return min(candidates, key=lambda p: self._expected_wait(self._states[p], default_latency))
+
+    def acquire(self) -> int:
+        """Assign a new task to the least-loaded healthy port."""
+        with self._lock:
+            port = self._pick()
+            self._states[port].active_tasks += 1
+            return port
+
+    def release(self, port: int) -> None:
+        with self._lock:
+            state = self._states[port]
+            state.active_tasks = max(state.active_tasks - 1, 0)
+
+    @contextmanager
+    def lease(self) -> Iterator[int]:
+        port = self.acquire()
+        try:
+            yield port
+        finally:
+            self.release(port)
+
+    def resolve(self, port: int) -> int:
+        """Port to send a task's next call to: its own unless it was ejected."""
+        with self._lock:
+            if port in self._states and self._states[port].healthy:
+                return port
+            return self._pick()
+
+    def begin(self, port: int) -> float:
+        """Mark a call as in flight; returns its start time for ``end``."""
+        with self._lock:
+            self._states[port].inflight += 1
+        return time.monotonic()
+
+    def end(self, port: int, started: float, ok: bool) -> None:
+        """Record the outcome of a call started with ``begin``."""
+        latency = time.monotonic() - started
+        with self._lock:
+            state = self._states[port]
+            state.inflight = max(state.inflight - 1, 0)
+            state.requests += 1
+            if ok:
+                state.failures = 0
+                state.latency = latency if state.latency is None else (
+                    self.alpha * latency + (1 - self.alpha) * state.latency
+                )
+                return
+            state.errors += 1
+            state.failures += 1
+            if state.healthy and state.failures >= self.eject_after:
+                state.healthy = False
+                print(f"[dispatcher] Port {port} ejected after {state.failures} consecutive failures")
+
+    def probe_all(self) -> None:
+        """Probe every port once, ejecting dead ones and re-admitting live ones."""
+        for port in self.ports:
+            healthy = self.probe(port)
+            with self._lock:
+                state = self._states[port]
+                if healthy and not state.healthy:
+                    print(f"[dispatcher] Port {port} passed a health probe, re-admitted")
+                    state.healthy = True
+                    state.failures = 0
+                elif not healthy and state.healthy:
+                    print(f"[dispatcher] Port {port} failed a health probe, ejected")
+                    state.healthy = False
+
+    def _probe_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.probe_all()
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[int, dict]:
+        with self._lock:
+            return {port: vars(state).copy() for port, state in self._states.items()}
+
+
+class _FakeServer(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat server for the demo.
+
+    Serves ``slots`` requests at a time, each taking ``latency`` seconds, so a
+    busy server queues requests like a real inference server.
+    """
+
+    latency = 0.0
+    failing = False
+    slots: threading.Semaphore = threading.Semaphore(1)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.failing:
+            self._reply(503, {"error": "unavailable"})
+        else:
+            self._reply(200, {"object": "list", "data": [{"id": "fake", "object": "model"}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.failing:
+            self._reply(500, {"error": {"message": "server error"}})
+            return
+        with self.slots:
+            time.sleep(self.latency)
+        self._reply(200, {
+            "id": "fake", "object": "chat.completion", "created": 0, "model": "fake",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "ok"}}],
+        })
+
+
+def _start_fake_servers(profiles: List[dict]) -> List[ThreadingHTTPServer]:
+    servers = []
+    for profile in profiles:
+        attrs = dict(profile, slots=threading.Semaphore(profile.get("slots", 1)))
+        handler = type("Handler", (_FakeServer,), attrs)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def _demo(tasks: int, workers: int, calls_per_task: int) -> None:
+    from openai import OpenAI
+
+    profiles = [{"latency": 0.05, "slots": 8}, {"latency": 0.2, "slots": 2}, {"failing": True}]
+    servers = _start_fake_servers(profiles)
+    ports = [server.server_address[1] for server in servers]
+    print("Fake servers: " + ", ".join(f"{p} {prof}" for p, prof in zip(ports, profiles)))
+
+    clients = {
+        port: OpenAI(api_key="EMPTY", base_url=f"http://127.0.0.1:{port}/v1", max_retries=0, timeout=30)
+        for port in ports
+    }
+
+    def chat(port: int) -> bool:
+        client = clients[port]
+        try:
+            client.chat.completions.create(model="fake", messages=[{"role": "user", "content": "hi"}])
+            return True
+        except Exception:
+            return False
+
+    def run_batch(task: Callable[[int], None]) -> float:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(task, range(tasks)))
+        return time.perf_counter() - start
+
+    def round_robin(index: int) -> None:
+        # Round-robin would retry forever against the failing server; give it only the live ones.
+        port = ports[index % 2]
+        for _ in range(calls_per_task):
+            chat(port)
+
+    dispatcher = PortDispatcher(ports, probe_interval=0.5)
+
+    def dispatched(index: int) -> None:
+        with dispatcher.lease() as port:
+            done = 0
+            while done < calls_per_task:
+                target = dispatcher.resolve(port)
+                started = dispatcher.begin(target)
+                ok = chat(target)
+                dispatcher.end(target, started, ok)
+                done += ok
+
+    rr_elapsed = run_batch(round_robin)
+    elapsed = run_batch(dispatched)
+    dispatcher.close()
+
+    print(f"Round-robin over live ports: {tasks} tasks in {rr_elapsed:.2f}s ({tasks / rr_elapsed:.1f} tasks/s)")
+    print(f"Dispatcher over all ports:   {tasks} tasks in {elapsed:.2f}s ({tasks / elapsed:.1f} tasks/s)")
+    for port, state in dispatcher.stats().items():
+        print(f"  port {port}: requests={state['requests']} errors={state['errors']} "
+              f"healthy={state['healthy']} latency={state['latency'] or 0:.3f}s")
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Demo the planning-port dispatcher on fake servers.")
+    parser.add_argument("--tasks", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--calls-per-task", type=int, default=3)
+    args = parser.parse_args()
+    _demo(args.tasks, args.workers, args.calls_per_task)
@@ -49,3 +49,19 @@ EXTRACTOR_PROMPT = """Please process the following webpage content and user goal
 
 **Final Output Format using JSON format has "rational", "evidence", "summary" feilds**
 """
+
+COMPACTION_PROMPT = """The following is an earlier tool output from a research session. It will be removed from the context to save space, so record everything that may still matter.
+
+## **Research Question**
+{question}
+
+## **Tool Output**
+{tool_output}
+
+## **Task Guidelines**
+1. Keep every fact, number, date, name and quotation relevant to the research question, together with the URL or source it came from.
+2. Note leads worth following up (pages not yet visited, open questions).
+3. Drop navigation text, boilerplate and anything irrelevant to the question.
+
+Output only the condensed notes as a short bulleted list, without any preamble.
+"""
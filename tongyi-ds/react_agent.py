@@ -1,11 +1,12 @@
 import json
 import json5
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Iterator, List, Literal, Optional, Tuple, Union
 from qwen_agent.llm.schema import Message
 # from qwen_agent.utils.utils import build_text_completion_prompt  # Deprecated
 from openai import OpenAI, APIError, APIConnectionError, APITimeoutError
-import tiktoken
 from datetime import datetime
 from qwen_agent.agents.fncall_agent import FnCallAgent
 from qwen_agent.llm import BaseChatModel
@@ -20,11 +21,18 @@ import asyncio
 from tool_scholar import Scholar
 from tool_search import Search
 from tool_visit import Visit
+from token_counter import TokenCounter
+from context_compactor import ContextCompactor
+from port_dispatcher import PortDispatcher
 
 OBS_START = '<tool_response>'
 OBS_END = '\n</tool_response>'
 
 MAX_LLM_CALL_PER_RUN = int(os.getenv('MAX_LLM_CALL_PER_RUN', 100))
+# Deadline for all tool calls of one round, which run concurrently.
+TOOL_ROUND_TIMEOUT = int(os.getenv('TOOL_ROUND_TIMEOUT', 900))
+
+INVALID_TOOL_CALL = 'Error: Tool call is not a valid JSON. Tool call must contain a valid "name" and "arguments" field.'
 
 TOOL_CLASS = [
     Scholar(),
@@ -35,6 +43,12 @@ TOOL_MAP = {tool.name: tool for tool in TOOL_CLASS}
 
 import random
 import datetime
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_token_counter(model: str) -> TokenCounter:
+    return TokenCounter(model)
 
 
 def today_date():
@@ -44,10 +58,13 @@ class MultiTurnReactAgent(FnCallAgent):
     def __init__(self,
                  function_list: Optional[List[Union[str, Dict, BaseTool]]] = None,
                  llm: Optional[Union[Dict, BaseChatModel]] = None,
+                 dispatcher: Optional[PortDispatcher] = None,
                  **kwargs):
 
         self.llm_generate_cfg = llm["generate_cfg"]
         self.llm_local_path = llm["model"]
+        # Optional load-aware routing across planning ports (local servers only).
+        self.dispatcher = dispatcher
 
     def sanity_check_output(self, content):
         return "<think>" in content and "</think>" in content
@@ -72,10 +89,21 @@ class MultiTurnReactAgent(FnCallAgent):
             base_url=openai_api_base,
             timeout=600.0,
         )
+        dispatcher = None if openrouter_api_key else self.dispatcher
+        port = planning_port
 
         base_sleep_time = 1 
         
         for attempt in range(max_tries):
+            if dispatcher is not None:
+                # Move to another server if this one has been ejected
+                target = dispatcher.resolve(planning_port)
+                if target != port:
+                    print(f"Port {port} is unhealthy, routing to port {target}")
+                    port = target
+                    client = OpenAI(api_key=openai_api_key, base_url=f"http://127.0.0.1:{port}/v1", timeout=600.0)
+                started = dispatcher.begin(port)
+            ok = False
             try:
                 print(f"--- Attempting to call the service, try {attempt + 1}/{max_tries} ---")
                 chat_response = client.chat.completions.create(
@@ -88,6 +116,7 @@ class MultiTurnReactAgent(FnCallAgent):
                     max_tokens=10000,
                     presence_penalty=self.llm_generate_cfg.get('presence_penalty', 1.1)
                 )
+                ok = True
                 content = chat_response.choices[0].message.content
 
                 # OpenRouter provides API calling. If you want to use OpenRouter, you need to uncomment line 89 - 90.
@@ -104,6 +133,9 @@ class MultiTurnReactAgent(FnCallAgent):
                 print(f"Error: Attempt {attempt + 1} failed with an API or network error: {e}")
             except Exception as e:
                 print(f"Error: Attempt {attempt + 1} failed with an unexpected error: {e}")
+            finally:
+                if dispatcher is not None:
+                    dispatcher.end(port, started, ok)
 
             if attempt < max_tries - 1:
                 sleep_time = base_sleep_time * (2 ** attempt) + random.uniform(0, 1)
@@ -117,22 +149,8 @@ class MultiTurnReactAgent(FnCallAgent):
         return f"vllm server error!!!"
 
     def count_tokens(self, messages, model="gpt-4o"):
-        tokenizer = tiktoken.encoding_for_model(model)
-
-        # 直接计算所有消息的 token 数量，不使用已弃用的 build_text_completion_prompt
-        total_tokens = 0
-        for msg in messages:
-            if isinstance(msg, dict):
-                content = msg.get("content", "")
-                role = msg.get("role", "")
-                # 计算每个消息内容的 token 数量
-                total_tokens += len(tokenizer.encode(content))
-                # 添加角色标记的 token 数量（粗略估计）
-                total_tokens += len(tokenizer.encode(role)) + 4  # 4 个额外 token 用于格式化
-            else:
-                total_tokens += len(tokenizer.encode(str(msg)))
-
-        return total_tokens
+        # 增量计数：缓存 tokenizer 与每条消息的 token 数，每轮只编码新增/改写的消息
+        return get_token_counter(model).count(messages)
 
     def _run(
         self,
@@ -158,6 +176,7 @@ class MultiTurnReactAgent(FnCallAgent):
         cur_date = today_date()
         system_prompt = system_prompt + str(cur_date)
         messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": question}]
+        compactor = ContextCompactor(question)
         num_llm_calls_available = MAX_LLM_CALL_PER_RUN
         round = 0
         while num_llm_calls_available > 0:
@@ -195,24 +214,10 @@ class MultiTurnReactAgent(FnCallAgent):
                 content = content[:pos]
             messages.append({"role": "assistant", "content": content.strip()})
             if '<tool_call>' in content and '</tool_call>' in content:
-                tool_call = content.split('<tool_call>')[1].split('</tool_call>')[0]
-                try:
-                    if "python" in tool_call.lower():
-                        try:
-                            code_raw=content.split('<tool_call>')[1].split('</tool_call>')[0].split('<code>')[1].split('</code>')[0].strip()
-                            result = TOOL_MAP['PythonInterpreter'].call(code_raw)
-                        except:
-                            result = "[Python Interpreter Error]: Formatting error."
-
-                    else:
-                        tool_call = json5.loads(tool_call)
-                        tool_name = tool_call.get('name', '')
-                        tool_args = tool_call.get('arguments', {})
-                        result = self.custom_call_tool(tool_name, tool_args)
-
-                except:
-                    result = 'Error: Tool call is not a valid JSON. Tool call must contain a valid "name" and "arguments" field.'
-                result = "<tool_response>\n" + result + "\n</tool_response>"
+                tool_calls = re.findall(r'<tool_call>(.*?)</tool_call>', content, flags=re.DOTALL)
+                # Both tags present but never in order (e.g. a cut-off call): nothing to run.
+                results = self.run_tool_calls(tool_calls) if tool_calls else [INVALID_TOOL_CALL]
+                result = "\n".join("<tool_response>\n" + r + "\n</tool_response>" for r in results)
                 # print(result)
                 messages.append({"role": "user", "content": result})
             if '<answer>' in content and '</answer>' in content:
@@ -225,6 +230,14 @@ class MultiTurnReactAgent(FnCallAgent):
             token_count = self.count_tokens(messages)
             print(f"round: {round}, token count: {token_count}")
 
+            # Summarize stale tool responses in the background while the next round runs,
+            # and compact old ones once the history exceeds the budget.
+            compactor.schedule(messages, token_count)
+            if token_count > compactor.budget:
+                token_count = compactor.compact(messages, self.count_tokens)
+                print(f"round: {round}, token count after compaction: {token_count}")
+
+            # Only forced to answer when compaction cannot bring the history under the limit.
             if token_count > max_tokens:
                 print(f"Token quantity exceeds the limit: {token_count} > {max_tokens}")
                 
@@ -263,6 +276,46 @@ class MultiTurnReactAgent(FnCallAgent):
         }
         return result
 
+    def call_tool(self, tool_call: str) -> str:
+        """Execute the body of one <tool_call> block and return the tool output."""
+        try:
+            if "python" in tool_call.lower():
+                try:
+                    code_raw = tool_call.split('<code>')[1].split('</code>')[0].strip()
+                    result = TOOL_MAP['PythonInterpreter'].call(code_raw)
+                except:
+                    result = "[Python Interpreter Error]: Formatting error."
+
+            else:
+                tool_call = json5.loads(tool_call)
+                tool_name = tool_call.get('name', '')
+                tool_args = tool_call.get('arguments', {})
+                result = self.custom_call_tool(tool_name, tool_args)
+
+        except:
+            result = INVALID_TOOL_CALL
+        return result if isinstance(result, str) else str(result)
+
+    def run_tool_calls(self, tool_calls: List[str]) -> List[str]:
+        """Execute all tool calls of one round concurrently, in call order.
+
+        Calls still running after TOOL_ROUND_TIMEOUT seconds are reported as
+        timed out so one slow tool does not hold up the round.
+        """
+        if not tool_calls:
+            return []
+        executor = ThreadPoolExecutor(max_workers=len(tool_calls))
+        futures = [executor.submit(self.call_tool, call) for call in tool_calls]
+        wait(futures, timeout=TOOL_ROUND_TIMEOUT)
+        executor.shutdown(wait=False, cancel_futures=True)
+        results = []
+        for future in futures:
+            if future.cancelled() or not future.done():
+                results.append(f"Error: Tool call timed out after {TOOL_ROUND_TIMEOUT} seconds.")
+            else:
+                results.append(future.result())
+        return results
+
     def custom_call_tool(self, tool_name: str, tool_args: dict, **kwargs):
         if tool_name in TOOL_MAP:
             tool_args["params"] = tool_args
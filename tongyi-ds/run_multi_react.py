@@ -1,12 +1,11 @@
 import argparse
+import asyncio
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import concurrent.futures
-from tqdm import tqdm
-import threading
 from datetime import datetime
 from react_agent import MultiTurnReactAgent
+from port_dispatcher import PortDispatcher
+from batch_runner import BatchRunner, ResumeIndex, RolloutWriter
 import time
 import math
 
@@ -22,6 +21,10 @@ if __name__ == "__main__":
     parser.add_argument("--roll_out_count", type=int, default=3)
     parser.add_argument("--total_splits", type=int, default=1)
     parser.add_argument("--worker_split", type=int, default=1)
+    parser.add_argument("--planning_ports", type=str, default="6001,6002,6003,6004,6005,6006,6007,6008")
+    parser.add_argument("--task_timeout", type=float, default=0, help="Seconds before a task is recorded as timed out; 0 disables")
+    parser.add_argument("--report_interval", type=float, default=30.0, help="Seconds between progress reports")
+    parser.add_argument("--probe_interval", type=float, default=30.0, help="Seconds between health probes of the planning ports")
     args = parser.parse_args()
 
     model = args.model
@@ -88,34 +91,17 @@ if __name__ == "__main__":
     else:
         output_files = {i: os.path.join(dataset_dir, f"iter{i}.jsonl") for i in range(1, roll_out_count + 1)}
 
+    # Questions already answered per rollout, from the sidecar resume index
     processed_queries_per_rollout = {}
 
     for rollout_idx in range(1, roll_out_count + 1):
-        output_file = output_files[rollout_idx]
-        processed_queries = set()
-        if os.path.exists(output_file):
-            try:
-                with open(output_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            data = json.loads(line)
-                            if "question" in data and "error" not in data:
-                                processed_queries.add(data["question"].strip())
-                        except json.JSONDecodeError:
-                            print(f"Warning: Skipping invalid line in output file: {line.strip()}")
-            except FileNotFoundError:
-                pass
-        processed_queries_per_rollout[rollout_idx] = processed_queries
+        processed_queries_per_rollout[rollout_idx] = ResumeIndex(output_files[rollout_idx])
+        processed_queries_per_rollout[rollout_idx].load()
 
     tasks_to_run_all = []
     per_rollout_task_counts = {i: 0 for i in range(1, roll_out_count + 1)}
-    # Define ports
-    planning_ports = [6001, 6002, 6003, 6004, 6005, 6006, 6007, 6008]
-    # Round-robin state
-    planning_rr_idx = 0
-    summary_rr_idx = 0
-    # Sticky assignment per question
-    question_to_ports = {}
+    # Define ports; each task is routed to a port by the dispatcher when it starts
+    planning_ports = [int(port) for port in args.planning_ports.split(",") if port.strip()]
     for rollout_idx in range(1, roll_out_count + 1):
         processed_queries = processed_queries_per_rollout[rollout_idx]
         for item in items:
@@ -132,22 +118,15 @@ if __name__ == "__main__":
                 continue
 
             if question not in processed_queries:
-                # Ensure sticky and balanced port assignment per unique question
-                if question not in question_to_ports:
-                    planning_port = planning_ports[planning_rr_idx % len(planning_ports)]
-                    question_to_ports[question] = planning_port
-                    planning_rr_idx += 1
-                planning_port = question_to_ports[question]
                 tasks_to_run_all.append({
                     "item": item.copy(),
                     "rollout_idx": rollout_idx,
-                    "planning_port": planning_port,
                 })
                 per_rollout_task_counts[rollout_idx] += 1
 
     print(f"Total questions in current split: {len(items)}")
     for rollout_idx in range(1, roll_out_count + 1):
-        print(f"Rollout {rollout_idx}: already successfully processed: {len(processed_queries_per_rollout[rollout_idx])}, to run: {per_rollout_task_counts[rollout_idx]}")
+        print(f"Rollout {rollout_idx}: already successfully processed: {len(processed_queries_per_rollout[rollout_idx].keys)}, to run: {per_rollout_task_counts[rollout_idx]}")
 
     if not tasks_to_run_all:
         print("All rollouts have been completed and no execution is required.")
@@ -164,66 +143,36 @@ if __name__ == "__main__":
             'model_type': 'qwen_dashscope'
         }
 
+        dispatcher = PortDispatcher(planning_ports, probe_interval=args.probe_interval)
         test_agent = MultiTurnReactAgent(
             llm=llm_cfg,
-            function_list=["search", "visit", "google_scholar", "PythonInterpreter"]
+            function_list=["search", "visit", "google_scholar", "PythonInterpreter"],
+            dispatcher=dispatcher,
         )
 
-        write_locks = {i: threading.Lock() for i in range(1, roll_out_count + 1)}
-
-        with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
-            future_to_task = {
-                executor.submit(
-                    test_agent._run,
-                    task,
-                    model
-                ): task for task in tasks_to_run_all
-            }
-
-            for future in tqdm(as_completed(future_to_task), total=len(tasks_to_run_all), desc="Processing All Rollouts"):
-                task_info = future_to_task[future]
-                rollout_idx = task_info["rollout_idx"]
-                output_file = output_files[rollout_idx]
-                try:
-                    result = future.result()
-                    with write_locks[rollout_idx]:
-                        with open(output_file, "a", encoding="utf-8") as f:
-                            f.write(json.dumps(result, ensure_ascii=False) + "\n")
-                except concurrent.futures.TimeoutError:
-                    question = task_info["item"].get("question", "")
-                    print(f'Timeout (>1800s): "{question}" (Rollout {rollout_idx})')
-                    future.cancel()
-                    error_result = {
-                        "question": question,
-                        "answer": task_info["item"].get("answer", ""),
-                        "rollout_idx": rollout_idx,
-                        "rollout_id": rollout_idx,
-                        "error": "Timeout (>1800s)",
-                        "messages": [],
-                        "prediction": "[Failed]"
-                    }
-                    with write_locks[rollout_idx]:
-                        with open(output_file, "a", encoding="utf-8") as f:
-                            f.write(json.dumps(error_result, ensure_ascii=False) + "\n")
-                except Exception as exc:
-                    question = task_info["item"].get("question", "")
-                    print(f'Task for question "{question}" (Rollout {rollout_idx}) generated an exception: {exc}')
-                    error_result = {
-                        "question": question,
-                        "answer": task_info["item"].get("answer", ""),
-                        "rollout_idx": rollout_idx,
-                        "rollout_id": rollout_idx,
-                        "error": f"Future resolution failed: {exc}",
-                        "messages": [],
-                        "prediction": "[Failed]",
-                    }
-                    print("===============================")
-                    print(error_result)
-                    print("===============================")
-                    with write_locks[rollout_idx]:
-                        with open(output_file, "a", encoding="utf-8") as f:
-                            f.write(json.dumps(error_result, ensure_ascii=False) + "\n")
-
+        def run_task(task):
+            # Pick the least-loaded healthy port when the task starts, not when it is queued
+            with dispatcher.lease() as planning_port:
+                task["planning_port"] = planning_port
+                return test_agent._run(task, model)
+
+        writers = {i: RolloutWriter(output_files[i]) for i in range(1, roll_out_count + 1)}
+        runner = BatchRunner(
+            run_task,
+            writers,
+            concurrency=args.max_workers,
+            task_timeout=args.task_timeout,
+            report_interval=args.report_interval,
+        )
+        try:
+            asyncio.run(runner.run(tasks_to_run_all))
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        dispatcher.close()
+        for port, state in dispatcher.stats().items():
+            print(f"Port {port}: requests={state['requests']}, errors={state['errors']}, healthy={state['healthy']}")
         print("\nAll tasks completed!")
 
     print(f"\nAll {roll_out_count} rollouts completed!")
\ No newline at end of file
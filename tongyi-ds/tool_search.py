@@ -1,6 +1,7 @@
 import http.client
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Sequence, Union
 
 import requests
@@ -10,6 +11,7 @@ from qwen_agent.tools.base import BaseTool, register_tool
 SERPER_KEY = os.environ.get("SERPER_KEY_ID", "")
 TAVILY_KEY = os.environ.get("TAVILY_API_KEY", "")
 DEFAULT_PROVIDER = os.environ.get("SEARCH_PROVIDER", "auto").lower()
+SEARCH_MAX_WORKERS = int(os.environ.get("SEARCH_MAX_WORKERS", 5))
 
 
 def _contains_cjk(text: str) -> bool:
@@ -54,9 +56,13 @@ class Search(BaseTool):
         if not queries:
             return "[Search] No valid query string provided."
 
+        # Queries are independent: search them concurrently, keep the input order.
+        workers = max(min(len(queries), SEARCH_MAX_WORKERS), 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda q: self._run_with_fallback(q, provider_hint), queries))
+
         responses = []
-        for q in queries:
-            response, provider = self._run_with_fallback(q, provider_hint)
+        for response, provider in results:
             header = f"Provider: {provider}\n" if provider else ""
             responses.append(f"{header}{response}")
         return "\n=======\n".join(responses)
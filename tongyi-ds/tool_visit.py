@@ -2,32 +2,25 @@ import json
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Iterable, List, Optional, Union
 
 import requests
-import tiktoken
 from openai import OpenAI
 from qwen_agent.tools.base import BaseTool, register_tool
 
 from prompt import EXTRACTOR_PROMPT
+from token_counter import truncate_to_tokens
 
 VISIT_SERVER_TIMEOUT = int(os.getenv("VISIT_SERVER_TIMEOUT", 200))
 WEBCONTENT_MAXLENGTH = int(os.getenv("WEBCONTENT_MAXLENGTH", 150000))
+VISIT_MAX_WORKERS = int(os.getenv("VISIT_MAX_WORKERS", 5))
+# Overall deadline for visiting a list of URLs; pages not read by then get an empty response.
+VISIT_BATCH_TIMEOUT = int(os.getenv("VISIT_BATCH_TIMEOUT", 900))
 
 JINA_API_KEYS = os.getenv("JINA_API_KEYS", "")
 
 
-@staticmethod
-def truncate_to_tokens(text: str, max_tokens: int = 95000) -> str:
-    encoding = tiktoken.get_encoding("cl100k_base")
-    
-    tokens = encoding.encode(text)
-    if len(tokens) <= max_tokens:
-        return text
-    
-    truncated_tokens = tokens[:max_tokens]
-    return encoding.decode(truncated_tokens)
-
 OSS_JSON_FORMAT = """# Response Formats
 ## visit_content
 {"properties":{"rational":{"type":"string","description":"Locate the **specific sections/data** directly related to the user's goal within the webpage content"},"evidence":{"type":"string","description":"Identify and extract the **most relevant information** from the content, never miss any important information, output the **full original context** of the content as far as possible, it can be more than three paragraphs.","summary":{"type":"string","description":"Organize into a concise paragraph with logical flow, prioritizing clarity and judge the contribution of the information to the goal."}}}}"""
@@ -70,23 +63,34 @@ class Visit(BaseTool):
         if isinstance(url, str):
             response = self.readpage_jina(url, goal)
         else:
-            response_blocks = []
             assert isinstance(url, List)
-            start_time = time.time()
-            for item in url:
-                if time.time() - start_time > 900:
-                    response_blocks.append(self._build_empty_response(item, goal))
-                    continue
-                try:
-                    response_blocks.append(self.readpage_jina(item, goal))
-                except Exception as exc:  # noqa: BLE001
-                    response_blocks.append(f"Error fetching {item}: {exc}")
-            response = "\n=======\n".join(response_blocks)
+            response = "\n=======\n".join(self._read_pages(url, goal))
 
         preview = response[:500] + ("..." if len(response) > 500 else "")
         print(f"[visit] Summary length {len(response)}; preview: {preview}")
         return response.strip()
         
+    def _read_pages(self, urls: List[str], goal: str) -> List[str]:
+        """Read and summarize ``urls`` concurrently, in input order."""
+        if not urls:
+            return []
+        executor = ThreadPoolExecutor(max_workers=max(min(len(urls), VISIT_MAX_WORKERS), 1))
+        futures = [executor.submit(self.readpage_jina, item, goal) for item in urls]
+        wait(futures, timeout=VISIT_BATCH_TIMEOUT)
+        # Do not wait for pages still loading after the deadline.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        response_blocks = []
+        for item, future in zip(urls, futures):
+            if future.cancelled() or not future.done():
+                response_blocks.append(self._build_empty_response(item, goal))
+                continue
+            try:
+                response_blocks.append(future.result())
+            except Exception as exc:  # noqa: BLE001
+                response_blocks.append(f"Error fetching {item}: {exc}")
+        return response_blocks
+
     def call_server(self, msgs: List[Dict[str, str]], max_retries: int = 2) -> str:
         api_key = os.environ.get("API_KEY")
         url_llm = os.environ.get("API_BASE")